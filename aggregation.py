@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+机群汇总模块
+
+对整批解析结果做分组统计（CPU型号、内存总量分布、内存条厂商、操作系统、磁盘使用率），
+分类与计数均为 pandas 向量化操作。
+
+两种用法:
+    aggregate(data)                    一次性汇总 parse_multiple_files 的结果
+    FleetAccumulator                   流式汇总：每攒一批报告做一次向量化计数后丢弃记录，
+                                       内存占用只与分类数有关，可直接作为 on_result 回调
+"""
+
+import collections
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from normalize import BYTE_UNITS, CAPACITY_PATTERN, batch_to_frame, scale_values
+
+
+def _first_part(values):
+    """取逗号前的部分，如 "Intel Core i7-8700, 3200 MHz (32 x 100)" -> "Intel Core i7-8700" """
+    return values.str.split(',', n=1).str[0].str.strip()
+
+
+def _as_is(values):
+    return values.str.strip()
+
+
+def _first_word(values):
+    """取第一个词，如内存条模块名称 "Kingston 9905701-017.A00G" -> "Kingston" """
+    return values.str.strip().str.split(n=1).str[0]
+
+
+def _memory_size(values):
+    """内存总量按GB取整，如 "16246 MB (DDR4 SDRAM)" -> "16 GB" """
+    gigabytes = np.round(scale_values(values, CAPACITY_PATTERN, BYTE_UNITS) / BYTE_UNITS['GB'])
+    return gigabytes.map(lambda size: f"{size:.0f} GB", na_action='ignore')
+
+
+# 磁盘使用率分段
+USAGE_BINS = [-0.1, 50, 75, 90, 100]
+USAGE_LABELS = ['0-50%', '50-75%', '75-90%', '90-100%']
+
+
+def _usage_bucket(values):
+    usage = pd.to_numeric(values.str.extract(r'(\d+(?:\.\d+)?)')[0], errors='coerce')
+    return pd.cut(usage, bins=USAGE_BINS, labels=USAGE_LABELS).astype('object')
+
+
+class Summary:
+    """单个汇总维度：按项目键选出记录，分类后计数"""
+
+    def __init__(self, name: str, key_pattern: str, categorize: Callable):
+        """
+        Args:
+            name: 汇总名称
+            key_pattern: 项目键的正则（如 r'(?:^|: )处理器名称$'）
+            categorize: 向量化分类函数，输入值的Series，返回分类的Series（无法分类为空）
+        """
+        self.name = name
+        self.key_pattern = key_pattern
+        self.categorize = categorize
+
+    def count(self, frame) -> pd.Series:
+        """对长表计数，返回 分类 -> 数量"""
+        mask = frame['项目'].str.contains(self.key_pattern, regex=True, na=False)
+        if not mask.any():
+            return pd.Series(dtype='int64')
+        values = frame.loc[mask, '值'].astype(str)
+        return self.categorize(values).dropna().value_counts()
+
+
+# 默认汇总维度（键的正则兼容 "主板: 处理器名称" 这类带子节前缀的项目）
+SUMMARIES = [
+    Summary('CPU型号', r'(?:^|: )处理器名称$', _first_part),
+    Summary('内存总量', r'(?:^|: )系统内存$', _memory_size),
+    Summary('内存条厂商', r'^DIMM\d+: 模块名称$', _first_word),
+    Summary('操作系统', r'(?:^|: )操作系统$', _as_is),
+    Summary('磁盘使用率', r'^[A-Za-z]: 使用率$', _usage_bucket),
+]
+
+
+def _to_table(counts: Dict) -> pd.DataFrame:
+    """计数字典转换为 分类、数量、占比 表（按数量降序）"""
+    table = pd.DataFrame({'分类': list(counts), '数量': list(counts.values())}, columns=['分类', '数量'])
+    table = table.sort_values('数量', ascending=False, kind='stable').reset_index(drop=True)
+    total = table['数量'].sum()
+    table['占比'] = (table['数量'] / total).round(4) if total else 0.0
+    return table
+
+
+class FleetAccumulator:
+    """
+    流式汇总器
+
+    示例:
+        accumulator = FleetAccumulator()
+        parser.parse_multiple_files(files, on_result=accumulator.add)
+        summaries = accumulator.result()
+    """
+
+    def __init__(self, summaries: Optional[List[Summary]] = None, batch_size: int = 1000):
+        """
+        Args:
+            summaries: 汇总维度，默认为 SUMMARIES
+            batch_size: 每攒多少个报告做一次向量化计数
+        """
+        self.summaries = summaries if summaries is not None else SUMMARIES
+        self.batch_size = batch_size
+        self.reports = 0
+        self._counts = {summary.name: collections.Counter() for summary in self.summaries}
+        self._buffer: Dict[str, List[Dict]] = {}
+
+    def add(self, filename: str, records: List[Dict]):
+        """加入一个报告的解析结果"""
+        self.reports += 1
+        # 同名文件在流式模式下分别计数
+        self._buffer[f"{filename}#{self.reports}"] = records
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def add_frame(self, frame: pd.DataFrame):
+        """加入一块长表（列至少包含 项目、值），如分块读取的CSV导出"""
+        for summary in self.summaries:
+            self._counts[summary.name].update(summary.count(frame).to_dict())
+
+    def flush(self):
+        """对缓冲的报告计数并释放记录"""
+        if self._buffer:
+            self.add_frame(batch_to_frame(self._buffer))
+            self._buffer = {}
+
+    def result(self) -> Dict[str, pd.DataFrame]:
+        """
+        汇总结果
+
+        Returns:
+            汇总名称 -> DataFrame（列为 分类、数量、占比）
+        """
+        self.flush()
+        return {name: _to_table(counts) for name, counts in self._counts.items()}
+
+
+def aggregate(data: Dict[str, List[Dict]], summaries: Optional[List[Summary]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    一次性汇总 parse_multiple_files 的结果
+    """
+    accumulator = FleetAccumulator(summaries)
+    accumulator.add_frame(batch_to_frame(data))
+    return accumulator.result()
+
+
+def aggregate_csv(csv_path: str, summaries: Optional[List[Summary]] = None,
+                  chunksize: int = 200000) -> Dict[str, pd.DataFrame]:
+    """
+    分块读取合并CSV导出（export_csv 的输出）并汇总，不需要把整个文件读入内存
+    """
+    accumulator = FleetAccumulator(summaries)
+    for chunk in pd.read_csv(csv_path, usecols=['项目', '值'], dtype=str, encoding='utf-8-sig',
+                             chunksize=chunksize, keep_default_na=False):
+        accumulator.add_frame(chunk)
+    return accumulator.result()
+
+
+def summaries_to_frame(summaries: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """把各汇总表合并为一张长表（增加 汇总 列），便于导出"""
+    frames = [table.assign(汇总=name)[['汇总', '分类', '数量', '占比']]
+              for name, table in summaries.items() if not table.empty]
+    if not frames:
+        return pd.DataFrame(columns=['汇总', '分类', '数量', '占比'])
+    return pd.concat(frames, ignore_index=True)
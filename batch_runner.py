@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+故障隔离的批量解析模块
+
+每个文件在独立的工作进程中解析，监督进程负责：
+    - 单文件超时：超时的工作进程被终止并替换（如DOTALL正则的灾难性回溯）
+    - 内存限制：工作进程启动时设置内存上限（POSIX 为地址空间上限，Windows 为作业对象的进程内存上限）
+    - 工作进程回收：每个进程解析一定数量的文件后退出，防止内存泄漏累积
+    - 重试与隔离：失败的文件按次数重试，仍失败则进入隔离列表，其余文件照常处理
+"""
+
+import os
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from parser_core import AIDA64Parser
+from result_codec import columns_to_records, decode_columns, encode_records, records_to_columns
+
+
+# Windows 下工作进程所在的作业对象句柄（保持打开，限制才持续有效）
+_job_handle = None
+
+
+def _apply_windows_memory_limit(limit: int):
+    """把当前进程放入限制进程内存的作业对象（超出时分配失败，表现为 MemoryError）"""
+    global _job_handle
+    import ctypes
+    from ctypes import wintypes
+
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            'ReadOperationCount', 'WriteOperationCount', 'OtherOperationCount',
+            'ReadTransferCount', 'WriteTransferCount', 'OtherTransferCount')]
+
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [('PerProcessUserTimeLimit', ctypes.c_int64),
+                    ('PerJobUserTimeLimit', ctypes.c_int64),
+                    ('LimitFlags', wintypes.DWORD),
+                    ('MinimumWorkingSetSize', ctypes.c_size_t),
+                    ('MaximumWorkingSetSize', ctypes.c_size_t),
+                    ('ActiveProcessLimit', wintypes.DWORD),
+                    ('Affinity', ctypes.c_size_t),
+                    ('PriorityClass', wintypes.DWORD),
+                    ('SchedulingClass', wintypes.DWORD)]
+
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [('BasicLimitInformation', JOBOBJECT_BASIC_LIMIT_INFORMATION),
+                    ('IoInfo', IO_COUNTERS),
+                    ('ProcessMemoryLimit', ctypes.c_size_t),
+                    ('JobMemoryLimit', ctypes.c_size_t),
+                    ('PeakProcessMemoryUsed', ctypes.c_size_t),
+                    ('PeakJobMemoryUsed', ctypes.c_size_t)]
+
+    job_object_extended_limit_information = 9
+    job_object_limit_process_memory = 0x100
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p, wintypes.DWORD]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return
+    info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = job_object_limit_process_memory
+    info.ProcessMemoryLimit = limit
+    if (kernel32.SetInformationJobObject(job, job_object_extended_limit_information,
+                                         ctypes.byref(info), ctypes.sizeof(info))
+            and kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess())):
+        _job_handle = job
+    else:
+        kernel32.CloseHandle(job)
+
+
+def _apply_memory_limit(memory_limit_mb: Optional[int]):
+    """设置当前进程的内存上限（不支持的平台忽略）"""
+    if not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    if os.name == 'nt':
+        try:
+            _apply_windows_memory_limit(limit)
+        except (OSError, AttributeError):
+            pass
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(connection, selected_items, memory_limit_mb: Optional[int], max_tasks: int, columnar: bool,
+                 collect_stats: bool = False):
+    """
+    工作进程入口：逐个接收文件路径并返回解析结果（columnar 时返回列式编码的字节）
+
+    collect_stats 时每个结果附带该文件的分阶段统计（ParseStats.take_stages），否则为None。
+    """
+    _apply_memory_limit(memory_limit_mb)
+    parser = AIDA64Parser()
+    parser.enable_stats(collect_stats)
+
+    for _ in range(max_tasks):
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        task_id, file_path = task
+        try:
+            data = parser.parse_file(file_path, selected_items)
+            result = (task_id, True, encode_records(data) if columnar else data)
+        except MemoryError:
+            result = (task_id, False, "内存超出限制")
+        except Exception as e:
+            result = (task_id, False, str(e))
+        connection.send(result + (parser.stats.take_stages() if collect_stats else None,))
+
+    connection.close()
+
+
+class _WorkerSlot:
+    """一个工作进程及其当前任务"""
+
+    def __init__(self, context, selected_items, memory_limit_mb, max_tasks, columnar, collect_stats=False):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=_worker_main,
+                                       args=(child_connection, selected_items, memory_limit_mb, max_tasks, columnar,
+                                             collect_stats),
+                                       daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.max_tasks = max_tasks
+        self.tasks = 0
+        self.task_id = None
+        self.started = 0.0
+
+    @property
+    def exhausted(self) -> bool:
+        """是否已达到回收次数（工作进程将自行退出）"""
+        return self.tasks >= self.max_tasks
+
+    def assign(self, task_id: int, file_path: str):
+        self.task_id = task_id
+        self.tasks += 1
+        self.started = time.monotonic()
+        self.connection.send((task_id, file_path))
+
+    def stop(self, force: bool = False):
+        """停止工作进程"""
+        if force:
+            self.process.terminate()
+        else:
+            try:
+                self.connection.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        self.process.join(timeout=1 if not force else None)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class BatchRunner:
+    """故障隔离的批量解析器"""
+
+    def __init__(self, selected_items=None, workers: Optional[int] = None, timeout: float = 60.0,
+                 memory_limit_mb: Optional[int] = None, max_tasks_per_worker: int = 500,
+                 retries: int = 1, stats=None, checkpoint=None,
+                 on_result: Callable[[str, List[Dict]], None] = None,
+                 progress_callback: Callable[[int, int], None] = None, keep_results: bool = True,
+                 on_columns: Callable[[str, int, Dict[str, list]], None] = None):
+        """
+        Args:
+            selected_items: 选中的项目列表或 ItemSelector
+            workers: 工作进程数，默认为CPU核数
+            timeout: 单文件超时秒数
+            memory_limit_mb: 单个工作进程的内存上限（MB），None表示不限制
+                （POSIX 限制地址空间，Windows 限制作业对象中的进程提交内存）
+            max_tasks_per_worker: 工作进程解析多少个文件后回收
+            retries: 失败文件的重试次数
+            stats: 可选的 ParseStats，用于记录每个文件的耗时；开启时工作进程的分阶段耗时也合并进来
+            checkpoint: 可选的 CheckpointJournal，已完成的文件直接恢复，新结果写入日志
+            on_result: 每个文件完成后的回调 on_result(文件名, 解析结果)
+            progress_callback: 进度回调 progress_callback(已完成数, 总数)
+            keep_results: 为False时不在内存中保留结果，run 返回空字典（结果只通过 on_result 交付）
+            on_columns: 列式结果回调 on_columns(文件名, 记录数, 列名 -> 列数据)，如 SpillingExporter.add_columns；
+                设置后工作进程以紧凑列式编码传回结果，监督进程直接解码为列，
+                只有 keep_results、on_result 或检查点需要时才组装为记录列表
+        """
+        self.selected_items = selected_items
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self.retries = retries
+        self.stats = stats
+        self.checkpoint = checkpoint
+        self.on_result = on_result
+        self.progress_callback = progress_callback
+        self.keep_results = keep_results
+        self.on_columns = on_columns
+
+        # 隔离列表：[(文件路径, 原因)]
+        self.quarantine: List[Tuple[str, str]] = []
+
+    def _spawn(self, context) -> _WorkerSlot:
+        return _WorkerSlot(context, self.selected_items, self.memory_limit_mb, self.max_tasks_per_worker,
+                           self.on_columns is not None, self.stats is not None and self.stats.enabled)
+
+    def run(self, file_paths: List[str]) -> Dict[str, List[Dict]]:
+        """
+        批量解析
+
+        Returns:
+            字典，键为文件名，值为解析结果（与 parse_multiple_files 相同）
+        """
+        from item_selector import compile_items
+        self.selected_items = compile_items(self.selected_items)
+        self.quarantine = []
+
+        file_paths = list(file_paths)
+        total = len(file_paths)
+        results: Dict[int, List[Dict]] = {}
+        attempts = [0] * total
+        done = 0
+
+        context = multiprocessing.get_context()
+        slots: List[_WorkerSlot] = []
+
+        def deliver(task_id: int, data: Optional[List[Dict]], columns=None):
+            if self.keep_results:
+                results[task_id] = data
+            filename = os.path.basename(file_paths[task_id])
+            if self.on_columns is not None:
+                self.on_columns(filename, *(columns if columns is not None else records_to_columns(data)))
+            if self.on_result is not None:
+                self.on_result(filename, data)
+
+        def finish(task_id: int, data: Optional[List[Dict]], columns=None):
+            nonlocal done
+            done += 1
+            deliver(task_id, data, columns)
+            if self.progress_callback is not None:
+                self.progress_callback(done, total)
+
+        def fail(task_id: int, reason: str):
+            attempts[task_id] += 1
+            if attempts[task_id] <= self.retries:
+                pending.append(task_id)
+                return
+            self.quarantine.append((file_paths[task_id], reason))
+            finish(task_id, [{'项目': '错误', '值': reason}])
+
+        # 从检查点恢复已完成的文件
+        pending = []
+        restored_results = []
+        for task_id in range(total - 1, -1, -1):
+            restored = self.checkpoint.lookup(file_paths[task_id]) if self.checkpoint is not None else None
+            if restored is None:
+                pending.append(task_id)
+            else:
+                restored_results.append((task_id, restored[1]))
+        done = len(restored_results)
+        for task_id, data in reversed(restored_results):
+            deliver(task_id, data)
+        if done and self.progress_callback is not None:
+            self.progress_callback(done, total)
+
+        try:
+            for _ in range(min(self.workers, len(pending))):
+                slots.append(self._spawn(context))
+
+            while done < total:
+                # 给空闲的工作进程分配任务
+                for slot in slots:
+                    if slot.task_id is None and pending:
+                        task_id = pending.pop()
+                        slot.assign(task_id, file_paths[task_id])
+
+                busy = {slot.connection: slot for slot in slots if slot.task_id is not None}
+                if not busy:
+                    break
+
+                for connection in wait(list(busy), timeout=0.1):
+                    slot = busy[connection]
+                    task_id = slot.task_id
+                    elapsed = time.monotonic() - slot.started
+                    try:
+                        _, ok, payload, stages = connection.recv()
+                    except (EOFError, OSError):
+                        # 工作进程崩溃（如被内存限制或系统终止）
+                        slot.task_id = None
+                        self._replace(slots, slot, context)
+                        fail(task_id, "工作进程异常退出")
+                        continue
+
+                    slot.task_id = None
+                    if slot.exhausted:
+                        self._replace(slots, slot, context)
+                    if self.stats is not None:
+                        self.stats.record_file(file_paths[task_id], elapsed, failed=not ok)
+                        if stages is not None:
+                            self.stats.merge_stages(*stages)
+                    if ok:
+                        columns = None
+                        if self.on_columns is not None:
+                            columns = decode_columns(payload)
+                            need_records = self.keep_results or self.on_result is not None or self.checkpoint is not None
+                            payload = columns_to_records(*columns) if need_records else None
+                        if self.checkpoint is not None:
+                            self.checkpoint.record(file_paths[task_id], os.path.basename(file_paths[task_id]), payload)
+                        finish(task_id, payload, columns)
+                    else:
+                        fail(task_id, payload)
+
+                # 超时检查与回收已退出的工作进程
+                now = time.monotonic()
+                for slot in list(slots):
+                    if slot.task_id is not None and now - slot.started > self.timeout:
+                        task_id = slot.task_id
+                        slot.task_id = None
+                        self._replace(slots, slot, context, force=True)
+                        fail(task_id, f"解析超时（超过 {self.timeout:g} 秒）")
+                    elif slot.task_id is None and not slot.process.is_alive():
+                        self._replace(slots, slot, context)
+        finally:
+            for slot in slots:
+                slot.stop(force=slot.task_id is not None)
+
+        return {os.path.basename(file_paths[task_id]): results[task_id] for task_id in sorted(results)}
+
+    def _replace(self, slots: List[_WorkerSlot], slot: _WorkerSlot, context, force: bool = False):
+        """用新的工作进程替换指定的工作进程"""
+        slot.stop(force=force)
+        slots[slots.index(slot)] = self._spawn(context)
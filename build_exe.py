@@ -47,6 +47,11 @@ def build_exe():
         '--icon=icon.ico' if os.path.exists('icon.ico') else '',
         '--add-data=config;config',
         '--add-data=templates;templates',
+        # pandas 的可选依赖，本工具未使用，排除以减小单文件体积和解压时间
+        '--exclude-module=matplotlib',
+        '--exclude-module=scipy',
+        '--exclude-module=IPython',
+        '--exclude-module=pytest',
         'main.py'
     ]
     
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+批量任务检查点模块
+
+解析结果逐个追加到本地日志（行分隔JSON），定期刷新到磁盘。任务中断（崩溃、重启、
+关闭窗口）后重新开始时，修改时间和大小未变的已完成文件直接从日志恢复，只解析剩余文件。
+
+日志第一行记录任务签名（选中的项目），签名不同的日志视为过期并重新开始；
+最后一行如因中断而不完整会被忽略，缺少字段的记录跳过。
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def job_signature(selected_items) -> str:
+    """根据选中的项目生成任务签名（None表示全部项目）"""
+    if selected_items is None:
+        source = None
+    elif hasattr(selected_items, 'whole_sections'):
+        source = [list(selected_items.items), sorted(selected_items.whole_sections),
+                  [[rule.kind, rule.name, rule.source, rule.section] for rule in selected_items.rules.rules]]
+    else:
+        source = list(selected_items)
+    text = json.dumps(source, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _file_key(file_path: str) -> str:
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+def _file_state(file_path: str) -> Optional[Tuple[int, int]]:
+    """文件的 (修改时间纳秒, 大小)，文件不存在时返回None"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class CheckpointJournal:
+    """
+    追加写入的检查点日志
+
+    示例:
+        with CheckpointJournal('config/checkpoint.ndjson', selected_items) as journal:
+            parser.parse_multiple_files(files, selected_items, checkpoint=journal)
+    """
+
+    def __init__(self, journal_path: str, selected_items=None, flush_interval: float = 5.0):
+        """
+        Args:
+            journal_path: 日志文件路径
+            selected_items: 选中的项目（用于任务签名）
+            flush_interval: 刷新到磁盘的间隔秒数
+        """
+        self.journal_path = journal_path
+        self.signature = job_signature(selected_items)
+        self.flush_interval = flush_interval
+
+        # 已完成的文件：规范化路径 -> (修改时间, 大小, 文件名, 解析结果)
+        self.completed: Dict[str, Tuple[int, int, str, List[Dict]]] = {}
+        self._file = None
+        self._last_flush = 0.0
+
+    def open(self):
+        """打开日志，读取已有检查点；签名不符时清空重来"""
+        if self._load():
+            self._file = open(self.journal_path, 'a', encoding='utf-8', newline='\n')
+        else:
+            self.completed = {}
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.journal_path, 'w', encoding='utf-8', newline='\n')
+            self._file.write(json.dumps({'任务签名': self.signature}) + '\n')
+            self._sync()
+        self._last_flush = time.monotonic()
+        return self
+
+    def _load(self) -> bool:
+        """读取日志，返回日志是否属于当前任务"""
+        if not os.path.exists(self.journal_path):
+            return False
+
+        valid_size = 0
+        with open(self.journal_path, 'rb') as f:
+            header = f.readline()
+            try:
+                if json.loads(header).get('任务签名') != self.signature:
+                    return False
+            except (ValueError, AttributeError):
+                return False
+            valid_size = f.tell()
+
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_size = f.tell()
+                try:
+                    self.completed[entry['路径']] = (entry['修改时间'], entry['大小'], entry['文件名'], entry['数据'])
+                except (KeyError, TypeError):
+                    # 完整但缺少字段的记录，跳过
+                    continue
+
+        # 截掉中断时写了一半的记录，后续追加从完整记录之后开始
+        if valid_size < os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_size)
+        return True
+
+    def lookup(self, file_path: str) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        查找已完成的文件（文件修改时间或大小变化后视为未完成）
+
+        Returns:
+            (文件名, 解析结果)，未完成时返回None
+        """
+        entry = self.completed.get(_file_key(file_path))
+        if entry is None or _file_state(file_path) != (entry[0], entry[1]):
+            return None
+        return entry[2], entry[3]
+
+    def pending(self, file_paths: Iterable[str]) -> List[str]:
+        """待解析的文件路径列表"""
+        return [file_path for file_path in file_paths if self.lookup(file_path) is None]
+
+    def record(self, file_path: str, filename: str, data: List[Dict]):
+        """记录一个已完成的文件"""
+        state = _file_state(file_path)
+        if state is None:
+            return
+        key = _file_key(file_path)
+        self.completed[key] = (state[0], state[1], filename, data)
+        self._file.write(json.dumps({'路径': key, '修改时间': state[0], '大小': state[1],
+                                     '文件名': filename, '数据': data},
+                                    ensure_ascii=False, separators=(',', ':')) + '\n')
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._sync()
+
+    def _sync(self):
+        """把缓冲的记录写入磁盘"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """刷新并关闭日志"""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """任务完成后删除日志"""
+        self.close()
+        self.completed = {}
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""
+导出模块
+"""
+
+import bz2
+import contextlib
+import csv
+import gzip
+import json
+import lzma
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# 压缩方式 -> (打开函数, 文件扩展名)，均来自标准库
+COMPRESSIONS = {
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+# CSV固定列，解析器附带的其他列（如 数值、单位）追加在后
+CSV_BASE_COLUMNS = ['文件名', '项目', '值']
+
+
+def _csv_columns(data: Dict[str, List[Dict]]) -> List[str]:
+    """收集所有记录中出现的列"""
+    columns = list(CSV_BASE_COLUMNS)
+    seen = set(columns)
+    for records in data.values():
+        for record in records:
+            for key in record:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+    return columns
+
+
+def export_csv(data: Dict[str, List[Dict]], output_path: str, batch_size: int = 5000) -> str:
+    """
+    导出所有报告到一个合并的CSV文件
+
+    Args:
+        data: 解析结果字典
+        output_path: 输出文件路径
+        batch_size: 每批写入的行数
+
+    Returns:
+        输出文件路径
+    """
+    columns = _csv_columns(data)
+
+    with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        _write_csv_rows(writer, data, columns, batch_size)
+
+    return output_path
+
+
+def _write_csv_rows(writer, data: Dict[str, List[Dict]], columns: List[str], batch_size: int = 5000):
+    """按列顺序分批写入数据行"""
+    batch = []
+    for filename, records in data.items():
+        for record in records:
+            batch.append([filename] + [record.get(column, '') for column in columns[1:]])
+            if len(batch) >= batch_size:
+                writer.writerows(batch)
+                batch = []
+    if batch:
+        writer.writerows(batch)
+
+
+def export_json(data: Dict[str, List[Dict]], output_path: str) -> str:
+    """
+    导出为JSON文件
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    return output_path
+
+
+def _infer_compression(path: str) -> Optional[str]:
+    """根据扩展名推断压缩方式"""
+    for compression, (_, extension) in COMPRESSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def _open_text(path: str, mode: str, compression: Optional[str]):
+    """以文本模式打开（可能压缩的）文件"""
+    if compression is None:
+        return open(path, mode, encoding='utf-8', newline='\n')
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"不支持的压缩方式: {compression}")
+    return COMPRESSIONS[compression][0](path, mode + 't', encoding='utf-8', newline='\n')
+
+
+def _ndjson_line(filename: str, records: List[Dict]) -> str:
+    return json.dumps({'文件名': filename, '数据': records}, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class NDJSONWriter:
+    """
+    行分隔JSON写入器，每行一个报告: {"文件名": ..., "数据": [...]}
+
+    可在解析过程中逐个写入，无需把整批结果保存在内存中:
+        with NDJSONWriter('out.ndjson.gz') as writer:
+            parser.parse_multiple_files(files, items, on_result=writer.write)
+    """
+
+    def __init__(self, output_path: str, compression: Optional[str] = 'auto', append: bool = False):
+        """
+        Args:
+            output_path: 输出文件路径
+            compression: 'gzip'、'bz2'、'xz'、None，或 'auto'（按扩展名推断）
+            append: 追加到已有文件末尾（压缩文件追加为新的压缩流，读取时自动衔接）
+        """
+        self.output_path = output_path
+        self.compression = _infer_compression(output_path) if compression == 'auto' else compression
+        self.append = append
+        self.count = 0
+        self._file = None
+
+    def open(self):
+        """打开输出文件"""
+        self._file = _open_text(self.output_path, 'a' if self.append else 'w', self.compression)
+        return self
+
+    def write(self, filename: str, records: List[Dict]):
+        """写入一个报告"""
+        self._file.write(_ndjson_line(filename, records))
+        self.count += 1
+
+    def close(self):
+        """关闭输出文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def export_ndjson(data: Dict[str, List[Dict]], output_path: str, compression: Optional[str] = 'auto') -> str:
+    """
+    导出为行分隔JSON文件（可压缩）
+    """
+    with NDJSONWriter(output_path, compression) as writer:
+        for filename, records in data.items():
+            writer.write(filename, records)
+
+    return output_path
+
+
+def read_ndjson(input_path: str, compression: Optional[str] = 'auto') -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    流式读取行分隔JSON文件，逐个返回 (文件名, 解析结果)
+    """
+    if compression == 'auto':
+        compression = _infer_compression(input_path)
+
+    with _open_text(input_path, 'r', compression) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                report = json.loads(line)
+                yield report['文件名'], report['数据']
+
+
+# ---------------------------------------------------------------------------
+# 增量更新（追加/替换）
+#
+# 以报告名称（解析结果字典的键）为报告身份。输出文件旁保存一个键索引
+# <输出文件>.keys.json，记录已有报告及CSV列；新增报告直接追加到文件末尾，
+# 只有替换已有报告（或CSV出现新列）时才流式重写一遍，已有行原样复制、不重新解析。
+# 索引与文件大小/修改时间不符（文件被其他方式改写）时重新扫描文件。
+# ---------------------------------------------------------------------------
+
+def _keys_path(output_path: str) -> str:
+    return output_path + '.keys.json'
+
+
+def _load_keys(output_path: str, scan: Callable[[str], Tuple[List[str], List[str]]]) -> Tuple[List[str], List[str]]:
+    """读取键索引，返回 (列, 报告名称列表)；索引缺失或过期时调用 scan 扫描文件"""
+    stat = os.stat(output_path)
+    try:
+        with open(_keys_path(output_path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index['大小'] == stat.st_size and index['修改时间'] == stat.st_mtime_ns:
+            return index['列'], index['报告']
+    except (OSError, ValueError, KeyError):
+        pass
+    return scan(output_path)
+
+
+def _save_keys(output_path: str, columns: List[str], reports: List[str]):
+    stat = os.stat(output_path)
+    index = {'大小': stat.st_size, '修改时间': stat.st_mtime_ns, '列': columns, '报告': reports}
+    with open(_keys_path(output_path), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+
+
+def _merge_keys(reports: List[str], data: Dict[str, List[Dict]]) -> List[str]:
+    """替换的报告移到末尾，与文件中的顺序一致"""
+    return [report for report in reports if report not in data] + list(data)
+
+
+def _scan_csv(output_path: str) -> Tuple[List[str], List[str]]:
+    reports = {}
+    with open(output_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, list(CSV_BASE_COLUMNS))
+        for row in reader:
+            if row:
+                reports[row[0]] = None
+    return columns, list(reports)
+
+
+def upsert_csv(data: Dict[str, List[Dict]], output_path: str, batch_size: int = 5000) -> str:
+    """
+    增量更新合并的CSV文件：新报告追加，同名报告整体替换
+
+    Args:
+        data: 新的解析结果字典
+        output_path: 已有（或新建）的CSV文件路径
+        batch_size: 每批写入的行数
+
+    Returns:
+        输出文件路径
+    """
+    if not os.path.exists(output_path):
+        export_csv(data, output_path, batch_size)
+        _save_keys(output_path, _csv_columns(data), list(data))
+        return output_path
+
+    columns, reports = _load_keys(output_path, _scan_csv)
+    new_columns = [column for column in _csv_columns(data) if column not in columns]
+    replaced = any(report in data for report in reports)
+
+    if not replaced and not new_columns:
+        with open(output_path, 'a', encoding='utf-8', newline='') as f:
+            _write_csv_rows(csv.writer(f), data, columns, batch_size)
+    else:
+        columns = columns + new_columns
+        temp_path = output_path + '.tmp'
+        with open(output_path, 'r', encoding='utf-8-sig', newline='') as src, \
+                open(temp_path, 'w', encoding='utf-8-sig', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            next(reader, None)
+            writer.writerow(columns)
+            padding = [''] * len(new_columns)
+            writer.writerows(row + padding for row in reader if row and row[0] not in data)
+            _write_csv_rows(writer, data, columns, batch_size)
+        os.replace(temp_path, output_path)
+
+    _save_keys(output_path, columns, _merge_keys(reports, data))
+    return output_path
+
+
+def _scan_ndjson(output_path: str) -> Tuple[List[str], List[str]]:
+    reports = {filename: None for filename, _ in read_ndjson(output_path)}
+    return [], list(reports)
+
+
+def upsert_ndjson(data: Dict[str, List[Dict]], output_path: str, compression: Optional[str] = 'auto') -> str:
+    """
+    增量更新行分隔JSON文件：新报告追加，同名报告整体替换
+    """
+    if compression == 'auto':
+        compression = _infer_compression(output_path)
+
+    if not os.path.exists(output_path):
+        export_ndjson(data, output_path, compression)
+        _save_keys(output_path, [], list(data))
+        return output_path
+
+    _, reports = _load_keys(output_path, _scan_ndjson)
+    if not any(report in data for report in reports):
+        with NDJSONWriter(output_path, compression, append=True) as writer:
+            for filename, records in data.items():
+                writer.write(filename, records)
+    else:
+        temp_path = output_path + '.tmp'
+        with _open_text(output_path, 'r', compression) as src, _open_text(temp_path, 'w', compression) as dst:
+            for line in src:
+                # 未替换的报告原样复制
+                if line.strip() and json.loads(line)['文件名'] not in data:
+                    dst.write(line if line.endswith('\n') else line + '\n')
+            for filename, records in data.items():
+                dst.write(_ndjson_line(filename, records))
+        os.replace(temp_path, output_path)
+
+    _save_keys(output_path, [], _merge_keys(reports, data))
+    return output_path
+
+
+def partition_of(report: str, partitions: int) -> int:
+    """报告所属的分区号（按名称哈希，跨进程稳定）"""
+    return zlib.crc32(report.encode('utf-8')) % partitions
+
+
+def upsert_parquet(data: Dict[str, List[Dict]], output_dir: str, partitions: int = 64) -> str:
+    """
+    增量更新按报告名称哈希分区的Parquet数据集（目录下 part-000.parquet ...），
+    只重写包含新报告的分区；需要 pyarrow。
+
+    Args:
+        data: 新的解析结果字典
+        output_dir: 数据集目录（不存在时创建）
+        partitions: 分区数，同一数据集必须保持不变
+
+    Returns:
+        输出目录
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("导出Parquet需要安装 pyarrow: pip install pyarrow")
+    import pandas as pd
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    affected: Dict[int, List[str]] = {}
+    for report in data:
+        affected.setdefault(partition_of(report, partitions), []).append(report)
+
+    for partition, reports in affected.items():
+        rows = [dict(record, 文件名=report) for report in reports for record in data[report]]
+        frame = pd.DataFrame(rows, columns=_csv_columns({report: data[report] for report in reports}))
+
+        path = os.path.join(output_dir, f"part-{partition:03d}.parquet")
+        if os.path.exists(path):
+            existing = pd.read_parquet(path)
+            existing = existing[~existing['文件名'].isin(reports)]
+            frame = pd.concat([existing, frame], ignore_index=True)
+
+        temp_path = path + '.tmp'
+        frame.to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+
+    return output_dir
+
+
+class ExportPipeline:
+    """多格式导出流水线，各格式写入器并发执行"""
+
+    # 格式名称 -> (显示名称, 文件扩展名)
+    FORMATS = {
+        'excel': ('Excel', '.xlsx'),
+        'csv': ('CSV', '.csv'),
+        'json': ('JSON', '.json'),
+        'ndjson': ('NDJSON', '.ndjson.gz'),
+    }
+
+    def __init__(self, parser, data: Dict[str, List[Dict]], folder: str, base_name: str,
+                 formats: Iterable[str] = ('excel', 'csv', 'json', 'ndjson'),
+                 progress_callback: Optional[Callable[[str, str, int, int], None]] = None,
+                 upsert: bool = False, normalize: bool = False):
+        """
+        Args:
+            parser: AIDA64Parser实例（用于Excel导出）
+            data: 解析结果字典
+            folder: 输出文件夹
+            base_name: 输出文件基础名
+            formats: 需要导出的格式
+            progress_callback: 进度回调 callback(格式显示名称, 状态消息, 已完成数, 总数)
+            upsert: CSV 与 NDJSON 增量更新已有文件（追加新报告、替换同名报告），其他格式仍整体重写
+            normalize: 导出前为每条记录附加类型化的 字节、赫兹、日期 列（见 normalize 模块）
+        """
+        self.parser = parser
+        self.data = data
+        self.folder = folder
+        self.base_name = base_name
+        self.formats = [fmt for fmt in formats if fmt in self.FORMATS]
+        self.progress_callback = progress_callback
+        self.upsert = upsert
+        self.normalize = normalize
+
+        # 导出结果：格式名称 -> 输出路径；失败的格式记录在 errors 中
+        self.outputs = {}
+        self.errors = {}
+
+    def _writer(self, fmt: str) -> Callable[[str], str]:
+        """获取格式对应的写入函数"""
+        if fmt == 'excel':
+            return lambda path: self.parser.export_to_excel(self.data, path)
+        if fmt == 'csv':
+            if self.upsert:
+                return lambda path: upsert_csv(self.data, path)
+            return lambda path: export_csv(self.data, path)
+        if fmt == 'ndjson':
+            if self.upsert:
+                return lambda path: upsert_ndjson(self.data, path)
+            return lambda path: export_ndjson(self.data, path)
+        return lambda path: export_json(self.data, path)
+
+    def _report(self, fmt: str, message: str, done: int):
+        """报告进度"""
+        if self.progress_callback:
+            self.progress_callback(self.FORMATS[fmt][0], message, done, len(self.formats))
+
+    def _export_one(self, fmt: str) -> Tuple[str, float]:
+        """导出单个格式，返回 (输出路径, 耗时秒数)"""
+        display_name, extension = self.FORMATS[fmt]
+        output_path = os.path.join(self.folder, f"{self.base_name}{extension}")
+        start = time.perf_counter()
+        # Excel导出在 export_to_excel 内部自行计时
+        stage = self.parser.stats.stage(f'导出:{display_name}') if fmt != 'excel' else contextlib.nullcontext()
+        with stage:
+            self._writer(fmt)(output_path)
+        return output_path, time.perf_counter() - start
+
+    def run(self) -> Dict[str, str]:
+        """
+        执行导出（阻塞直到所有格式完成，应在后台线程中调用）
+
+        Returns:
+            格式名称 -> 输出路径
+        """
+        if self.normalize:
+            # pandas 仅在需要规范化时加载
+            from normalize import normalize_records
+            with self.parser.stats.stage('规范化'):
+                self.data = normalize_records(self.data)
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=max(1, len(self.formats))) as executor:
+            futures = {executor.submit(self._export_one, fmt): fmt for fmt in self.formats}
+            for fmt in self.formats:
+                self._report(fmt, "开始导出", done)
+
+            for future in as_completed(futures):
+                fmt = futures[future]
+                done += 1
+                try:
+                    output_path, elapsed = future.result()
+                    self.outputs[fmt] = output_path
+                    self._report(fmt, f"导出完成 ({elapsed:.1f}s): {output_path}", done)
+                except Exception as e:
+                    self.errors[fmt] = str(e)
+                    self._report(fmt, f"导出失败: {e}", done)
+
+        return self.outputs
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+自定义提取规则模块
+
+模板中的正则/通配符规则按目标节分组，每组编译为一个行首驱动正则加一棵
+按规则字面前缀建立的前缀树。每个节只扫描一次，每行只尝试前缀能对上的少数
+候选规则，因此规则从5条增加到200条时扫描开销基本不变。
+（Python 的 re 对多分支合并正则是逐个分支回溯尝试的，合并后的开销仍随规则数线性增长。）
+
+模板写法:
+    {
+        'name': '自定义规则',
+        'rules': [
+            {'name': 'BIOS日期', 'regex': r'BIOS 日期:\\s*(?P<value>.+)', 'section': '系统概述'},
+            {'glob': '*序列号', 'section': 'SPD'}
+        ]
+    }
+
+正则规则从行首（忽略缩进）开始匹配；值取命名组 value，否则取第一个有值的组，否则取整个匹配。
+通配符规则匹配键值行的键（* 不跨行），输出的项目名为原始键。
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 正则中的元字符，字面前缀在遇到它们时结束
+_REGEX_METACHARS = set('.^$*+?{}[]\\|()')
+
+# 使前一个字符变为可选的量词
+_OPTIONAL_QUANTIFIERS = set('*?{')
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """正则是否含有不在分组、字符集内的 |（各分支的开头不同）"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def _literal_prefix(pattern: str) -> str:
+    """提取正则开头的字面前缀（用于前缀树分派），顶层有 | 分支时没有公共前缀"""
+    if _has_top_level_alternation(pattern):
+        return ''
+    prefix = []
+    for char in pattern:
+        if char in _REGEX_METACHARS:
+            # 前一个字符后跟 * ? {m,n} 时不一定出现
+            if char in _OPTIONAL_QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return ''.join(prefix)
+
+
+# 前缀树节点中存放规则的键
+_RULES = '\0'
+
+
+def _glob_to_line_regex(glob: str) -> str:
+    """将键的通配符转换为匹配键值行的正则（命名组 key、value，值不能为空）"""
+    parts = []
+    for char in glob:
+        if char == '*':
+            parts.append(r'[^\n]*?')
+        elif char == '?':
+            parts.append(r'[^\n]')
+        else:
+            parts.append(re.escape(char))
+    return r'(?P<key>' + ''.join(parts) + r')(?::[ \t]*|[ \t]{2,})(?P<value>\S[^\n]*)'
+
+
+class ExtractionRule:
+    """单条提取规则"""
+
+    def __init__(self, name: Optional[str] = None, regex: Optional[str] = None,
+                 glob: Optional[str] = None, section: Optional[str] = None):
+        """
+        Args:
+            name: 输出的项目名（通配符规则可省略，使用原始键）
+            regex: 正则表达式
+            glob: 键的通配符
+            section: 目标报告节名称，None表示整个报告
+        """
+        if bool(regex) == bool(glob):
+            raise ValueError("提取规则必须且只能指定 regex 或 glob 之一")
+
+        self.name = name or regex or glob
+        self.kind = 'regex' if regex else 'glob'
+        self.source = regex or glob
+        self.section = section
+
+        if regex:
+            # 规则总是从行首（缩进之后）开始匹配，开头的 ^ 是多余的
+            pattern = regex[1:] if regex.startswith('^') else regex
+            self.literal_prefix = _literal_prefix(pattern)
+        else:
+            pattern = _glob_to_line_regex(glob)
+            self.literal_prefix = re.split(r'[*?]', glob, 1)[0]
+
+        self.regex = re.compile(pattern, re.M)
+        if self.regex.flags & re.IGNORECASE:
+            self.literal_prefix = ''
+
+    def extract(self, match) -> Dict:
+        """从匹配结果生成记录"""
+        groupindex = self.regex.groupindex
+        if 'value' in groupindex:
+            value = match.group('value')
+        elif self.regex.groups:
+            # 多分支正则只有命中的分支的组有值
+            value = next((group for group in match.groups() if group is not None), None)
+        else:
+            value = match.group(0)
+
+        key = match.group('key').strip() if 'key' in groupindex else self.name
+        return {'项目': key, '值': (value or '').strip()}
+
+    @classmethod
+    def from_dict(cls, rule: Dict) -> 'ExtractionRule':
+        """从模板中的规则字典创建"""
+        return cls(name=rule.get('name'), regex=rule.get('regex'),
+                   glob=rule.get('glob'), section=rule.get('section'))
+
+    @classmethod
+    def from_line(cls, line: str) -> Optional['ExtractionRule']:
+        """
+        从自定义项目输入框的一行创建，支持:
+            re:名称=正则   或   re:正则
+            glob:通配符
+        非规则行返回None
+        """
+        if line.startswith('re:'):
+            body = line[3:]
+            name, separator, pattern = body.partition('=')
+            if separator and name and not any(char in name for char in '()[]\\^$'):
+                return cls(name=name.strip(), regex=pattern)
+            return cls(regex=body)
+        if line.startswith('glob:'):
+            return cls(glob=line[5:].strip())
+        return None
+
+    def __repr__(self):
+        return f"ExtractionRule({self.kind}={self.source!r}, section={self.section!r})"
+
+
+class _RuleDispatcher:
+    """一组规则的单次扫描分派器"""
+
+    def __init__(self, rules: List[ExtractionRule]):
+        # 前缀树：字符 -> 子节点；节点的 _RULES 键存放 (规则序号, 规则)
+        self._trie: Dict = {}
+        for order, rule in enumerate(rules):
+            node = self._trie
+            for char in rule.literal_prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(_RULES, []).append((order, rule))
+
+        # 没有字面前缀的规则需要在每行尝试；否则只访问首字符可能命中的行
+        first_chars = [char for char in self._trie if char != _RULES]
+        if _RULES in self._trie or not first_chars:
+            self._driver = re.compile(r'^[ \t]*', re.M)
+        else:
+            self._driver = re.compile(r'^[ \t]*(?=[' + ''.join(re.escape(char) for char in first_chars) + '])',
+                                      re.M)
+
+    def _candidates(self, content: str, position: int) -> List[ExtractionRule]:
+        """沿前缀树收集在该位置可能匹配的规则（按规则顺序）"""
+        candidates = list(self._trie.get(_RULES, ()))
+        node = self._trie
+        length = len(content)
+        while position < length:
+            node = node.get(content[position])
+            if node is None:
+                break
+            candidates.extend(node.get(_RULES, ()))
+            position += 1
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [rule for _, rule in candidates]
+
+    def apply(self, content: str) -> List[Dict]:
+        """对一段文本做一次扫描，返回所有规则的提取结果"""
+        data = []
+        resume = 0
+        for line in self._driver.finditer(content):
+            position = line.end()
+            if position < resume:
+                continue
+            for rule in self._candidates(content, position):
+                match = rule.regex.match(content, position)
+                if match:
+                    data.append(rule.extract(match))
+                    resume = max(match.end(), position + 1)
+                    break
+        return data
+
+
+class CompiledRuleSet:
+    """按目标节分组并合并编译的规则集"""
+
+    def __init__(self, rules: Iterable[ExtractionRule]):
+        grouped: Dict[Optional[str], List[ExtractionRule]] = {}
+        for rule in rules:
+            grouped.setdefault(rule.section, []).append(rule)
+
+        self.rules = [rule for group in grouped.values() for rule in group]
+        self._patterns = {section: _RuleDispatcher(group) for section, group in grouped.items()}
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def sections(self) -> List[Optional[str]]:
+        """规则涉及的节（None表示整个报告）"""
+        return list(self._patterns)
+
+    def apply(self, content: str, sections: Dict[str, Tuple[int, int]]) -> List[Dict]:
+        """
+        对报告应用所有规则，每个目标节只扫描一次
+
+        Args:
+            content: 报告全文
+            sections: index_sections 得到的节偏移索引
+        """
+        data = []
+        for section, pattern in self._patterns.items():
+            if section is None:
+                data.extend(pattern.apply(content))
+                continue
+            offsets = sections.get(section)
+            if offsets is not None:
+                data.extend(pattern.apply(content[offsets[0]:offsets[1]]))
+        return data
+
+
+def compile_rules(rules: Iterable) -> CompiledRuleSet:
+    """将规则（ExtractionRule 或模板中的规则字典）编译为规则集"""
+    return CompiledRuleSet(rule if isinstance(rule, ExtractionRule) else ExtractionRule.from_dict(rule)
+                           for rule in rules)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+报告文件发现模块
+"""
+
+import os
+import fnmatch
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Iterable, Tuple, Optional
+
+
+# AIDA64报告头部特征（GBK/UTF-8下为ASCII字节，另附UTF-16形式）
+AIDA64_SIGNATURES = (
+    b'AIDA64',
+    b'--------[ ',
+    'AIDA64'.encode('utf-16-le'),
+)
+
+# 头部嗅探读取的字节数
+SNIFF_BYTES = 4096
+
+
+def sniff_aida64_report(file_path: str, sniff_bytes: int = SNIFF_BYTES) -> bool:
+    """
+    读取文件头部，判断是否为AIDA64报告
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(sniff_bytes)
+    except OSError:
+        return False
+
+    return any(signature in head for signature in AIDA64_SIGNATURES)
+
+
+class ReportDiscovery:
+    """AIDA64报告文件发现器"""
+
+    def __init__(self, include: Iterable[str] = ('*.txt',), exclude: Iterable[str] = (),
+                 sniff: bool = True, max_workers: Optional[int] = None,
+                 follow_symlinks: bool = False):
+        """
+        Args:
+            include: 文件名包含规则（glob，不区分大小写）
+            exclude: 排除规则（glob，匹配文件名、目录名或相对路径）
+            sniff: 是否通过头部嗅探确认为AIDA64报告
+            max_workers: 并行遍历的线程数
+            follow_symlinks: 是否跟随符号链接
+        """
+        self.include = [pattern.lower() for pattern in include]
+        self.exclude = [pattern.lower() for pattern in exclude]
+        self.sniff = sniff
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.follow_symlinks = follow_symlinks
+
+        # 最近一次发现的统计信息
+        self.last_stats = {}
+
+    def _is_included(self, name: str) -> bool:
+        """文件名是否符合包含规则"""
+        if not self.include:
+            return True
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.include)
+
+    def _is_excluded(self, name: str, rel_path: str) -> bool:
+        """文件或目录是否被排除"""
+        if not self.exclude:
+            return False
+        rel_path = rel_path.replace(os.sep, '/')
+        return any(fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(rel_path, pattern)
+                   for pattern in self.exclude)
+
+    def _scan_directory(self, root: str, directory: str) -> Tuple[List[Tuple[str, tuple]], List[Tuple[str, tuple]], int]:
+        """
+        扫描单个目录
+
+        Returns:
+            (候选文件列表, 子目录列表, 被嗅探拒绝的文件数)，列表元素为 (路径, 文件标识)
+        """
+        files = []
+        subdirs = []
+        rejected = 0
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        name = entry.name.lower()
+                        # 相对路径只用于排除规则
+                        rel_path = os.path.relpath(entry.path, root).lower() if self.exclude else ''
+
+                        if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                            if not self._is_excluded(name, rel_path):
+                                subdirs.append((entry.path, self._identity(entry)))
+                        elif entry.is_file(follow_symlinks=self.follow_symlinks):
+                            if not self._is_included(name) or self._is_excluded(name, rel_path):
+                                continue
+                            if self.sniff and not sniff_aida64_report(entry.path):
+                                rejected += 1
+                                continue
+                            files.append((entry.path, self._identity(entry)))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        return files, subdirs, rejected
+
+    def _identity(self, entry: os.DirEntry) -> Optional[tuple]:
+        """获取 (设备号, inode) 标识，不可用时返回None"""
+        try:
+            stat = entry.stat(follow_symlinks=self.follow_symlinks)
+            if not stat.st_ino:
+                # Windows 上 DirEntry.stat() 的 st_ino、st_dev 总为0，需要完整的 os.stat()
+                stat = os.stat(entry.path, follow_symlinks=self.follow_symlinks)
+        except OSError:
+            return None
+        if not stat.st_ino:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def discover(self, paths: Iterable[str]) -> List[str]:
+        """
+        发现报告文件
+
+        Args:
+            paths: 文件或文件夹路径列表
+
+        Returns:
+            去重后的报告文件路径列表（按路径排序）
+        """
+        seen_paths = set()
+        seen_inodes = set()
+        seen_dirs = set()
+        results = []
+        stats = {'directories': 0, 'files': 0, 'rejected': 0, 'duplicates': 0}
+
+        def accept(path, identity):
+            key = os.path.normcase(os.path.abspath(path))
+            if key in seen_paths or (identity is not None and identity in seen_inodes):
+                stats['duplicates'] += 1
+                return
+            seen_paths.add(key)
+            if identity is not None:
+                seen_inodes.add(identity)
+            results.append(path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+
+            def submit(root, directory, identity):
+                if identity is not None:
+                    if identity in seen_dirs:
+                        return
+                    seen_dirs.add(identity)
+                pending[executor.submit(self._scan_directory, root, directory)] = root
+
+            for path in paths:
+                if os.path.isdir(path):
+                    try:
+                        stat = os.stat(path)
+                        identity = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+                    except OSError:
+                        identity = None
+                    submit(path, path, identity)
+                elif os.path.isfile(path):
+                    if self.sniff and not sniff_aida64_report(path):
+                        stats['rejected'] += 1
+                        continue
+                    try:
+                        stat = os.stat(path)
+                        identity = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+                    except OSError:
+                        identity = None
+                    accept(path, identity)
+
+            # 目录扫描完成后立即提交其子目录，实现并行遍历
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    root = pending.pop(future)
+                    files, subdirs, rejected = future.result()
+                    stats['directories'] += 1
+                    stats['rejected'] += rejected
+                    for file_path, identity in files:
+                        accept(file_path, identity)
+                    for subdir, identity in subdirs:
+                        submit(root, subdir, identity)
+
+        results.sort()
+        stats['files'] = len(results)
+        self.last_stats = stats
+        return results
+
+
+def discover_reports(paths: Iterable[str], include: Iterable[str] = ('*.txt',),
+                     exclude: Iterable[str] = (), sniff: bool = True) -> List[str]:
+    """
+    便捷函数：发现指定路径下的AIDA64报告
+    """
+    return ReportDiscovery(include=include, exclude=exclude, sniff=sniff).discover(paths)
+
+
+def sample_per_folder(file_paths: Iterable[str], per_folder: int = 3, limit: Optional[int] = None) -> List[str]:
+    """
+    按文件夹分层抽样：每个文件夹取前 per_folder 个文件
+
+    各文件夹轮流取，先取每个文件夹的第1个、再取第2个……，
+    因此达到 limit 时仍尽量覆盖所有文件夹。
+
+    Args:
+        file_paths: 文件路径列表（保持原顺序）
+        per_folder: 每个文件夹最多抽取的文件数
+        limit: 抽样总数上限
+
+    Returns:
+        抽样的文件路径列表（按原顺序）
+    """
+    # 需要遍历两次，生成器先转为列表
+    file_paths = list(file_paths)
+    folders = {}
+    for path in file_paths:
+        folder = folders.setdefault(os.path.dirname(path), [])
+        if len(folder) < per_folder:
+            folder.append(path)
+
+    picked = set()
+    for rank in range(per_folder):
+        for folder in folders.values():
+            if limit is not None and len(picked) >= limit:
+                break
+            if rank < len(folder):
+                picked.add(folder[rank])
+
+    return [path for path in file_paths if path in picked]
@@ -4,13 +4,28 @@ GUI界面模块
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import os
 import threading
+import time
 from datetime import datetime
 
 from parser_core import AIDA64Parser
 from templates import TemplateManager
+from file_discovery import ReportDiscovery, sample_per_folder
+from exporters import ExportPipeline
+from item_selector import compile_items
+from batch_runner import BatchRunner
+from checkpoint import CheckpointJournal
+from gui_widgets import ThrottledLog, VirtualListbox
+from identity_index import IdentityIndex
+
+# 进程隔离时单个工作进程的默认内存上限（MB，0 表示不限制）
+WORKER_MEMORY_LIMIT_MB = 2048
+
+# 抽样预览：每个文件夹抽取的文件数与抽样总数上限
+SAMPLE_PER_FOLDER = 3
+SAMPLE_LIMIT = 30
 
 
 class AIDA64ParserApp:
@@ -20,7 +35,14 @@ class AIDA64ParserApp:
         self.parser = AIDA64Parser()
         self.template_manager = TemplateManager()
         self.selected_files = []
+        self._selected_set = set()
         self.parsed_data = {}
+        self.identity_index = IdentityIndex()
+        # 筛选用的列式视图，解析结果变化后重建
+        self.report_table = None
+        # 抽样预览窗口，完整结果出来后替换
+        self.sample_window = None
+        self.parsing = False
         
         # 创建主窗口
         self.root = tk.Tk()
@@ -86,6 +108,7 @@ class AIDA64ParserApp:
                   style='Accent.TButton').pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="导出Excel", command=self.export_excel).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="导出所有格式", command=self.export_all).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="筛选报告", command=self.filter_reports).pack(side=tk.LEFT, padx=2)
         
         # 文件列表和配置区域
         left_frame = ttk.LabelFrame(main_frame, text="文件列表", padding="5")
@@ -104,18 +127,24 @@ class AIDA64ParserApp:
         file_list_frame = ttk.Frame(left_frame)
         file_list_frame.grid(row=0, column=0, sticky=(tk.W, tk.E))
         
-        ttk.Label(file_list_frame, text=f"已选择 {len(self.selected_files)} 个文件").pack(side=tk.LEFT)
+        self.file_count_var = tk.StringVar(value=f"已选择 {len(self.selected_files)} 个文件")
+        ttk.Label(file_list_frame, textvariable=self.file_count_var).pack(side=tk.LEFT)
+        
+        # 选择文件夹时的文件名规则（glob，多个以空格或分号分隔）
+        self.exclude_var = tk.StringVar(value='')
+        ttk.Entry(file_list_frame, textvariable=self.exclude_var, width=14).pack(side=tk.RIGHT)
+        ttk.Label(file_list_frame, text="排除:").pack(side=tk.RIGHT, padx=(5, 0))
+        self.include_var = tk.StringVar(value='*.txt')
+        ttk.Entry(file_list_frame, textvariable=self.include_var, width=10).pack(side=tk.RIGHT)
+        ttk.Label(file_list_frame, text="包含:").pack(side=tk.RIGHT, padx=(5, 0))
         
-        # 文件列表框
-        self.file_listbox = tk.Listbox(left_frame, selectmode=tk.EXTENDED, 
-                                      bg='white', relief=tk.SUNKEN, borderwidth=1)
-        self.file_listbox.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0))
+        # 文件列表框（虚拟化，只显示可见行）
+        self.file_list = VirtualListbox(left_frame, selectmode=tk.EXTENDED, 
+                                        bg='white', relief=tk.SUNKEN, borderwidth=1)
+        self.file_list.listbox.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(5, 0))
         
         # 文件列表框滚动条
-        file_scrollbar = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, 
-                                      command=self.file_listbox.yview)
-        file_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S), pady=(5, 0))
-        self.file_listbox.config(yscrollcommand=file_scrollbar.set)
+        self.file_list.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S), pady=(5, 0))
         
         # 模板选择
         template_frame = ttk.Frame(right_frame)
@@ -137,6 +166,23 @@ class AIDA64ParserApp:
         ttk.Checkbutton(options_frame, text="包含已安装程序", 
                        variable=self.include_software_var).pack(side=tk.LEFT, padx=5)
         
+        self.stats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="性能统计", 
+                       variable=self.stats_var).pack(side=tk.LEFT, padx=5)
+        
+        self.isolate_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="进程隔离", 
+                       variable=self.isolate_var).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(options_frame, text="内存上限(MB):").pack(side=tk.LEFT, padx=(5, 0))
+        self.memory_limit_var = tk.StringVar(value=str(WORKER_MEMORY_LIMIT_MB))
+        ttk.Spinbox(options_frame, from_=0, to=65536, increment=256, width=6,
+                    textvariable=self.memory_limit_var).pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.sample_preview_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="抽样预览", 
+                       variable=self.sample_preview_var).pack(side=tk.LEFT, padx=5)
+        
         self.custom_items_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(options_frame, text="自定义提取项目", 
                        variable=self.custom_items_var,
@@ -146,7 +192,8 @@ class AIDA64ParserApp:
         self.custom_items_frame = ttk.Frame(right_frame)
         self.custom_items_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
-        ttk.Label(self.custom_items_frame, text="输入项目（每行一个）:").pack(anchor=tk.W)
+        ttk.Label(self.custom_items_frame, 
+                 text="输入项目（每行一个，支持 * 通配符、re:名称=正则、glob:通配符）:").pack(anchor=tk.W)
         
         self.custom_items_text = scrolledtext.ScrolledText(self.custom_items_frame, 
                                                           height=8, width=40)
@@ -182,6 +229,14 @@ class AIDA64ParserApp:
         output_entry = ttk.Entry(output_frame, textvariable=self.output_name_var, width=30)
         output_entry.pack(side=tk.LEFT, padx=5)
         
+        # 导出所有格式时增量更新同名的CSV/NDJSON（追加新报告、替换同名报告）
+        self.upsert_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(output_frame, text="增量更新", variable=self.upsert_var).pack(side=tk.LEFT, padx=5)
+        
+        # 导出所有格式时附加类型化的 字节、赫兹、日期 列
+        self.normalize_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(output_frame, text="类型列", variable=self.normalize_var).pack(side=tk.LEFT, padx=5)
+        
         # 日志区域
         log_frame = ttk.LabelFrame(main_frame, text="操作日志", padding="5")
         log_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
@@ -191,6 +246,7 @@ class AIDA64ParserApp:
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=8, state='disabled')
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_output = ThrottledLog(self.root, self.log_text)
         
         # 状态栏
         self.status_var = tk.StringVar(value="就绪")
@@ -209,52 +265,94 @@ class AIDA64ParserApp:
         )
         
         if files:
-            self.selected_files.extend(files)
-            self.update_file_list()
-            self.log(f"已添加 {len(files)} 个文件")
+            added = self.add_files(files)
+            self.log(f"已添加 {len(added)} 个文件")
     
     def select_folder(self):
         """选择文件夹"""
         folder = filedialog.askdirectory(title="选择包含AIDA64报告的文件夹")
         
         if folder:
-            # 查找所有txt文件
-            txt_files = []
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith('.txt'):
-                        txt_files.append(os.path.join(root, file))
+            self.status_var.set("正在查找报告文件...")
             
-            if txt_files:
-                self.selected_files.extend(txt_files)
-                self.update_file_list()
-                self.log(f"从文件夹添加 {len(txt_files)} 个文件")
-            else:
-                messagebox.showwarning("警告", "选择的文件夹中没有找到.txt文件")
+            include = self.include_var.get().replace(';', ' ').split()
+            exclude = self.exclude_var.get().replace(';', ' ').split()
+            
+            # 在新线程中执行文件发现
+            threading.Thread(target=self._discover_in_thread, 
+                            args=(folder, include, exclude), daemon=True).start()
+    
+    def _discover_in_thread(self, folder, include, exclude):
+        """在新线程中查找文件夹内的AIDA64报告"""
+        discovery = ReportDiscovery(include=include, exclude=exclude)
+        try:
+            report_files = discovery.discover([folder])
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: self._on_discover_error(error_msg))
+            return
+        
+        self.root.after(0, lambda: self._on_discover_complete(report_files, discovery.last_stats))
+    
+    def _on_discover_complete(self, report_files, stats):
+        """文件发现完成"""
+        self.status_var.set("就绪")
+        
+        if report_files:
+            added = self.add_files(report_files)
+            self.log(f"从文件夹添加 {len(added)} 个文件")
+        else:
+            messagebox.showwarning("警告", "选择的文件夹中没有找到AIDA64报告文件")
+        
+        if stats.get('rejected'):
+            self.log(f"已跳过 {stats['rejected']} 个非AIDA64报告文件")
+        if stats.get('duplicates'):
+            self.log(f"已跳过 {stats['duplicates']} 个重复文件")
+    
+    def _on_discover_error(self, error_msg):
+        """文件发现出错"""
+        self.status_var.set("就绪")
+        self.log(f"查找文件出错: {error_msg}")
+        messagebox.showerror("错误", f"查找文件时出现错误:\n{error_msg}")
+    
+    def add_files(self, files):
+        """添加文件到列表（按路径去重），返回新增的文件"""
+        added = []
+        for file_path in files:
+            key = os.path.normcase(os.path.abspath(file_path))
+            if key in self._selected_set:
+                continue
+            self._selected_set.add(key)
+            added.append(file_path)
+        
+        if added:
+            self.selected_files.extend(added)
+            self.update_file_list(added)
+        
+        return added
     
     def clear_file_list(self):
         """清空文件列表"""
         self.selected_files = []
-        self.file_listbox.delete(0, tk.END)
+        self._selected_set = set()
+        self.file_list.clear()
+        self.file_count_var.set("已选择 0 个文件")
         self.log("已清空文件列表")
     
-    def update_file_list(self):
-        """更新文件列表显示"""
-        self.file_listbox.delete(0, tk.END)
-        
-        for file_path in self.selected_files:
-            filename = os.path.basename(file_path)
-            self.file_listbox.insert(tk.END, filename)
+    def update_file_list(self, new_files=None):
+        """
+        更新文件列表显示
+        
+        Args:
+            new_files: 新增的文件，为None时重建整个列表
+        """
+        if new_files is None:
+            self.file_list.set_items(os.path.basename(file_path) for file_path in self.selected_files)
+        else:
+            self.file_list.append(os.path.basename(file_path) for file_path in new_files)
         
         # 更新文件计数
-        for widget in self.root.winfo_children():
-            if isinstance(widget, ttk.LabelFrame):
-                for child in widget.winfo_children():
-                    if isinstance(child, ttk.Frame):
-                        for grandchild in child.winfo_children():
-                            if isinstance(grandchild, ttk.Label):
-                                if "已选择" in grandchild.cget("text"):
-                                    grandchild.config(text=f"已选择 {len(self.selected_files)} 个文件")
+        self.file_count_var.set(f"已选择 {len(self.selected_files)} 个文件")
     
     def toggle_custom_items(self):
         """切换自定义项目显示"""
@@ -270,11 +368,12 @@ class AIDA64ParserApp:
         if self.custom_items_var.get():
             # 使用自定义项目
             custom_text = self.custom_items_text.get('1.0', tk.END).strip()
+            # 're:名称=正则' 和 'glob:通配符' 行作为提取规则
             items = [line.strip() for line in custom_text.split('\n') if line.strip()]
-            return items
+            return compile_items(items)
         else:
-            # 使用模板项目
-            return self.template_manager.get_template_items(template_name)
+            # 使用模板项目（编译结果按模板缓存）
+            return self.template_manager.compile_template(template_name)
     
     def start_parsing(self):
         """开始解析"""
@@ -285,52 +384,202 @@ class AIDA64ParserApp:
         # 获取选中的项目
         selected_items = self.get_selected_items()
         
+        # 检查点日志：上次中断的同一任务可以继续，已完成的文件不再解析（在解析线程中读取）
+        journal = CheckpointJournal(os.path.join(self.template_manager.config_dir, 'checkpoint.ndjson'),
+                                    selected_items)
+        
         # 更新状态
         self.status_var.set("正在解析...")
+        self.parsing = True
         self.log(f"开始解析 {len(self.selected_files)} 个文件")
         self.log(f"使用模板: {self.template_var.get()}")
         
+        # 性能统计（--profile 启动时始终开启）
+        self.parser.enable_stats(self.stats_var.get() or bool(self.parser.profile_path),
+                                 self.parser.profile_path)
+        self.parser.stats.reset()
+        
+        # 进程隔离：单个文件超时或崩溃不影响整批（cProfile 需要在本进程中解析）
+        isolate = self.isolate_var.get() and not self.parser.profile_path
+        try:
+            memory_limit_mb = max(0, int(self.memory_limit_var.get()))
+        except ValueError:
+            memory_limit_mb = WORKER_MEMORY_LIMIT_MB
+            self.memory_limit_var.set(str(memory_limit_mb))
+        
+        # 抽样预览：先解析每个文件夹的前几个文件，尽早发现模板选错等问题
+        sample_done = None
+        if self.sample_preview_var.get():
+            sample = sample_per_folder(self.selected_files, SAMPLE_PER_FOLDER, SAMPLE_LIMIT)
+            if len(sample) < len(self.selected_files):
+                sample_done = threading.Event()
+                threading.Thread(target=self._preview_sample_in_thread,
+                                 args=(sample, selected_items, sample_done), daemon=True).start()
+        
         # 在新线程中执行解析
         threading.Thread(target=self._parse_in_thread, 
-                        args=(selected_items,), daemon=True).start()
+                        args=(selected_items, isolate, journal, sample_done, memory_limit_mb),
+                        daemon=True).start()
     
-    def _parse_in_thread(self, selected_items):
+    def _preview_sample_in_thread(self, sample, selected_items, done):
+        """在新线程中解析抽样文件（使用独立的解析器，不计入整批的统计）"""
+        try:
+            start = time.perf_counter()
+            parser = AIDA64Parser(self.parser.registry)
+            # 标签页用相对于共同文件夹的路径，不同文件夹中的同名报告各占一页
+            try:
+                root = os.path.commonpath([os.path.dirname(file_path) for file_path in sample])
+            except ValueError:
+                # 不同盘符
+                root = None
+            data = {}
+            for file_path in sample:
+                try:
+                    records = parser.parse_file(file_path, selected_items)
+                except Exception as e:
+                    records = [{'项目': '错误', '值': str(e)}]
+                data[os.path.relpath(file_path, root) if root else file_path] = records
+            elapsed = time.perf_counter() - start
+            self.root.after(0, lambda: self._on_sample_complete(data, len(data), elapsed))
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: self.log(f"抽样预览失败: {error_msg}"))
+        finally:
+            done.set()
+    
+    def _on_sample_complete(self, data, sample_count, elapsed):
+        """抽样解析完成"""
+        total_items = sum(len(records) for records in data.values())
+        self.log(f"抽样预览: {sample_count} 个文件，{total_items} 条数据，用时 {elapsed:.2f} 秒")
+        if not total_items:
+            self.log("抽样文件未提取到任何数据，请检查模板或提取项目")
+        # 整批已经结束时不再显示抽样结果
+        if self.parsing:
+            self._close_sample_window()
+            self.sample_window = self.show_preview(
+                data, f"抽样预览（{sample_count}/{len(self.selected_files)} 个文件，完整解析仍在进行）")
+    
+    def _open_journal(self, journal):
+        """打开检查点日志并询问是否继续上次的任务（读取日志、检查文件状态较慢，在解析线程中执行）"""
+        journal.open()
+        finished = len(self.selected_files) - len(journal.pending(self.selected_files))
+        if finished and not self._ask_yes_no(
+                "继续任务", f"发现上次未完成的解析任务（已完成 {finished}/{len(self.selected_files)} 个文件），是否继续？"):
+            journal.discard()
+            journal.open()
+        elif finished:
+            self.log(f"从检查点恢复 {finished} 个已完成的文件")
+    
+    def _ask_yes_no(self, title, message):
+        """从后台线程通过主线程弹出确认框，等待用户回答"""
+        answer = []
+        answered = threading.Event()
+        
+        def ask():
+            try:
+                answer.append(messagebox.askyesno(title, message))
+            finally:
+                answered.set()
+        
+        self.root.after(0, ask)
+        answered.wait()
+        return bool(answer and answer[0])
+    
+    def _parse_in_thread(self, selected_items, isolate=False, journal=None, sample_done=None,
+                         memory_limit_mb=WORKER_MEMORY_LIMIT_MB):
         """在新线程中执行解析"""
+        # 解析过程中同时建立硬件身份索引，核查重复/克隆机器
+        self.identity_index = IdentityIndex()
         try:
+            if journal is not None:
+                self._open_journal(journal)
+            
+            # 本进程内解析时让抽样预览先完成（进程隔离时由工作进程解析，不争用本进程）
+            if sample_done is not None and not isolate:
+                sample_done.wait()
+            
             # 解析文件
-            self.parsed_data = self.parser.parse_multiple_files(
-                self.selected_files, selected_items
-            )
+            if isolate:
+                runner = BatchRunner(selected_items, memory_limit_mb=memory_limit_mb or None,
+                                     stats=self.parser.stats, checkpoint=journal,
+                                     on_result=self.identity_index.add)
+                self.parsed_data = runner.run(self.selected_files)
+                for file_path, reason in runner.quarantine:
+                    self.log(f"已隔离: {file_path}（{reason}）")
+            else:
+                self.parsed_data = self.parser.parse_multiple_files(
+                    self.selected_files, selected_items, on_result=self.identity_index.add,
+                    checkpoint=journal
+                )
+            
+            # 整批完成，不再需要检查点
+            if journal is not None:
+                journal.discard()
             
             # 更新UI
             self.root.after(0, self._on_parsing_complete)
             
         except Exception as e:
-            self.root.after(0, lambda: self._on_parsing_error(str(e)))
+            if journal is not None:
+                journal.close()
+            error_msg = str(e)
+            self.root.after(0, lambda: self._on_parsing_error(error_msg))
     
     def _on_parsing_complete(self):
         """解析完成"""
+        self.parsing = False
+        self.report_table = None
         total_items = sum(len(data) for data in self.parsed_data.values())
         self.status_var.set(f"解析完成，共提取 {total_items} 条数据")
         self.log(f"解析完成，共 {len(self.parsed_data)} 个文件，{total_items} 条数据")
         
-        # 显示预览
+        if self.parser.stats.enabled:
+            for line in self.parser.stats.summary():
+                self.log(line)
+        if self.parser.profile_path:
+            self.log(f"cProfile结果已写入: {self.parser.profile_path}")
+        
+        # 身份核查只在发现问题时输出
+        if self.identity_index.findings():
+            for line in self.identity_index.summary():
+                self.log(line)
+        
+        # 显示预览（替换抽样预览）
+        self._close_sample_window()
         self.show_preview()
     
+    def _close_sample_window(self):
+        """关闭抽样预览窗口"""
+        if self.sample_window is not None and self.sample_window.winfo_exists():
+            self.sample_window.destroy()
+        self.sample_window = None
+    
     def _on_parsing_error(self, error_msg):
         """解析出错"""
+        self.parsing = False
         self.status_var.set("解析出错")
         self.log(f"解析错误: {error_msg}")
         messagebox.showerror("错误", f"解析过程中出现错误:\n{error_msg}")
     
-    def show_preview(self):
-        """显示预览"""
-        if not self.parsed_data:
-            return
+    def show_preview(self, data=None, title="解析结果预览"):
+        """
+        显示预览
+        
+        Args:
+            data: 要预览的解析结果，默认为全部解析结果
+            title: 窗口标题
+        
+        Returns:
+            预览窗口
+        """
+        if data is None:
+            data = self.parsed_data
+        if not data:
+            return None
         
         # 创建预览窗口
         preview_window = tk.Toplevel(self.root)
-        preview_window.title("解析结果预览")
+        preview_window.title(title)
         preview_window.geometry("800x600")
         
         # 创建笔记本控件
@@ -338,7 +587,7 @@ class AIDA64ParserApp:
         notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # 为每个文件添加标签页
-        for filename, data in self.parsed_data.items():
+        for filename, records in data.items():
             frame = ttk.Frame(notebook)
             notebook.add(frame, text=filename)
             
@@ -363,8 +612,42 @@ class AIDA64ParserApp:
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             
             # 添加数据
-            for item in data:
+            for item in records:
                 tree.insert('', tk.END, values=(item['项目'], item['值']))
+        
+        return preview_window
+    
+    def filter_reports(self):
+        """按表达式筛选解析结果"""
+        if not self.parsed_data:
+            messagebox.showwarning("警告", "请先解析文件")
+            return
+        
+        expression = simpledialog.askstring(
+            "筛选报告", '筛选表达式，如: 系统内存 >= 16GB and 操作系统 contains "Windows 10"', parent=self.root)
+        if not expression:
+            return
+        
+        # pandas 仅在筛选时加载
+        from report_filter import FilterError, ReportTable, compile_filter
+        try:
+            report_filter = compile_filter(expression)
+        except FilterError as e:
+            messagebox.showerror("错误", f"筛选表达式有误:\n{e}")
+            return
+        
+        if self.report_table is None:
+            self.report_table = ReportTable(self.parsed_data)
+        matched = report_filter.select(self.report_table)
+        self.log(f"筛选 [{expression}]: {len(matched)}/{len(self.parsed_data)} 个报告满足条件")
+        
+        if not matched or len(matched) == len(self.parsed_data):
+            return
+        if messagebox.askyesno("筛选报告", f"{len(matched)} 个报告满足条件，是否只保留这些报告用于预览和导出？"):
+            self.parsed_data = {name: self.parsed_data[name] for name in matched}
+            self.report_table = None
+            self.status_var.set(f"已筛选，保留 {len(matched)} 个报告")
+            self.show_preview()
     
     def export_excel(self):
         """导出为Excel"""
@@ -413,34 +696,50 @@ class AIDA64ParserApp:
         if not folder:
             return
         
+        base_name = self.output_name_var.get()
+        self.status_var.set("正在导出所有格式...")
+        self.log(f"导出所有格式到: {folder}")
+        
+        pipeline = ExportPipeline(self.parser, self.parsed_data, folder, base_name,
+                                  progress_callback=self._on_export_progress,
+                                  upsert=self.upsert_var.get(),
+                                  normalize=self.normalize_var.get())
+        
+        # 在新线程中执行导出
+        threading.Thread(target=self._export_all_thread, 
+                        args=(pipeline, folder), daemon=True).start()
+    
+    def _export_all_thread(self, pipeline, folder):
+        """在新线程中导出所有格式"""
         try:
-            base_name = self.output_name_var.get()
-            
-            # 导出Excel
-            excel_path = os.path.join(folder, f"{base_name}.xlsx")
-            self.parser.export_to_excel(self.parsed_data, excel_path)
-            
-            # 导出CSV（为每个文件单独导出）
-            for filename, data in self.parsed_data.items():
-                import pandas as pd
-                csv_filename = f"{base_name}_{os.path.splitext(filename)[0]}.csv"
-                csv_path = os.path.join(folder, csv_filename)
-                
-                df = pd.DataFrame(data)
-                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-            
-            # 导出JSON
-            json_path = os.path.join(folder, f"{base_name}.json")
-            import json
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.parsed_data, f, ensure_ascii=False, indent=2)
-            
-            self.log(f"已导出所有格式到: {folder}")
-            messagebox.showinfo("成功", f"已成功导出所有格式到:\n{folder}")
-            
+            pipeline.run()
         except Exception as e:
-            messagebox.showerror("错误", f"导出失败:\n{str(e)}")
-            self.log(f"导出失败: {str(e)}")
+            error_msg = str(e)
+            self.root.after(0, lambda: self._on_export_error(error_msg))
+            return
+        
+        self.root.after(0, lambda: self._on_export_all_complete(pipeline, folder))
+    
+    def _on_export_progress(self, format_name, message, done, total):
+        """导出进度（在导出线程中调用）"""
+        self.root.after(0, lambda: self._show_export_progress(format_name, message, done, total))
+    
+    def _show_export_progress(self, format_name, message, done, total):
+        """显示导出进度"""
+        self.status_var.set(f"正在导出... ({done}/{total})")
+        self.log(f"[{format_name}] {message}")
+    
+    def _on_export_all_complete(self, pipeline, folder):
+        """所有格式导出完成"""
+        if pipeline.errors:
+            self.status_var.set("导出出错")
+            errors = '\n'.join(f"{fmt}: {error}" for fmt, error in pipeline.errors.items())
+            messagebox.showerror("错误", f"部分格式导出失败:\n{errors}")
+            return
+        
+        self.status_var.set("所有格式导出完成")
+        self.log(f"已导出所有格式到: {folder}")
+        messagebox.showinfo("成功", f"已成功导出所有格式到:\n{folder}")
     
     def _on_export_complete(self, file_path, format_name):
         """导出完成"""
@@ -458,14 +757,9 @@ class AIDA64ParserApp:
         messagebox.showerror("错误", f"导出过程中出现错误:\n{error_msg}")
     
     def log(self, message):
-        """添加日志"""
+        """添加日志（可在后台线程中调用，定时合并刷新到界面）"""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
-        
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, log_message)
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+        self.log_output.write(f"[{timestamp}] {message}\n")
     
     def run(self):
         """运行应用程序"""
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+硬件身份索引模块
+
+批量解析时按标识符（DMI 系统序列号、系统 UUID、主板序列号、内存条序列号）建立
+标识符 -> 报告 的哈希索引，一次线性遍历即可发现:
+    重复报告    - 同一台机器（全部标识相同）的多份报告
+    克隆UUID    - 不同机器（主板/系统序列号不同）使用同一个 UUID，常见于未重新封装的系统镜像
+    内存条迁移  - 同一内存条序列号出现在不同机器中
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# 标识符类型 -> 项目键正则（兼容 "DMI: DMI 系统序列号" 这类带小节前缀的键）
+IDENTIFIER_KEYS = {
+    '系统序列号': re.compile(r'^(?:DMI: )?DMI 系统序列号$'),
+    '系统UUID': re.compile(r'^(?:DMI: )?DMI 系统 UUID$'),
+    '主板序列号': re.compile(r'^(?:DMI: )?DMI 主板序列号$'),
+    '内存条序列号': re.compile(r'^DIMM\d+: 序列号$'),
+}
+
+# 厂商未填写时的占位值，不能用于识别机器
+PLACEHOLDER_VALUES = {
+    '', 'NONE', 'N/A', 'NA', '0', 'DEFAULT STRING', 'TO BE FILLED BY O.E.M.', 'SYSTEM SERIAL NUMBER',
+    'BASE BOARD SERIAL NUMBER', 'NOT SPECIFIED', 'NOT APPLICABLE', '123456789', 'UNKNOWN',
+}
+
+# 全0或全F的 UUID/序列号（如 00000000-0000-0000-0000-000000000000、FFFFFFFFh）
+_BLANK_ID_RE = re.compile(r'^(?:[0\-]+|[F\-]+)H?$')
+
+
+def normalize_identifier(value: str) -> Optional[str]:
+    """规范化标识符（大写、去空白），占位值返回None"""
+    value = value.strip().upper()
+    if value in PLACEHOLDER_VALUES or _BLANK_ID_RE.match(value):
+        return None
+    return value
+
+
+class IdentityIndex:
+    """
+    硬件身份索引
+
+    示例:
+        index = IdentityIndex()
+        parser.parse_multiple_files(files, items, on_result=index.add)
+        for finding in index.findings():
+            ...
+    """
+
+    def __init__(self):
+        # (标识符类型, 标识符) -> 报告名称列表
+        self.reports_by_id: Dict[Tuple[str, str], List[str]] = {}
+        # 报告名称 -> 机器身份（主板序列号、系统序列号、UUID、内存条序列号集合）
+        self.machines: Dict[str, Tuple[Optional[str], Optional[str], Optional[str], frozenset]] = {}
+
+    def add(self, report: str, records: List[Dict]):
+        """
+        加入一个报告的解析结果（单次遍历其记录）
+
+        报告按名称区分，与 parse_multiple_files 的结果字典一致：同名报告再次加入时替换之前的记录，
+        不会被当作自身的重复或克隆。
+        """
+        if report in self.machines:
+            self._remove(report)
+
+        found: Dict[str, Optional[str]] = {'系统序列号': None, '系统UUID': None, '主板序列号': None}
+        dimms: Set[str] = set()
+
+        for record in records:
+            key = record.get('项目', '')
+            if 'DMI' not in key and '序列号' not in key:
+                continue
+            for kind, pattern in IDENTIFIER_KEYS.items():
+                if not pattern.match(key):
+                    continue
+                identifier = normalize_identifier(str(record.get('值', '')))
+                if identifier is None:
+                    break
+                if kind == '内存条序列号':
+                    dimms.add(identifier)
+                elif found[kind] is None:
+                    found[kind] = identifier
+                break
+
+        for kind, identifier in found.items():
+            if identifier is not None:
+                self.reports_by_id.setdefault((kind, identifier), []).append(report)
+        for identifier in dimms:
+            self.reports_by_id.setdefault(('内存条序列号', identifier), []).append(report)
+
+        self.machines[report] = (found['主板序列号'], found['系统序列号'], found['系统UUID'], frozenset(dimms))
+
+    def _remove(self, report: str):
+        """移除一个报告的全部索引项"""
+        board, system, uuid, dimms = self.machines.pop(report)
+        keys = [('主板序列号', board), ('系统序列号', system), ('系统UUID', uuid)]
+        keys += [('内存条序列号', identifier) for identifier in dimms]
+        for key in keys:
+            reports = self.reports_by_id.get(key)
+            if reports is None or report not in reports:
+                continue
+            reports.remove(report)
+            if not reports:
+                del self.reports_by_id[key]
+
+    def machine_key(self, report: str) -> Optional[Tuple[str, str]]:
+        """报告所属机器的身份：依次取主板序列号、系统序列号、系统 UUID；都没有时返回None"""
+        board, system, uuid, _ = self.machines[report]
+        if board is not None:
+            return '主板序列号', board
+        if system is not None:
+            return '系统序列号', system
+        if uuid is not None:
+            return '系统UUID', uuid
+        return None
+
+    def duplicate_reports(self) -> List[List[str]]:
+        """全部标识相同的报告组"""
+        groups: Dict[Tuple, List[str]] = {}
+        for report, identity in self.machines.items():
+            # 没有任何标识的报告无法判断是否重复
+            if identity[:3] == (None, None, None) and not identity[3]:
+                continue
+            groups.setdefault(identity, []).append(report)
+        return [reports for reports in groups.values() if len(reports) > 1]
+
+    def findings(self) -> List[Dict]:
+        """
+        核查结果
+
+        Returns:
+            列表，元素为 {'类型': ..., '标识': ..., '报告': [...], '说明': ...}
+        """
+        results = []
+
+        for reports in self.duplicate_reports():
+            machine = self.machine_key(reports[0])
+            results.append({'类型': '重复报告', '标识': machine[1] if machine else None,
+                            '报告': reports, '说明': f"{len(reports)} 份报告的全部硬件标识相同"})
+
+        for (kind, identifier), reports in self.reports_by_id.items():
+            if len(reports) < 2 or kind not in ('系统UUID', '内存条序列号'):
+                continue
+            # 按机器分组；同一机器的重复报告不算克隆或迁移
+            machines = {}
+            for report in reports:
+                machines.setdefault(self.machine_key(report) or ('报告', report), []).append(report)
+            if len(machines) < 2:
+                continue
+
+            if kind == '系统UUID':
+                results.append({'类型': '克隆UUID', '标识': identifier, '报告': reports,
+                                '说明': f"{len(machines)} 台不同机器使用同一个系统 UUID"})
+            else:
+                results.append({'类型': '内存条迁移', '标识': identifier, '报告': reports,
+                                '说明': f"内存条出现在 {len(machines)} 台机器中"})
+
+        return results
+
+    def summary(self) -> List[str]:
+        """生成可读的核查摘要（每行一条）"""
+        findings = self.findings()
+        lines = [f"身份核查: {len(self.machines)} 份报告，发现 {len(findings)} 个问题"]
+        for finding in findings:
+            lines.append(f"  [{finding['类型']}] {finding['标识']}: {', '.join(finding['报告'])}")
+        return lines
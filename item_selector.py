@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+项目选择器模块
+
+将模板或自定义的项目列表编译为不可变的选择器：
+    - 确切项目键放入哈希集合，O(1) 查找
+    - 带通配符的项目（如 'DIMM*: 模块容量'、'DMI *'）按通配符前的字面前缀放入前缀树，
+      只有走到对应节点的键才需要匹配剩余部分
+    - 整节提取（模板中 all_items 的节）单独记录
+    - 正则/通配符提取规则合并编译为规则集（见 extraction_rules）
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from extraction_rules import ExtractionRule, compile_rules
+
+
+# 前缀树节点中存放终止规则的键
+_TERMINAL = '\0'
+
+# 通配符
+_WILDCARDS = ('*', '?')
+
+
+def _wildcard_to_regex(pattern: str):
+    """将通配符（* 和 ?）转换为正则，其余字符按字面匹配"""
+    parts = []
+    for char in pattern:
+        if char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+def has_wildcard(item: str) -> bool:
+    """项目是否包含通配符"""
+    return any(wildcard in item for wildcard in _WILDCARDS)
+
+
+class ItemSelector:
+    """编译后的项目选择器（不可变）"""
+
+    __slots__ = ('items', 'exact', 'whole_sections', 'rules', '_trie', '_has_patterns', '_wildcards',
+                 '_resolved')
+
+    def __init__(self, items: Iterable[str], whole_sections: Iterable[str] = (), rules: Iterable = ()):
+        """
+        Args:
+            items: 项目列表，可包含通配符 * 和 ?
+            whole_sections: 需要完整提取的报告节名称
+            rules: 正则/通配符提取规则（ExtractionRule 或模板中的规则字典）
+        """
+        items = tuple(dict.fromkeys(items))
+        exact = set()
+        trie: Dict = {}
+        wildcards = {}
+
+        for item in items:
+            positions = [item.find(wildcard) for wildcard in _WILDCARDS if wildcard in item]
+            if not positions:
+                exact.add(item)
+                continue
+
+            cut = min(positions)
+            prefix, rest = item[:cut], item[cut:]
+            wildcards[item] = (prefix, _wildcard_to_regex(item))
+
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+
+            # 剩余部分仅为 '*' 时，前缀匹配即命中
+            rule = None if rest == '*' else _wildcard_to_regex(rest)
+            node.setdefault(_TERMINAL, []).append(rule)
+
+        object.__setattr__(self, 'items', items)
+        object.__setattr__(self, 'exact', frozenset(exact))
+        object.__setattr__(self, 'whole_sections', frozenset(whole_sections))
+        object.__setattr__(self, 'rules', compile_rules(rules))
+        object.__setattr__(self, '_trie', trie)
+        object.__setattr__(self, '_has_patterns', bool(trie))
+        object.__setattr__(self, '_wildcards', wildcards)
+        object.__setattr__(self, '_resolved', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ItemSelector 是不可变对象")
+
+    def __reduce__(self):
+        # 不可变对象无法按默认方式逐属性恢复，传给工作进程时按原始参数重新编译
+        return self.__class__, (self.items, tuple(self.whole_sections), tuple(self.rules.rules))
+
+    def __contains__(self, key: str) -> bool:
+        """项目键是否被选中"""
+        if key in self.exact:
+            return True
+        if not self._has_patterns:
+            return False
+
+        node = self._trie
+        for position in range(len(key) + 1):
+            rules = node.get(_TERMINAL)
+            if rules:
+                rest = key[position:]
+                for rule in rules:
+                    if rule is None or rule.fullmatch(rest):
+                        return True
+            if position == len(key):
+                break
+            node = node.get(key[position])
+            if node is None:
+                break
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items) + len(self.whole_sections) + len(self.rules)
+
+    def __repr__(self):
+        return (f"ItemSelector({len(self.items)} items, whole_sections={sorted(self.whole_sections)}, "
+                f"{len(self.rules)} rules)")
+
+    def resolve(self, registry) -> Tuple[List, Dict[str, Tuple[str, ...]]]:
+        """
+        解析所需的节解析器（按注册表版本缓存）
+
+        Returns:
+            (解析器声明列表, 节名称 -> 该节需要的项目)
+        """
+        cached = self._resolved.get(id(registry))
+        if cached is not None and cached[0] == registry.version:
+            return cached[1], cached[2]
+
+        parsers = []
+        section_items: Dict[str, List[str]] = {}
+        for spec in registry.parsers():
+            if spec.section in self.whole_sections:
+                parsers.append(spec)
+                continue
+            needed = [item for item in self.items if self._is_needed(spec, item)]
+            if needed:
+                parsers.append(spec)
+                section_items.setdefault(spec.section, [])
+                section_items[spec.section].extend(item for item in needed
+                                                   if item not in section_items[spec.section])
+
+        section_items = {section: tuple(items) for section, items in section_items.items()}
+        self._resolved[id(registry)] = (registry.version, parsers, section_items)
+        return parsers, section_items
+
+    def _is_needed(self, spec, item: str) -> bool:
+        """判断单个项目是否需要某个解析器；通配符项目按其字面前缀保守判断"""
+        if item not in self._wildcards:
+            return spec.is_needed((item,))
+
+        literal, regex = self._wildcards[item]
+        if any(regex.fullmatch(key) for key in spec.produces):
+            return True
+        if any(prefix.startswith(literal) or literal.startswith(prefix) for prefix in spec.prefixes):
+            return True
+        return spec.pattern is not None and (not literal or bool(spec.pattern.match(literal)))
+
+    def section_items(self, registry) -> Dict[str, Tuple[str, ...]]:
+        """节名称 -> 该节需要的项目"""
+        return self.resolve(registry)[1]
+
+
+def compile_items(items: Optional[Iterable[str]]) -> Optional[ItemSelector]:
+    """
+    将项目列表编译为选择器；None（全部项目）和已编译的选择器原样返回
+    
+    以 're:' 或 'glob:' 开头的行作为提取规则，其余作为项目。
+    """
+    if items is None or isinstance(items, ItemSelector):
+        return items
+
+    plain_items = []
+    rules = []
+    for item in items:
+        rule = ExtractionRule.from_line(item)
+        if rule is None:
+            plain_items.append(item)
+        else:
+            rules.append(rule)
+    return ItemSelector(plain_items, rules=rules)
@@ -6,14 +6,83 @@ AIDA64报告智能解析工具 - 主程序入口
 版本: 1.0.0
 """
 
+import time
+
+# 尽早记录启动时间，用于启动耗时报告
+_START_TIME = time.perf_counter()
+
 import sys
 import os
-from gui import AIDA64ParserApp
+
+# 启动时不应加载的重型模块（仅在导出/编码检测时按需导入）
+HEAVY_MODULES = ['pandas', 'openpyxl', 'chardet', 'numpy']
+
+
+def _startup_report(timings):
+    """生成启动耗时报告"""
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    lines = [
+        f"启动耗时 {timings['total'] * 1000:.0f} ms"
+        f"（模块导入 {timings['import'] * 1000:.0f} ms，"
+        f"界面创建 {timings['window'] * 1000:.0f} ms，"
+        f"首次显示 {timings['shown'] * 1000:.0f} ms）",
+        f"启动时已加载的重型模块: {', '.join(loaded) if loaded else '无'}"
+    ]
+    return lines
+
 
 def main():
     """主函数"""
+    print_timing = '--startup-timing' in sys.argv
+    
+    # --serve [端口]: 以本地HTTP解析服务方式运行，不创建界面
+    if '--serve' in sys.argv:
+        index = sys.argv.index('--serve')
+        port = 8765
+        if index + 1 < len(sys.argv) and not sys.argv[index + 1].startswith('-'):
+            try:
+                port = int(sys.argv[index + 1])
+            except ValueError:
+                print(f"用法: {os.path.basename(sys.argv[0])} --serve [端口]\n错误: 端口必须是整数: {sys.argv[index + 1]}",
+                      file=sys.stderr)
+                sys.exit(2)
+        from parse_service import serve
+        serve(port)
+        return
+    
+    import_start = time.perf_counter()
+    from gui import AIDA64ParserApp
+    import_end = time.perf_counter()
+    
     app = AIDA64ParserApp()
+    window_end = time.perf_counter()
+    
+    # --profile <路径>: 解析时运行cProfile并写入结果文件
+    if '--profile' in sys.argv:
+        index = sys.argv.index('--profile')
+        profile_path = sys.argv[index + 1] if index + 1 < len(sys.argv) else 'aida64_parse.prof'
+        app.parser.enable_stats(True, profile_path)
+    
+    def on_first_idle():
+        shown = time.perf_counter()
+        timings = {
+            'import': import_end - import_start,
+            'window': window_end - import_end,
+            'shown': shown - window_end,
+            'total': shown - _START_TIME,
+        }
+        for line in _startup_report(timings):
+            app.log(line)
+            if print_timing:
+                print(line)
+        if print_timing:
+            app.root.destroy()
+    
+    app.root.after_idle(on_first_idle)
     app.run()
 
 if __name__ == "__main__":
+    # 打包后的程序中，进程隔离解析的工作进程从这里启动
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+数值规范化模块
+
+对整批解析结果做向量化处理，在原始 '值' 旁边附加类型化的列：
+    字节  - 容量（"16 GB (2 ranks, 16 banks)"、"476.3 GB"）
+    赫兹  - 频率（"DDR4-2666 (1333 MHz)"、"3200 MHz"）
+    日期  - ISO日期（"第 23 周 / 2019"、"2023/5/1"）
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+
+# 容量单位倍数（AIDA64使用二进制单位）
+BYTE_UNITS = {
+    'B': 1,
+    'KB': 1024,
+    'MB': 1024 ** 2,
+    'GB': 1024 ** 3,
+    'TB': 1024 ** 4,
+    'PB': 1024 ** 5,
+}
+
+# 频率单位倍数
+HERTZ_UNITS = {
+    'HZ': 1,
+    'KHZ': 10 ** 3,
+    'MHZ': 10 ** 6,
+    'GHZ': 10 ** 9,
+}
+
+CAPACITY_PATTERN = r'(?<![\w.])(\d+(?:\.\d+)?)\s*([KMGTP]?B)\b(?!/)'
+FREQUENCY_PATTERN = r'(?<![\w.])(\d+(?:\.\d+)?)\s*([KMG]?Hz)\b'
+
+# 周/年形式的制造日期，如 "第 23 周 / 2019"、"Week 23 / 2019"、"2019年第23周"
+WEEK_YEAR_PATTERN = r'(?:第\s*(?P<w1>\d{1,2})\s*周|[Ww]eek\s*(?P<w2>\d{1,2}))\s*/\s*(?P<y1>\d{4})'
+YEAR_WEEK_PATTERN = r'(?P<y2>\d{4})\s*年\s*第\s*(?P<w3>\d{1,2})\s*周'
+
+# 需要做日期解析的项目关键字
+DATE_KEY_PATTERN = r'日期|Date'
+
+# 规范化附加的类型化列
+TYPED_COLUMNS = ('字节', '赫兹', '日期')
+
+
+def batch_to_frame(data: Dict[str, List[Dict]]):
+    """
+    将 parse_multiple_files 的结果转换为长表
+
+    Returns:
+        DataFrame，列为 文件名、项目、值（及解析器附带的其他列）
+    """
+    frames = []
+    for filename, records in data.items():
+        if not records:
+            continue
+        frame = pd.DataFrame.from_records(records)
+        frame.insert(0, '文件名', filename)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['文件名', '项目', '值'])
+
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def scale_values(values, pattern: str, units: Dict[str, int]):
+    """提取 数值+单位 并换算为基准单位"""
+    extracted = values.str.extract(pattern)
+    number = pd.to_numeric(extracted[0], errors='coerce')
+    scale = extracted[1].str.upper().map(units)
+    return (number * scale.astype('float64')).astype('float64')
+
+
+def _iso_dates(keys, values):
+    """解析日期类项目为ISO日期字符串"""
+    result = pd.Series(pd.NA, index=values.index, dtype='object')
+
+    is_date = keys.str.contains(DATE_KEY_PATTERN, regex=True, na=False)
+    if not is_date.any():
+        return result
+
+    date_values = values[is_date]
+
+    # 周/年形式，换算为该ISO周的周一
+    week_year = date_values.str.extract(WEEK_YEAR_PATTERN)
+    year_week = date_values.str.extract(YEAR_WEEK_PATTERN)
+    week = week_year['w1'].fillna(week_year['w2']).fillna(year_week['w3'])
+    year = week_year['y1'].fillna(year_week['y2'])
+    has_week = week.notna() & year.notna()
+
+    if has_week.any():
+        iso_week = year[has_week] + '-W' + week[has_week].str.zfill(2) + '-1'
+        parsed = pd.to_datetime(iso_week, format='%G-W%V-%u', errors='coerce')
+        result.loc[parsed.index] = parsed.dt.strftime('%Y-%m-%d')
+
+    # 其余按普通日期解析，如 "2023/5/1"、"2023-05-01"
+    plain = date_values[~has_week].str.extract(r'(\d{4}[/-]\d{1,2}[/-]\d{1,2})')[0].dropna()
+    if not plain.empty:
+        parsed = pd.to_datetime(plain.str.replace('/', '-', regex=False), format='%Y-%m-%d', errors='coerce')
+        result.loc[parsed.index] = parsed.dt.strftime('%Y-%m-%d')
+
+    return result.where(result.notna(), None)
+
+
+def normalize_frame(frame, key_column: str = '项目', value_column: str = '值'):
+    """
+    对整张表做向量化规范化，在原始值旁附加 字节、赫兹、日期 三列
+
+    Args:
+        frame: 长表（如 batch_to_frame 的结果）
+        key_column: 项目列名
+        value_column: 原始值列名
+
+    Returns:
+        新的DataFrame
+    """
+    frame = frame.copy()
+    values = frame[value_column].astype('object').where(frame[value_column].notna(), '').astype(str)
+    keys = frame[key_column].astype(str)
+
+    position = frame.columns.get_loc(value_column) + 1
+    frame.insert(position, '字节', scale_values(values, CAPACITY_PATTERN, BYTE_UNITS))
+    frame.insert(position + 1, '赫兹', scale_values(values, FREQUENCY_PATTERN, HERTZ_UNITS))
+    frame.insert(position + 2, '日期', _iso_dates(keys, values))
+
+    return frame
+
+
+def normalize_batch(data: Dict[str, List[Dict]]):
+    """
+    便捷函数：将一批解析结果转换为带类型列的长表
+    """
+    return normalize_frame(batch_to_frame(data))
+
+
+def typed_columns(keys: list, values: list) -> Dict[str, list]:
+    """
+    计算一组 项目/值 对应的类型化列（供按列处理的导出器使用）
+
+    Returns:
+        列名 -> 列数据，无法解析的位置为 None
+    """
+    frame = normalize_frame(pd.DataFrame({'项目': keys, '值': values}))
+    return {column: frame[column].astype('object').where(frame[column].notna(), None).tolist()
+            for column in TYPED_COLUMNS}
+
+
+def normalize_records(data: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """
+    在每条记录的 值 之后附加类型化的 字节、赫兹、日期（无法解析时为 None），整批向量化计算
+
+    Returns:
+        与输入结构相同的新字典
+    """
+    keys = [record.get('项目') for records in data.values() for record in records]
+    if not keys:
+        return dict(data)
+    values = [record.get('值') for records in data.values() for record in records]
+    rows = iter(zip(*typed_columns(keys, values).values()))
+
+    result = {}
+    for filename, records in data.items():
+        normalized = []
+        for record in records:
+            typed = dict(zip(TYPED_COLUMNS, next(rows)))
+            row = {}
+            for key, value in record.items():
+                row[key] = value
+                if key == '值':
+                    row.update(typed)
+            normalized.append(row)
+        result[filename] = normalized
+    return result
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+本地HTTP解析服务
+
+常驻进程，保持一组预热的工作进程（已创建 AIDA64Parser 并编译好全部模板），
+采集代理把报告原始字节 POST 到本机端口即可得到JSON解析结果，无需每次启动程序。
+
+接口:
+    POST /parse?template=standard&filename=a.txt
+                                      请求体为报告原始字节，返回 {"文件名": ..., "数据": [...]}
+                                      template 省略或为 all 时提取全部项目
+    GET  /health                      服务状态（排队数、工作进程数）
+
+请求先进入有界队列，分派线程把短时间内到达的请求合并为一批交给工作进程；
+处理中的批次数有上限，队列满时立即返回 503 让客户端稍后重试。
+批次超过期限仍未返回（工作进程卡死或退出）时，该批请求以超时失败，
+工作进程池重建，其余处理中的批次重新提交。
+只监听本机回环地址，只使用标准库。
+"""
+
+import itertools
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from parser_core import AIDA64Parser
+from templates import TemplateManager
+
+
+# 允许监听的回环地址
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# 工作进程中的解析器和模板（由 _init_worker 创建）
+_worker_parser: Optional[AIDA64Parser] = None
+_worker_templates: Optional[TemplateManager] = None
+
+
+def _init_worker(config_dir: str):
+    """工作进程初始化：创建解析器并预编译全部模板"""
+    global _worker_parser, _worker_templates
+    _worker_parser = AIDA64Parser()
+    _worker_templates = TemplateManager(config_dir)
+    for template_name in _worker_templates.get_available_templates():
+        _worker_templates.compile_template(template_name)
+
+
+def _parse_batch(batch: List[Tuple[Optional[str], bytes]]) -> List[Tuple[bool, object]]:
+    """在工作进程中解析一批报告，返回 [(是否成功, 解析结果或错误信息)]"""
+    results = []
+    for template_name, raw_data in batch:
+        try:
+            selected_items = _worker_templates.compile_template(template_name) if template_name else None
+            results.append((True, _worker_parser.parse_bytes(raw_data, selected_items)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 采集代理并发上传时，默认的监听队列（5）会溢出导致连接被重置
+    request_queue_size = 128
+
+
+class _Job:
+    """一个等待解析的请求"""
+
+    __slots__ = ('template_name', 'raw_data', 'done', 'ok', 'result')
+
+    def __init__(self, template_name: Optional[str], raw_data: bytes):
+        self.template_name = template_name
+        self.raw_data = raw_data
+        self.done = threading.Event()
+        self.ok = False
+        self.result = None
+
+    def finish(self, ok: bool, result):
+        self.ok = ok
+        self.result = result
+        self.done.set()
+
+
+class ParseService:
+    """本地解析服务"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, workers: Optional[int] = None,
+                 batch_size: int = 16, batch_wait: float = 0.01, queue_size: int = 256,
+                 request_timeout: float = 120.0, max_body_mb: int = 64, config_dir: str = 'config',
+                 batch_timeout: Optional[float] = None):
+        """
+        Args:
+            host: 监听地址（只允许回环地址）
+            port: 端口，0表示自动分配
+            workers: 工作进程数，默认为CPU核数
+            batch_size: 每批最多合并的请求数
+            batch_wait: 凑批等待的最长秒数
+            queue_size: 等待队列长度，满时返回503
+            request_timeout: 单个请求等待结果的最长秒数
+            max_body_mb: 请求体大小上限（MB）
+            config_dir: 模板配置目录
+            batch_timeout: 一批请求在工作进程中处理的最长秒数，默认与 request_timeout 相同
+        """
+        if host not in LOOPBACK_HOSTS:
+            raise ValueError(f"解析服务只能监听本机地址: {host}")
+
+        self.host = host
+        self.port = port
+        self.workers = workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.request_timeout = request_timeout
+        self.batch_timeout = batch_timeout or request_timeout
+        self.max_body = max_body_mb * 1024 * 1024
+        self.config_dir = config_dir
+
+        self.templates = TemplateManager(config_dir)
+        self.queue: 'queue.Queue[_Job]' = queue.Queue(maxsize=queue_size)
+
+        # 处理中的批次上限：工作进程忙时请求留在有界队列中，从而产生背压
+        self._in_flight = threading.BoundedSemaphore(self.workers * 2)
+        # 处理中的批次：批次号 -> (期限, 请求列表)；回调与回收线程谁先取走谁负责结束
+        self._pending: Dict[int, Tuple[float, List[_Job]]] = {}
+        self._batch_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._server = None
+        self._dispatcher = None
+        self._reaper = None
+        self._stopping = threading.Event()
+
+    def _new_pool(self):
+        return multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(self.config_dir,))
+
+    def start(self):
+        """启动工作进程、分派线程和HTTP服务器（不阻塞）"""
+        self._pool = self._new_pool()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        self._reaper = threading.Thread(target=self._reap, daemon=True)
+        self._reaper.start()
+
+        self._server = _Server((self.host, self.port), self._handler_class())
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        """启动并阻塞，直到 Ctrl+C"""
+        self.start()
+        print(f"AIDA64解析服务已启动: http://{self.host}:{self.port}/parse （{self.workers} 个工作进程）")
+        try:
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """停止服务"""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _next_batch(self) -> List[_Job]:
+        """取出一批请求：等到第一个请求后，在 batch_wait 内继续凑满 batch_size"""
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self):
+        """分派线程：把队列中的请求按批交给工作进程"""
+        while not self._stopping.is_set():
+            self._in_flight.acquire()
+            batch = self._next_batch()
+            if not batch:
+                self._in_flight.release()
+                continue
+            self._submit_batch(batch)
+
+    def _submit_batch(self, batch: List[_Job]):
+        """把一批请求交给工作进程（调用方已持有一个处理中名额）"""
+        batch_id = next(self._batch_ids)
+
+        def on_done(results):
+            batch = self._take_batch(batch_id)
+            if batch is not None:
+                for job, (ok, result) in zip(batch, results):
+                    job.finish(ok, result)
+
+        def on_error(error):
+            batch = self._take_batch(batch_id)
+            if batch is not None:
+                for job in batch:
+                    job.finish(False, str(error))
+
+        payload = [(job.template_name, job.raw_data) for job in batch]
+        with self._lock:
+            self._pending[batch_id] = (time.monotonic() + self.batch_timeout, batch)
+            self._pool.apply_async(_parse_batch, (payload,), callback=on_done, error_callback=on_error)
+
+    def _take_batch(self, batch_id: int) -> Optional[List[_Job]]:
+        """取走一个处理中的批次并归还名额；已被回收线程取走时返回None"""
+        with self._lock:
+            entry = self._pending.pop(batch_id, None)
+        if entry is None:
+            return None
+        self._in_flight.release()
+        return entry[1]
+
+    def _reap(self):
+        """回收线程：批次超过期限时以超时结束，并重建工作进程池"""
+        while not self._stopping.wait(1):
+            now = time.monotonic()
+            with self._lock:
+                expired = [batch_id for batch_id, (deadline, _) in self._pending.items() if deadline <= now]
+            if expired:
+                self._restart_pool(expired)
+
+    def _restart_pool(self, expired: List[int]):
+        """重建工作进程池：超时的批次失败，其余处理中的批次重新提交到新池"""
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            old_pool = self._pool
+            self._pool = self._new_pool()
+            entries, self._pending = self._pending, {}
+
+        for batch_id, (_, batch) in entries.items():
+            if batch_id in expired:
+                self._in_flight.release()
+                for job in batch:
+                    job.finish(False, f"解析超时（超过 {self.batch_timeout:g} 秒），工作进程已重启")
+            else:
+                self._submit_batch(batch)
+
+        # 旧池的结果线程可能正在回调，需在锁外终止
+        old_pool.terminate()
+        old_pool.join()
+
+    def submit(self, template_name: Optional[str], raw_data: bytes) -> _Job:
+        """
+        提交一个请求（队列满时抛出 queue.Full）
+        """
+        job = _Job(template_name, raw_data)
+        self.queue.put_nowait(job)
+        return job
+
+    def status(self) -> Dict:
+        return {'状态': 'ok', '排队': self.queue.qsize(), '工作进程': self.workers,
+                '模板': self.templates.get_available_templates()}
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send_json(self, code: int, body: Dict, headers: Dict = None):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if urlparse(self.path).path == '/health':
+                    self._send_json(200, service.status())
+                else:
+                    self._send_json(404, {'错误': '未知路径'})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path != '/parse':
+                    self._send_json(404, {'错误': '未知路径'})
+                    return
+
+                try:
+                    length = int(self.headers.get('Content-Length', ''))
+                except ValueError:
+                    self._send_json(411, {'错误': '缺少 Content-Length'})
+                    return
+                if length > service.max_body:
+                    self.close_connection = True
+                    self._send_json(413, {'错误': '报告过大'})
+                    return
+                raw_data = self.rfile.read(length)
+
+                query = parse_qs(url.query)
+                template_name = query.get('template', ['all'])[0]
+                if template_name == 'all':
+                    template_name = None
+                elif template_name not in service.templates.templates:
+                    self._send_json(400, {'错误': f'未知模板: {template_name}'})
+                    return
+
+                try:
+                    job = service.submit(template_name, raw_data)
+                except queue.Full:
+                    self._send_json(503, {'错误': '服务繁忙，请稍后重试'}, {'Retry-After': '1'})
+                    return
+
+                if not job.done.wait(service.request_timeout):
+                    self._send_json(504, {'错误': '解析超时'})
+                    return
+
+                filename = query.get('filename', [''])[0]
+                if job.ok:
+                    self._send_json(200, {'文件名': filename, '数据': job.result})
+                else:
+                    self._send_json(422, {'文件名': filename, '错误': job.result})
+
+            def log_message(self, format, *args):
+                # 高频上传时不在控制台逐条打印访问日志
+                pass
+
+        return Handler
+
+
+def serve(port: int = 8765, workers: Optional[int] = None):
+    """以默认配置运行解析服务（阻塞）"""
+    ParseService(port=port, workers=workers).serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    argument_parser = argparse.ArgumentParser(description='AIDA64本地解析服务')
+    argument_parser.add_argument('--port', type=int, default=8765, help='监听端口（仅本机）')
+    argument_parser.add_argument('--workers', type=int, default=None, help='工作进程数')
+    args = argument_parser.parse_args()
+    serve(args.port, args.workers)
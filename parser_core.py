@@ -6,36 +6,176 @@ AIDA64报告解析核心模块
 import re
 import os
 import json
-import pandas as pd
+import time
+import unicodedata
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
+
+from section_registry import SectionParserRegistry, default_registry, index_sections, section_parser
+from units import parse_quantity, typed_record
+from profiling import ParseStats
+from item_selector import compile_items
+from report_tree import ReportTree
+
+
+# 系统概述中的标准项目
+SYSTEM_SUMMARY_ITEMS = [
+    '计算机类型', '操作系统', '计算机名称', '用户名称', '登录域',
+    '处理器名称', '主板名称', '主板芯片组', '系统内存',
+    '显示适配器', '3D 加速器', '显示器',
+    '存储控制器1', '存储控制器2', '硬盘驱动器1', '硬盘驱动器2', 
+    '硬盘 SMART 状态',
+    '主 IP 地址', '主 MAC 地址', '网络适配器1', '网络适配器2', '网络适配器3'
+]
+
+# 传感器节中的数值分组
+SENSOR_GROUPS = ['温度', '冷却风扇', '电压值', '电流值', '功耗值']
+
+# 内置基准测试节及其得分单位（None 表示无单位的得分）
+BENCHMARK_UNITS = {
+    '内存读取': 'MB/s', '内存写入': 'MB/s', '内存复制': 'MB/s', '内存潜伏': 'ns',
+    'CPU Queen': None, 'CPU PhotoWorxx': 'MPixel/s', 'CPU ZLib': 'MB/s',
+    'CPU AES': 'MB/s', 'CPU SHA3': 'MB/s',
+    'FPU Julia': None, 'FPU Mandel': None, 'FPU SinJulia': None,
+    'FP32 Ray-Trace': 'KRay/s', 'FP64 Ray-Trace': 'KRay/s',
+}
+BENCHMARK_SECTIONS = list(BENCHMARK_UNITS)
+
+# 基准测试结果中代表本机的行标记
+BENCHMARK_SELF_MARKERS = ('本机', 'This System', 'This system')
+
+# 本机行的得分列（标记之后的第一列，可带单位；后面的处理器、频率等列不取）
+BENCHMARK_SCORE_RE = re.compile(
+    r'^(?:' + '|'.join(map(re.escape, BENCHMARK_SELF_MARKERS)) + r')\s+'
+    r'(-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)(?:[ \t]*(\S+))?'
+)
+
+# 逻辑驱动器表的列与输出项目名
+LOGICAL_DRIVE_COLUMNS = [
+    ('驱动器类型', '驱动器类型'),
+    ('文件系统', '文件系统'),
+    ('总大小', '总大小'),
+    ('已用空间', '已用空间'),
+    ('可用空间', '可用空间'),
+    ('% 可用', '可用率'),
+    ('卷序列号', '卷序列号'),
+]
+
+# SPD节中的内存插槽子块名称，如 "DIMM1: Kingston 9905701-017.A00G"
+DIMM_BLOCK_RE = re.compile(r'^(DIMM\d+): (.*)$')
+
+# 网络适配器子块中提取的关键信息
+NETWORK_KEYS = ('IP 地址/子网掩码', '硬件地址(MAC)', '连接速度')
+
+# 驱动器单元格：盘符或挂载点，后跟可选的卷标，如 "D: (Data Disk)"、"C:\\Mount\\Data"
+DRIVE_CELL_RE = re.compile(r'^([A-Za-z]:[^\s(]*)\s*(?:\((.*)\))?')
+
+# 模板中代表“全部分区”的标记项目，如 'C: (NTFS)'
+DRIVE_MARKER_RE = re.compile(r'^[A-Za-z]: \(\w+\)$')
+
+
+def _char_width(char: str) -> int:
+    """字符的显示宽度（报告按GBK字节对齐，全角字符占两列）"""
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def _split_cells(line: str) -> List[Tuple[int, int, str]]:
+    """
+    按两个以上空格切分单元格
+    
+    Returns:
+        列表，元素为 (起始显示列, 结束显示列, 单元格文本)
+    """
+    cells = []
+    column = 0
+    start = None
+    text_start = 0
+    spaces = 0
+    
+    for index, char in enumerate(line):
+        if char == ' ':
+            spaces += 1
+            if spaces == 2 and start is not None:
+                cells.append((start, column - 1, line[text_start:index - 1]))
+                start = None
+        else:
+            if start is None:
+                start = column
+                text_start = index
+            spaces = 0
+        column += _char_width(char)
+    
+    if start is not None:
+        cells.append((start, column - spaces, line[text_start:len(line) - spaces]))
+    
+    return cells
+
+
+def parse_fixed_width_table(lines: List[str]) -> List[Dict[str, str]]:
+    """
+    按列位置解析定宽表格（单次遍历）
+    
+    第一行非空内容为表头。单元格以两个以上空格分隔，因此卷标中的空格不会打断单元格；
+    有空列时按显示列重叠最多（且保持列顺序）的原则归入表头列，右对齐的数值同样适用。
+    
+    Returns:
+        行列表，每行为 {列名: 值}
+    """
+    header = None
+    rows = []
+    
+    for line in lines:
+        line = line.rstrip()
+        if not line.strip() or set(line.strip()) <= {'-', '='}:
+            continue
+        
+        cells = _split_cells(line)
+        if header is None:
+            header = [(start, name) for start, _, name in cells]
+            spans = [(start, header[i + 1][0] if i + 1 < len(header) else float('inf'))
+                     for i, (start, _) in enumerate(header)]
+            continue
+        
+        # 单元格数与列数一致时按顺序对应（可容忍超宽的卷标把后续列整体右移）
+        if len(cells) == len(header):
+            rows.append({name: text for (_, name), (_, _, text) in zip(header, cells)})
+            continue
+        
+        row = {}
+        previous = 0
+        for cell_start, cell_end, text in cells:
+            candidates = range(previous, len(spans))
+            overlaps = {i: min(cell_end, spans[i][1]) - max(cell_start, spans[i][0]) for i in candidates}
+            best = max(candidates, key=overlaps.__getitem__)
+            if overlaps[best] <= 0:
+                best = min(candidates, key=lambda i: abs(spans[i][0] - cell_start))
+            previous = best
+            name = header[best][1]
+            row[name] = f"{row[name]} {text}" if name in row else text
+        rows.append(row)
+    
+    return rows
 
 
 class AIDA64Parser:
     """AIDA64报告解析器"""
     
-    def __init__(self):
-        self.section_patterns = {
-            '系统概述': r'--------\[ 系统概述 \]-+\n(.*?)\n\n--------',
-            '计算机名称': r'--------\[ 计算机名称 \]-+\n(.*?)\n\n--------',
-            'SPD': r'--------\[ SPD \]-+\n(.*?)\n\n--------',
-            '显示器': r'--------\[ 显示器 \]-+\n(.*?)\n\n--------',
-            '逻辑驱动器': r'--------\[ 逻辑驱动器 \]-+\n(.*?)\n\n--------',
-            '物理驱动器': r'--------\[ 物理驱动器 \]-+\n(.*?)\n\n--------',
-            'Windows 网络': r'--------\[ Windows 网络 \]-+\n(.*?)\n\n--------',
-            '已安装程序': r'--------\[ 已安装程序 \]-+\n(.*?)(?:\n\n|\n\nThe names of)'
-        }
+    def __init__(self, registry: SectionParserRegistry = None):
+        # 节解析器注册表
+        self.registry = registry or default_registry
+        
+        # 性能统计（默认关闭）
+        self.stats = ParseStats()
+        self.profile_path = None
+        
+        # 读取报告后的回调 content_hook(文件路径, 报告文本)，如全文索引 ReportIndex.add_content
+        self.content_hook: Optional[Callable[[str, str], None]] = None
+        # 回调出错的文件 [(文件路径, 错误信息)]；回调出错不影响解析结果
+        self.hook_errors: List[Tuple[str, str]] = []
         
         # 预定义需要提取的项目
         self.standard_items = {
-            '系统概述': [
-                '计算机类型', '操作系统', '计算机名称', '用户名称', '登录域',
-                '处理器名称', '主板名称', '主板芯片组', '系统内存',
-                '显示适配器', '3D 加速器', '显示器',
-                '存储控制器1', '存储控制器2', '硬盘驱动器1', '硬盘驱动器2', 
-                '硬盘 SMART 状态',
-                '主 IP 地址', '主 MAC 地址', '网络适配器1', '网络适配器2', '网络适配器3'
-            ],
+            '系统概述': SYSTEM_SUMMARY_ITEMS,
             'DMI': [
                 'DMI BIOS 厂商', 'DMI BIOS 版本', 'DMI 系统制造商', 'DMI 系统产品',
                 'DMI 系统版本', 'DMI 系统序列号', 'DMI 系统 UUID', 'DMI 主板制造商',
@@ -54,38 +194,62 @@ class AIDA64Parser:
             ]
         }
     
+    def enable_stats(self, enabled: bool = True, profile_path: Optional[str] = None):
+        """
+        开启或关闭性能统计
+        
+        Args:
+            enabled: 是否统计分阶段耗时、字节数和最慢文件
+            profile_path: 非空时在 parse_multiple_files 期间运行cProfile并将结果写入该路径
+        """
+        self.stats.enabled = enabled
+        self.profile_path = profile_path
+    
+    def read_report(self, file_path: str) -> str:
+        """读取报告文本（编码检测与 parse_file 相同），不做解析"""
+        return self._read_file_with_encoding(file_path)
+    
     def _read_file_with_encoding(self, file_path: str) -> str:
         """
         自动检测并读取文件，支持多种编码
         """
+        with self.stats.stage('读取'):
+            with open(file_path, 'rb') as f:
+                raw_data = f.read()
+        self.stats.add_bytes(len(raw_data))
+        
+        with self.stats.stage('编码检测'):
+            content = self._decode(raw_data)
+        
+        # 与文本模式读取一致，统一换行符
+        return content.replace('\r\n', '\n')
+    
+    def _decode(self, raw_data: bytes) -> str:
+        """检测编码并解码"""
         # 常见的Windows中文编码
         encodings = ['gbk', 'gb2312', 'gb18030', 'utf-8', 'big5', 'ansi', 'cp936']
         
         # 首先尝试使用chardet自动检测编码（如果可用）
         try:
             import chardet
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                result = chardet.detect(raw_data)
-                encoding = result['encoding']
-                try:
-                    return raw_data.decode(encoding)
-                except:
-                    pass
+            result = chardet.detect(raw_data)
+            encoding = result['encoding']
+            try:
+                return raw_data.decode(encoding)
+            except:
+                pass
         except ImportError:
             pass
         
         # 手动尝试各种编码
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
+                return raw_data.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
                 continue
         
-        # 如果所有编码都失败，尝试以二进制方式读取并忽略错误
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        # 如果所有编码都失败，忽略错误解码
+        return raw_data.decode('utf-8', errors='ignore')
     
     def parse_file(self, file_path: str, selected_items: List[str] = None) -> List[Dict]:
         """
@@ -98,250 +262,223 @@ class AIDA64Parser:
         Returns:
             解析结果列表，每个元素是 {'项目': ..., '值': ...}
         """
+        start = time.perf_counter()
         try:
             # 自动检测文件编码
             content = self._read_file_with_encoding(file_path)
+            if self.content_hook is not None:
+                self._run_content_hook(file_path, content)
             
-            all_data = []
-            
-            # 解析系统概述
-            if selected_items is None or any(item in self.standard_items['系统概述'] for item in (selected_items or [])):
-                system_data = self._parse_system_summary(content, selected_items)
-                all_data.extend(system_data)
-            
-            # 解析DMI信息（在系统概述中）
-            if selected_items is None or any(item.startswith('DMI') for item in (selected_items or [])):
-                dmi_data = self._parse_dmi_info(content, selected_items)
-                all_data.extend(dmi_data)
-            
-            # 解析SPD信息
-            if selected_items is None or any(item.startswith('DIMM') for item in (selected_items or [])):
-                spd_data = self._parse_spd_info(content, selected_items)
-                all_data.extend(spd_data)
-            
-            # 解析磁盘分区
-            if selected_items is None or any(item.startswith(('C:', 'D:', 'E:', '分区')) for item in (selected_items or [])):
-                disk_data = self._parse_disk_info(content, selected_items)
-                all_data.extend(disk_data)
-            
-            # 解析网络信息
-            if selected_items is None or any(item.startswith(('网络适配器', 'IP地址', 'MAC地址')) for item in (selected_items or [])):
-                network_data = self._parse_network_info(content, selected_items)
-                all_data.extend(network_data)
-            
-            # 解析已安装程序
-            if selected_items is None or '已安装程序' in (selected_items or []):
-                software_data = self._parse_installed_software(content)
-                all_data.extend(software_data)
-            
-            return all_data
+            data = self.parse_content(content, selected_items)
+            self.stats.record_file(file_path, time.perf_counter() - start)
+            return data
             
         except Exception as e:
+            self.stats.record_file(file_path, time.perf_counter() - start, failed=True)
             raise Exception(f"解析文件时出错: {str(e)}")
     
-    def _parse_system_summary(self, content: str, selected_items: List[str] = None) -> List[Dict]:
-        """解析系统概述部分"""
-        data = []
-        
-        # 查找系统概述部分
-        summary_match = re.search(self.section_patterns['系统概述'], content, re.DOTALL)
-        if not summary_match:
-            return data
-        
-        summary_content = summary_match.group(1)
-        lines = summary_content.strip().split('\n')
+    def _run_content_hook(self, file_path: str, content: str):
+        """调用 content_hook，错误记入 hook_errors 而不使解析失败"""
+        try:
+            self.content_hook(file_path, content)
+        except Exception as e:
+            self.hook_errors.append((file_path, str(e)))
+    
+    def parse_bytes(self, raw_data: bytes, selected_items: List[str] = None) -> List[Dict]:
+        """
+        解析内存中的报告原始字节（如通过网络上传的报告），编码检测与 parse_file 相同
+        """
+        self.stats.add_bytes(len(raw_data))
+        with self.stats.stage('编码检测'):
+            content = self._decode(raw_data).replace('\r\n', '\n')
+        return self.parse_content(content, selected_items)
+
+    def parse_content(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+        """
+        解析已读取的AIDA64报告文本
         
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # 检查是否是新的小节
-            if line.endswith(':'):
-                current_section = line[:-1]
+        只调度选中项目需要的节解析器，各解析器只接收其声明的节正文。
+        selected_items 可以是项目列表或编译后的 ItemSelector（批量解析时只编译一次）。
+        """
+        selected_items = compile_items(selected_items)
+        if selected_items is None:
+            parsers = self.registry.parsers()
+        else:
+            parsers = selected_items.resolve(self.registry)[0]
+        has_rules = selected_items is not None and bool(selected_items.rules)
+        if not parsers and not has_rules:
+            return []
+        
+        # 单次扫描建立节偏移索引
+        with self.stats.stage('节索引'):
+            sections = index_sections(content)
+        
+        all_data = []
+        tree = None
+        for spec in parsers:
+            offsets = sections.get(spec.section)
+            if offsets is None:
                 continue
-            
-            # 解析键值对
-            if ':' in line and current_section:
-                parts = line.split(':', 1)
-                if len(parts) == 2:
-                    key = f"{current_section}: {parts[0].strip()}" if current_section != '计算机' else parts[0].strip()
-                    value = parts[1].strip()
-                    
-                    # 重命名部分键以匹配标准格式
-                    if key == "计算机: 计算机类型":
-                        key = "计算机类型"
-                    elif key == "计算机: 操作系统":
-                        key = "操作系统"
-                    elif key == "计算机: 计算机名称":
-                        key = "计算机名称"
-                    elif key == "计算机: 用户名称":
-                        key = "用户名称"
-                    elif key == "计算机: 登录域":
-                        key = "登录域"
-                    
-                    # 检查是否在选中的项目中
-                    if selected_items is None or key in selected_items:
-                        data.append({'项目': key, '值': value})
+            if spec.tree:
+                # 层级树按节构建并缓存，多个解析器共享
+                if tree is None:
+                    tree = ReportTree(content, sections)
+                with self.stats.stage('层级树'):
+                    section_content = tree.section(spec.section)
+            else:
+                section_content = content[offsets[0]:offsets[1]].rstrip()
+            # 整节提取的节不做项目过滤
+            items = None if selected_items is None or spec.section in selected_items.whole_sections \
+                else selected_items
+            with self.stats.stage(f'解析:{spec.name}'):
+                all_data.extend(spec.func(self, section_content, items))
+        
+        # 自定义提取规则：每个目标节一次合并正则扫描
+        if has_rules:
+            with self.stats.stage('解析:自定义规则'):
+                all_data.extend(selected_items.rules.apply(content, sections))
+        
+        return all_data
+    
+    @section_parser('系统概述', produces=SYSTEM_SUMMARY_ITEMS, tree=True)
+    def _parse_system_summary(self, section, selected_items: List[str] = None) -> List[Dict]:
+        """解析系统概述部分（层级树中各小节的键值）"""
+        data = []
+        
+        for group in section.children():
+            for _, key, value in group.walk():
+                # 计算机小节的项目不加前缀，其余为 "小节: 项目"
+                if group.name != '计算机':
+                    key = f"{group.name}: {key}"
+                
+                # 检查是否在选中的项目中
+                if selected_items is None or key in selected_items:
+                    data.append({'项目': key, '值': value})
         
         return data
     
-    def _parse_dmi_info(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+    @section_parser('系统概述', prefixes=('DMI',), tree=True)
+    def _parse_dmi_info(self, section, selected_items: List[str] = None) -> List[Dict]:
         """解析DMI信息"""
         data = []
         
-        # 在系统概述中查找DMI部分
-        dmi_pattern = r'    DMI:\s*\n(.*?)(?:\n\n|\n    \S)'
-        dmi_match = re.search(dmi_pattern, content, re.DOTALL)
+        # 系统概述中的 DMI 小节
+        dmi = section.child('DMI')
+        if dmi is None:
+            return data
         
-        if dmi_match:
-            dmi_content = dmi_match.group(1)
-            lines = dmi_content.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if ':' in line:
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        key = parts[0].strip()
-                        value = parts[1].strip()
-                        
-                        if selected_items is None or key in selected_items:
-                            data.append({'项目': key, '值': value})
+        for _, key, value in dmi.walk():
+            if selected_items is None or key in selected_items:
+                data.append({'项目': key, '值': value})
         
         return data
     
-    def _parse_spd_info(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+    @section_parser('SPD', prefixes=('DIMM',), tree=True)
+    def _parse_spd_info(self, section, selected_items: List[str] = None) -> List[Dict]:
         """解析SPD信息"""
         data = []
         
-        spd_match = re.search(self.section_patterns['SPD'], content, re.DOTALL)
-        if not spd_match:
-            return data
+        # 每个内存插槽是一个 "[ DIMMn: 模块名称 ]" 子块，支持任意插槽编号
+        for block in section.children():
+            match = DIMM_BLOCK_RE.match(block.name)
+            if not match:
+                continue
+            slot = match.group(1)
+            
+            for _, name, value in block.walk():
+                key = f"{slot}: {name}"
+                if selected_items is None or key in selected_items:
+                    data.append({'项目': key, '值': value})
         
-        spd_content = spd_match.group(1)
+        return data
+    
+    @section_parser('逻辑驱动器', prefixes=('分区',), pattern=r'[A-Za-z]:')
+    def _parse_disk_info(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+        """解析磁盘分区信息（逻辑驱动器表，支持所有盘符和挂载点）"""
+        data = []
         
-        # 解析DIMM1
-        dimm1_pattern = r'\[ DIMM1: (.*?) \]\s*\n\n(.*?)(?:\n\n\[|\n\n--------)'
-        dimm1_match = re.search(dimm1_pattern, spd_content, re.DOTALL)
+        # '分区' 或模板中的 'C: (NTFS)' 之类标记表示提取所有盘符
+        include_all = (selected_items is None or '分区' in selected_items
+                       or any(DRIVE_MARKER_RE.match(item) for item in selected_items))
         
-        if dimm1_match:
-            dimm1_name = dimm1_match.group(1)
-            dimm1_info = dimm1_match.group(2)
+        for row in parse_fixed_width_table(content.split('\n')):
+            match = DRIVE_CELL_RE.match(row.get('驱动器', ''))
+            if not match:
+                continue
+            drive, label = match.group(1), match.group(2)
             
-            lines = dimm1_info.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if ':' in line:
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        key = f"DIMM1: {parts[0].strip()}"
-                        value = parts[1].strip()
-                        
-                        if selected_items is None or key in selected_items:
-                            data.append({'项目': key, '值': value})
-        
-        # 解析DIMM3
-        dimm3_pattern = r'\[ DIMM3: (.*?) \]\s*\n\n(.*?)(?:\n\n|\Z)'
-        dimm3_match = re.search(dimm3_pattern, spd_content, re.DOTALL)
-        
-        if dimm3_match:
-            dimm3_info = dimm3_match.group(2)
-            lines = dimm3_info.strip().split('\n')
+            records = []
+            if label:
+                records.append({'项目': f'{drive} 卷标', '值': label})
+            for column, field in LOGICAL_DRIVE_COLUMNS:
+                value = row.get(column)
+                if value:
+                    records.append({'项目': f'{drive} {field}', '值': value})
             
-            for line in lines:
-                line = line.strip()
-                if ':' in line:
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        key = f"DIMM3: {parts[0].strip()}"
-                        value = parts[1].strip()
-                        
-                        if selected_items is None or key in selected_items:
-                            data.append({'项目': key, '值': value})
+            # 由 "% 可用" 推算使用率
+            free_percent = re.match(r'(\d+(?:\.\d+)?)\s*%', row.get('% 可用', ''))
+            if free_percent:
+                usage = 100 - float(free_percent.group(1))
+                records.append({'项目': f'{drive} 使用率', '值': f'{usage:g} %'})
+            
+            # 选中了盘符本身（如 'C:'）时提取该盘全部信息，否则按项目过滤（如 'C: 总大小'）
+            if include_all or drive in selected_items:
+                data.extend(records)
+            else:
+                data.extend(record for record in records if record['项目'] in selected_items)
         
         return data
     
-    def _parse_disk_info(self, content: str, selected_items: List[str] = None) -> List[Dict]:
-        """解析磁盘分区信息"""
+    @section_parser('物理驱动器', prefixes=('物理驱动器',))
+    def _parse_physical_drives(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+        """解析物理驱动器表"""
         data = []
         
-        # 查找逻辑驱动器部分
-        logical_match = re.search(self.section_patterns['逻辑驱动器'], content, re.DOTALL)
-        if logical_match:
-            logical_content = logical_match.group(1)
-            lines = logical_content.strip().split('\n')
+        for index, row in enumerate(parse_fixed_width_table(content.split('\n')), start=1):
+            columns = list(row.items())
+            if not columns:
+                continue
+            
+            # 首列形如 "驱动器 #1" 时使用其编号
+            number = re.search(r'#\s*(\d+)', columns[0][1])
+            drive_key = f"物理驱动器{number.group(1) if number else index}"
             
-            for line in lines:
-                line = line.strip()
-                if line and '本地驱动器' in line:
-                    # 解析分区信息
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        drive = parts[0]
-                        filesystem = parts[2]
-                        total_size = parts[3]
-                        used_space = parts[4]
-                        free_space = parts[5]
-                        usage = parts[6]
-                        
-                        data.append({'项目': f'{drive} 文件系统', '值': filesystem})
-                        data.append({'项目': f'{drive} 总大小', '值': total_size})
-                        data.append({'项目': f'{drive} 已用空间', '值': used_space})
-                        data.append({'项目': f'{drive} 可用空间', '值': free_space})
-                        data.append({'项目': f'{drive} 使用率', '值': usage})
+            for column, value in columns[1:]:
+                key = f"{drive_key}: {column}"
+                if value and (selected_items is None or key in selected_items or drive_key in selected_items
+                              or '物理驱动器' in selected_items):
+                    data.append({'项目': key, '值': value})
         
         return data
     
-    def _parse_network_info(self, content: str, selected_items: List[str] = None) -> List[Dict]:
+    @section_parser('Windows 网络', prefixes=('网络适配器', 'IP地址', 'MAC地址'), tree=True)
+    def _parse_network_info(self, section, selected_items: List[str] = None) -> List[Dict]:
         """解析网络信息"""
         data = []
         
-        network_match = re.search(self.section_patterns['Windows 网络'], content, re.DOTALL)
-        if not network_match:
-            return data
-        
-        network_content = network_match.group(1)
-        
-        # 解析每个网络适配器
-        adapters = re.split(r'\n\n  \[ ', network_content)
-        
-        for adapter in adapters:
-            if not adapter.strip():
-                continue
-            
-            lines = adapter.strip().split('\n')
+        # 每个网络适配器是一个 "[ 适配器名称 ]" 子块
+        for adapter in section.children():
             adapter_name = None
             
-            for line in lines:
-                line = line.strip()
-                if '网络适配器:' in line:
-                    adapter_name = line.split(':', 1)[1].strip()
+            for _, key, value in adapter.walk():
+                if key == '网络适配器':
+                    adapter_name = value
                     data.append({'项目': '网络适配器', '值': adapter_name})
-                elif ':' in line and adapter_name:
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        key = parts[0].strip()
-                        value = parts[1].strip()
-                        
-                        # 只添加关键的网络信息
-                        if key in ['IP 地址/子网掩码', '硬件地址(MAC)', '连接速度']:
-                            full_key = f"{adapter_name}: {key}"
-                            if selected_items is None or full_key in selected_items:
-                                data.append({'项目': full_key, '值': value})
+                elif adapter_name and key in NETWORK_KEYS:
+                    # 只添加关键的网络信息
+                    full_key = f"{adapter_name}: {key}"
+                    if selected_items is None or full_key in selected_items:
+                        data.append({'项目': full_key, '值': value})
         
         return data
     
-    def _parse_installed_software(self, content: str) -> List[Dict]:
+    @section_parser('已安装程序', produces=('已安装程序',))
+    def _parse_installed_software(self, content: str, selected_items: List[str] = None) -> List[Dict]:
         """解析已安装程序"""
         data = []
         
-        software_match = re.search(self.section_patterns['已安装程序'], content, re.DOTALL)
-        if not software_match:
-            return data
-        
-        software_content = software_match.group(1)
+        # 程序列表在第一个空行处结束（其后为版权声明等内容）
+        software_content = content.split('\n\n', 1)[0]
         lines = software_content.strip().split('\n')
         
         for line in lines:
@@ -360,26 +497,103 @@ class AIDA64Parser:
         
         return data
     
-    def parse_multiple_files(self, file_paths: List[str], selected_items: List[str] = None) -> Dict[str, List[Dict]]:
+    @section_parser('传感器', prefixes=tuple(f'{group}:' for group in SENSOR_GROUPS),
+                    produces=SENSOR_GROUPS, tree=True)
+    def _parse_sensor_info(self, section, selected_items: List[str] = None) -> List[Dict]:
+        """解析传感器信息（温度、风扇转速、电压等），附带数值和单位"""
+        data = []
+        
+        # 数值分组是传感器节中的小节，如 "温度:"
+        for group in section.children():
+            if group.name not in SENSOR_GROUPS:
+                continue
+            
+            for _, name, value in group.walk():
+                key = f"{group.name}: {name}"
+                if selected_items is None or key in selected_items or group.name in selected_items:
+                    data.append(typed_record(key, value))
+        
+        return data
+    
+    def _parse_benchmark(self, section: str, content: str, selected_items: List[str] = None) -> List[Dict]:
+        """解析基准测试节，提取本机的测试结果"""
+        key = f"基准测试: {section}"
+        if not (selected_items is None or key in selected_items or '基准测试' in selected_items):
+            return []
+        
+        for line in content.strip().split('\n'):
+            match = BENCHMARK_SCORE_RE.match(line.strip())
+            if match:
+                number = float(match.group(1).replace(',', ''))
+                # 得分列自带的单位优先，否则使用该测试的得分单位
+                quantity = parse_quantity(f"{match.group(1)} {match.group(2) or ''}")
+                unit = quantity[1] if quantity else BENCHMARK_UNITS.get(section)
+                value = f"{number:g} {unit}" if unit else f"{number:g}"
+                return [{'项目': key, '值': value, '数值': number, '单位': unit}]
+        
+        return []
+    
+    def parse_tree(self, content: str) -> ReportTree:
+        """
+        将报告文本解析为完整的层级树（节 -> 子节 -> 键值），不受模板限制
+        """
+        with self.stats.stage('节索引'):
+            sections = index_sections(content)
+        return ReportTree(content, sections)
+    
+    def parse_file_tree(self, file_path: str) -> ReportTree:
+        """
+        读取报告文件并解析为完整的层级树
+        """
+        return self.parse_tree(self._read_file_with_encoding(file_path))
+    
+    def parse_multiple_files(self, file_paths: List[str], selected_items: List[str] = None,
+                             on_result: Callable[[str, List[Dict]], None] = None,
+                             checkpoint=None, keep_results: bool = True) -> Dict[str, List[Dict]]:
         """
         批量解析多个文件
         
         Args:
             file_paths: 文件路径列表
             selected_items: 选中的项目列表
+            on_result: 每个文件解析完成后的回调 on_result(文件名, 解析结果)，可用于流式导出
+            checkpoint: 可选的 CheckpointJournal，已完成的文件直接恢复，新结果写入日志
+            keep_results: 为False时不在内存中保留结果，返回空字典（结果只通过 on_result 交付）
         
         Returns:
             字典，键为文件名，值为解析结果
         """
         results = {}
+        selected_items = compile_items(selected_items)
         
-        for file_path in file_paths:
-            try:
-                filename = os.path.basename(file_path)
-                data = self.parse_file(file_path, selected_items)
-                results[filename] = data
-            except Exception as e:
-                results[filename] = [{'项目': '错误', '值': str(e)}]
+        profiler = None
+        if self.profile_path:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        try:
+            for file_path in file_paths:
+                restored = checkpoint.lookup(file_path) if checkpoint is not None else None
+                if restored is not None:
+                    filename, data = restored
+                else:
+                    filename = os.path.basename(file_path)
+                    try:
+                        data = self.parse_file(file_path, selected_items)
+                    except Exception as e:
+                        data = [{'项目': '错误', '值': str(e)}]
+                    else:
+                        if checkpoint is not None:
+                            checkpoint.record(file_path, filename, data)
+                if keep_results:
+                    results[filename] = data
+                if on_result is not None:
+                    on_result(filename, data)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(self.profile_path)
         
         return results
     
@@ -391,13 +605,29 @@ class AIDA64Parser:
             data: 解析结果字典
             output_path: 输出文件路径
         """
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for filename, file_data in data.items():
-                df = pd.DataFrame(file_data)
-                sheet_name = re.sub(r'[\\/*\[\]:?]', '', filename[:31])
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                worksheet = writer.sheets[sheet_name]
-                worksheet.column_dimensions['A'].width = 40
-                worksheet.column_dimensions['B'].width = 50
+        with self.stats.stage('导出:Excel'):
+            # pandas/openpyxl 仅在导出时加载，避免拖慢程序启动
+            import pandas as pd
+            
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                for filename, file_data in data.items():
+                    df = pd.DataFrame(file_data)
+                    sheet_name = re.sub(r'[\\/*\[\]:?]', '', filename[:31])
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    worksheet = writer.sheets[sheet_name]
+                    worksheet.column_dimensions['A'].width = 40
+                    worksheet.column_dimensions['B'].width = 50
         
         return output_path
+
+
+def _make_benchmark_parser(section: str):
+    """为指定的基准测试节生成解析函数"""
+    def parse(parser: AIDA64Parser, content: str, selected_items: List[str] = None) -> List[Dict]:
+        return parser._parse_benchmark(section, content, selected_items)
+    return parse
+
+
+for _section in BENCHMARK_SECTIONS:
+    section_parser(_section, produces=(f'基准测试: {_section}', '基准测试'),
+                   name=f'_parse_benchmark[{_section}]')(_make_benchmark_parser(_section))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+解析性能统计模块
+"""
+
+import heapq
+import threading
+import time
+from typing import Dict, List, Tuple
+
+
+class _NullStage:
+    """关闭统计时使用的空计时器"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """阶段计时器"""
+
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats: 'ParseStats', name: str):
+        self.stats = stats
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class ParseStats:
+    """
+    解析统计：分阶段计时、字节计数、最慢文件
+
+    关闭时 stage() 返回共享的空计时器，其余记录方法直接返回，开销可忽略。
+    """
+
+    def __init__(self, enabled: bool = False, slowest_count: int = 10):
+        self.enabled = enabled
+        self.slowest_count = slowest_count
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """清空统计数据"""
+        with self._lock:
+            self.stage_times: Dict[str, float] = {}
+            self.stage_calls: Dict[str, int] = {}
+            self.bytes_read = 0
+            self.files = 0
+            self.failed_files = 0
+            self._slowest: List[Tuple[float, str]] = []
+
+    def stage(self, name: str):
+        """
+        阶段计时上下文管理器
+
+        示例:
+            with stats.stage('读取'):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def add_time(self, name: str, seconds: float):
+        """累加阶段耗时"""
+        with self._lock:
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+    def add_bytes(self, count: int):
+        """累加读取的字节数"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.bytes_read += count
+
+    def take_stages(self) -> Tuple[Dict[str, float], Dict[str, int], int]:
+        """取出并清空分阶段耗时、次数和字节数（工作进程把它们随结果传回）"""
+        with self._lock:
+            stages = (self.stage_times, self.stage_calls, self.bytes_read)
+            self.stage_times, self.stage_calls, self.bytes_read = {}, {}, 0
+        return stages
+
+    def merge_stages(self, stage_times: Dict[str, float], stage_calls: Dict[str, int], bytes_read: int = 0):
+        """合并其他进程的分阶段统计（take_stages 的结果）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, seconds in stage_times.items():
+                self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+                self.stage_calls[name] = self.stage_calls.get(name, 0) + stage_calls.get(name, 0)
+            self.bytes_read += bytes_read
+
+    def record_file(self, file_path: str, seconds: float, failed: bool = False):
+        """记录单个文件的总耗时"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.files += 1
+            if failed:
+                self.failed_files += 1
+            if len(self._slowest) < self.slowest_count:
+                heapq.heappush(self._slowest, (seconds, file_path))
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, (seconds, file_path))
+
+    def slowest_files(self) -> List[Tuple[str, float]]:
+        """最慢的文件列表 [(路径, 秒数)]，按耗时降序"""
+        with self._lock:
+            return [(path, seconds) for seconds, path in sorted(self._slowest, reverse=True)]
+
+    def summary(self) -> List[str]:
+        """生成可读的统计摘要（每行一条）"""
+        with self._lock:
+            stage_items = sorted(self.stage_times.items(), key=lambda item: item[1], reverse=True)
+            stage_calls = dict(self.stage_calls)
+            files, failed, bytes_read = self.files, self.failed_files, self.bytes_read
+
+        lines = [f"文件 {files} 个（失败 {failed} 个），读取 {bytes_read / 1024 / 1024:.1f} MB"]
+        for name, seconds in stage_items:
+            lines.append(f"  {name}: {seconds:.3f}s / {stage_calls[name]} 次")
+        slowest = self.slowest_files()
+        if slowest:
+            lines.append("最慢的文件:")
+            for path, seconds in slowest:
+                lines.append(f"  {seconds:.3f}s  {path}")
+        return lines
@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+"""
+报告筛选模块
+
+用表达式按项目值筛选一批报告，例如:
+    系统内存 >= 16GB and 操作系统 contains "Windows 10"
+    (模块容量 >= 8GB or 存取速度 >= 3200MHz) and not 计算机名称 matches "^TEST-"
+
+语法:
+    字段       项目名称，可以是完整名称（`主板: 系统内存`，含空格或符号时用反引号）
+               或最后一段（系统内存）；匹配多个项目（如各内存插槽的 模块容量）时任一满足即为真
+    比较       ==  !=  >  >=  <  <=  contains（包含，不区分大小写）  matches（正则）
+    值         带引号的字符串，或数值加可选单位：16GB、3.2GHz、25%、2019
+               容量/频率单位按 normalize 的规则换算后比较，不带单位时取值中的第一个数字；
+               容量按标称值比较，相差 5% 以内视为相等（可用内存 16246 MB 满足 >= 16GB，不满足 > 16GB）
+    组合       and / or / not 与括号，也可写作 且 / 或 / 非
+
+表达式编译一次，按列在整批报告上用 pandas/NumPy 向量化求值；
+每个项目列和换算后的数值列在 ReportTable 中按需构建并缓存，重复筛选只需毫秒级。
+"""
+
+import operator
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from normalize import BYTE_UNITS, CAPACITY_PATTERN, FREQUENCY_PATTERN, HERTZ_UNITS, scale_values
+
+
+# 不带单位时取值中的第一个数字
+NUMBER_PATTERN = r'(-?\d+(?:\.\d+)?)'
+
+# 词法单元
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<op>==|!=|>=|<=|=|>|<)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<field>`[^`]+`)
+      | (?P<word>[^\s()=!<>"'`]+)
+    )''', re.VERBOSE)
+
+# 数值字面量，如 16GB、3.2 GHz、25%
+LITERAL_RE = re.compile(r'^(-?\d+(?:\.\d+)?)\s*([A-Za-z%]*)$')
+
+KEYWORDS = {
+    'and': 'and', '且': 'and',
+    'or': 'or', '或': 'or',
+    'not': 'not', '非': 'not',
+    'contains': 'contains', '包含': 'contains',
+    'matches': 'matches', '匹配': 'matches',
+}
+
+COMPARISONS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+}
+
+# 容量比较的相对容差：报告中的可用内存、格式化后的磁盘容量略小于标称容量
+CAPACITY_TOLERANCE = 0.05
+
+
+class FilterError(ValueError):
+    """筛选表达式错误"""
+
+
+class ReportTable:
+    """
+    一批报告的列式视图：每个报告一行，项目按需展开为列（同一报告的重复项目取第一个值）
+
+    示例:
+        table = ReportTable(parser.parse_multiple_files(files))
+        names = compile_filter('系统内存 >= 16GB').select(table)
+    """
+
+    def __init__(self, data: Dict[str, List[Dict]]):
+        """
+        Args:
+            data: parse_multiple_files 的结果
+        """
+        report_ids, keys, values = [], [], []
+        for report, records in enumerate(data.values()):
+            for record in records:
+                report_ids.append(report)
+                keys.append(record.get('项目'))
+                values.append(record.get('值'))
+        self._build(list(data), report_ids, keys, values)
+
+    @classmethod
+    def from_frame(cls, frame) -> 'ReportTable':
+        """从长表（文件名、项目、值，如 batch_to_frame 或导出的CSV）构建"""
+        table = cls.__new__(cls)
+        codes, names = pd.factorize(frame['文件名'])
+        table._build(list(names), codes, frame['项目'].tolist(), frame['值'].tolist())
+        return table
+
+    def _build(self, names: List[str], report_ids, keys: List[str], values: List):
+        self.names = names
+        self._report_ids = np.asarray(report_ids, dtype=np.int64)
+        self._values = np.asarray(values, dtype=object)
+        self._positions = pd.Series(keys, dtype=object).groupby(keys, sort=False).indices if keys else {}
+
+        # 项目名称最后一段 -> 完整项目名称
+        self._by_suffix: Dict[str, List[str]] = {}
+        for key in self._positions:
+            self._by_suffix.setdefault(str(key).rsplit(': ', 1)[-1], []).append(key)
+
+        self._columns: Dict[str, pd.Series] = {}
+        self._factors: Dict[str, tuple] = {}
+        self._numbers: Dict[tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, field: str) -> List[str]:
+        """字段对应的项目名称列表"""
+        if field in self._positions:
+            return [field]
+        return self._by_suffix.get(field, [])
+
+    def column(self, key: str) -> pd.Series:
+        """项目的值列（没有该项目的报告为None）"""
+        column = self._columns.get(key)
+        if column is None:
+            positions = self._positions[key]
+            reports, first = np.unique(self._report_ids[positions], return_index=True)
+            values = np.full(len(self.names), None, dtype=object)
+            values[reports] = self._values[positions[first]]
+            column = self._columns[key] = pd.Series(values, dtype=object)
+        return column
+
+    def _factorize(self, key: str):
+        """项目列的 (各报告的取值编号, 不同取值)，没有该项目的报告编号为-1"""
+        factors = self._factors.get(key)
+        if factors is None:
+            codes, uniques = pd.factorize(self.column(key))
+            factors = self._factors[key] = (codes, pd.Series(uniques, dtype=object).astype(str))
+        return factors
+
+    def text_mask(self, key: str, predicate) -> np.ndarray:
+        """
+        对项目的每个不同取值求一次 predicate（接收字符串Series，返回布尔Series），
+        再按编号展开到各报告；同一项目的取值大量重复，比逐行求值快得多
+        """
+        codes, uniques = self._factorize(key)
+        hits = predicate(uniques).to_numpy(dtype=bool)
+        # 编号-1（没有该项目）取到追加的 False
+        return np.append(hits, False)[codes]
+
+    def numbers(self, key: str, unit_kind: str) -> np.ndarray:
+        """项目的数值列（float数组，无法换算为NaN）：unit_kind 为 'bytes'、'hertz' 或 ''（取第一个数字）"""
+        cache_key = (key, unit_kind)
+        numbers = self._numbers.get(cache_key)
+        if numbers is None:
+            codes, uniques = self._factorize(key)
+            if unit_kind == 'bytes':
+                values = scale_values(uniques, CAPACITY_PATTERN, BYTE_UNITS)
+            elif unit_kind == 'hertz':
+                values = scale_values(uniques, FREQUENCY_PATTERN, HERTZ_UNITS)
+            else:
+                values = pd.to_numeric(uniques.str.extract(NUMBER_PATTERN)[0], errors='coerce')
+            numbers = self._numbers[cache_key] = np.append(values.to_numpy(dtype='float64'), np.nan)[codes]
+        return numbers
+
+
+class _Comparison:
+    """字段 比较符 值"""
+
+    def __init__(self, field: str, op: str, value):
+        self.field = field
+        self.op = op
+        self.value = value
+        self.number = None
+        self.unit_kind = ''
+
+        if op in ('contains', 'matches') and not isinstance(value, str):
+            # 文本比较的数值字面量按原文处理，如 计算机名称 matches 123
+            self.value = value = self._literal_text()
+
+        if op == 'matches':
+            try:
+                re.compile(value)
+            except re.error as e:
+                raise FilterError(f"无效的正则表达式 {value!r}: {e}")
+        elif op != 'contains' and not isinstance(value, str):
+            self.number, unit = value
+            upper = unit.upper()
+            if upper in BYTE_UNITS:
+                self.unit_kind = 'bytes'
+                self.number *= BYTE_UNITS[upper]
+            elif upper in HERTZ_UNITS:
+                self.unit_kind = 'hertz'
+                self.number *= HERTZ_UNITS[upper]
+            elif unit not in ('', '%'):
+                raise FilterError(f"未知单位: {unit}")
+
+    def evaluate(self, table: ReportTable) -> np.ndarray:
+        mask = np.zeros(len(table), dtype=bool)
+        for key in table.resolve(self.field):
+            mask |= self._evaluate_key(table, key)
+        return mask
+
+    def _evaluate_key(self, table: ReportTable, key: str) -> np.ndarray:
+        if self.op == 'contains':
+            return table.text_mask(key, lambda values: values.str.contains(self.value, case=False, regex=False))
+        if self.op == 'matches':
+            return table.text_mask(key, lambda values: values.str.contains(self.value, regex=True))
+
+        compare = COMPARISONS[self.op]
+        if self.number is not None:
+            values = table.numbers(key, self.unit_kind)
+            with np.errstate(invalid='ignore'):
+                if self.unit_kind == 'bytes':
+                    return self._compare_capacity(values) & ~np.isnan(values)
+                return compare(values, self.number) & ~np.isnan(values)
+
+        return table.text_mask(key, lambda values: compare(values, self.value))
+
+    def _compare_capacity(self, values: np.ndarray) -> np.ndarray:
+        """容量比较：与标称值相差不超过 CAPACITY_TOLERANCE 的值视为等于标称值"""
+        low = self.number * (1 - CAPACITY_TOLERANCE)
+        high = self.number * (1 + CAPACITY_TOLERANCE)
+        if self.op in ('==', '='):
+            return (values >= low) & (values <= high)
+        if self.op == '!=':
+            return (values < low) | (values > high)
+        if self.op == '>=':
+            return values >= low
+        if self.op == '>':
+            return values > high
+        if self.op == '<=':
+            return values <= high
+        return values < low
+
+    def _literal_text(self) -> str:
+        number, unit = self.value
+        return f"{number:g}{unit}"
+
+
+class _Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, table: ReportTable) -> np.ndarray:
+        return ~self.operand.evaluate(table)
+
+
+class _Logical:
+    def __init__(self, combine, operands):
+        self.combine = combine
+        self.operands = operands
+
+    def evaluate(self, table: ReportTable) -> np.ndarray:
+        mask = self.operands[0].evaluate(table)
+        for operand in self.operands[1:]:
+            mask = self.combine(mask, operand.evaluate(table))
+        return mask
+
+
+def _tokenize(expression: str) -> List[tuple]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = TOKEN_RE.match(expression, position)
+        if match is None or match.end() == position:
+            raise FilterError(f"无法识别的内容（位置 {position}）: {expression[position:position + 10]}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        start = match.start(kind)
+        if kind == 'word' and text.lower() in KEYWORDS:
+            kind, text = 'keyword', KEYWORDS[text.lower()]
+        tokens.append((kind, text, start))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """递归下降解析：or > and > not > 比较/括号"""
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.index = 0
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _next(self, expected: str) -> tuple:
+        token = self._peek()
+        if token is None:
+            raise FilterError(f"表达式不完整，缺少{expected}")
+        self.index += 1
+        return token
+
+    def _accept(self, kind: str, text: str = None) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == kind and (text is None or token[1] == text):
+            self.index += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self._or()
+        token = self._peek()
+        if token is not None:
+            raise FilterError(f"多余的内容（位置 {token[2]}）: {token[1]}")
+        return node
+
+    def _or(self):
+        operands = [self._and()]
+        while self._accept('keyword', 'or'):
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else _Logical(operator.or_, operands)
+
+    def _and(self):
+        operands = [self._not()]
+        while self._accept('keyword', 'and'):
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else _Logical(operator.and_, operands)
+
+    def _not(self):
+        if self._accept('keyword', 'not'):
+            return _Not(self._not())
+        if self._accept('lparen'):
+            node = self._or()
+            if not self._accept('rparen'):
+                raise FilterError("缺少右括号")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        kind, text, position = self._next('字段')
+        if kind == 'field':
+            field = text[1:-1].strip()
+        elif kind == 'word':
+            field = text
+        else:
+            raise FilterError(f"位置 {position} 应为字段名称: {text}")
+
+        kind, op, position = self._next('比较符')
+        if kind not in ('op', 'keyword') or op in ('and', 'or', 'not'):
+            raise FilterError(f"位置 {position} 应为比较符: {op}")
+
+        kind, text, position = self._next('比较值')
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', text[1:-1])
+        elif kind == 'word':
+            literal = LITERAL_RE.match(text)
+            # 数值与单位之间有空格，如 "400 GB"
+            unit = self._peek()
+            if literal and not literal.group(2) and unit is not None and unit[0] == 'word' \
+                    and re.fullmatch(r'[A-Za-z%]+', unit[1]):
+                self.index += 1
+                text = f"{text} {unit[1]}"
+                literal = LITERAL_RE.match(text.replace(' ', ''))
+            if op in ('contains', 'matches'):
+                # 文本比较保留原文（正则中的 007、1.50 等不应被改写为数值）
+                value = text
+            else:
+                value = (float(literal.group(1)), literal.group(2)) if literal else text
+        else:
+            raise FilterError(f"位置 {position} 应为比较值: {text}")
+
+        if isinstance(value, str) and op in ('>', '>=', '<', '<=') and LITERAL_RE.match(value):
+            # 带引号的数字按字符串比较，通常不是本意
+            raise FilterError(f"数值比较请去掉引号: {text}")
+        return _Comparison(field, op, value)
+
+
+class ReportFilter:
+    """编译后的筛选表达式"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+
+    def mask(self, table: ReportTable) -> np.ndarray:
+        """每个报告是否满足条件（布尔数组，与 table.names 对齐）"""
+        return self._root.evaluate(table)
+
+    def select(self, table: ReportTable) -> List[str]:
+        """满足条件的报告名称"""
+        return [table.names[i] for i in np.flatnonzero(self.mask(table))]
+
+    def apply(self, data: Dict[str, List[Dict]], table: Optional[ReportTable] = None) -> Dict[str, List[Dict]]:
+        """
+        筛选解析结果
+
+        Args:
+            data: parse_multiple_files 的结果
+            table: 已为 data 构建的 ReportTable（重复筛选时传入以复用缓存）
+
+        Returns:
+            只包含满足条件报告的新字典（保持原顺序）
+        """
+        if table is None:
+            table = ReportTable(data)
+        return {name: data[name] for name in self.select(table)}
+
+
+def compile_filter(expression: str) -> ReportFilter:
+    """编译筛选表达式（语法错误时抛出 FilterError）"""
+    return ReportFilter(expression)
+
+
+def filter_reports(data: Dict[str, List[Dict]], expression: str) -> Dict[str, List[Dict]]:
+    """便捷函数：按表达式筛选解析结果"""
+    return compile_filter(expression).apply(data)
+
+
+if __name__ == '__main__':
+    import argparse
+    import os
+    import time
+
+    from exporters import export_csv, read_ndjson
+
+    argument_parser = argparse.ArgumentParser(description='按表达式筛选AIDA64报告')
+    argument_parser.add_argument('expression', help='筛选表达式，如 "系统内存 >= 16GB and 操作系统 contains \\"Windows 10\\""')
+    argument_parser.add_argument('inputs', nargs='+', help='导出的NDJSON文件，或报告文件/文件夹')
+    argument_parser.add_argument('--template', default=None, help='解析报告时使用的模板')
+    argument_parser.add_argument('--output', default=None, help='把满足条件的报告导出为CSV')
+    args = argument_parser.parse_args()
+
+    try:
+        report_filter = compile_filter(args.expression)
+    except FilterError as e:
+        argument_parser.error(str(e))
+
+    data = {}
+    report_paths = []
+    for path in args.inputs:
+        if path.endswith(('.ndjson', '.ndjson.gz', '.ndjson.bz2', '.ndjson.xz')):
+            data.update(read_ndjson(path))
+        else:
+            report_paths.append(path)
+    if report_paths:
+        from file_discovery import discover_reports
+        from parser_core import AIDA64Parser
+        from templates import TemplateManager
+
+        selected_items = TemplateManager().compile_template(args.template) if args.template else None
+        data.update(AIDA64Parser().parse_multiple_files(discover_reports(report_paths), selected_items))
+
+    table = ReportTable(data)
+    start = time.perf_counter()
+    matched = report_filter.select(table)
+    elapsed = time.perf_counter() - start
+
+    for name in matched:
+        print(name)
+    print(f"{len(matched)}/{len(table)} 个报告满足条件（筛选耗时 {elapsed * 1000:.1f} ms）")
+    if args.output:
+        export_csv({name: data[name] for name in matched}, args.output)
+        print(f"已导出: {os.path.abspath(args.output)}")
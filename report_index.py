@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+报告全文索引模块
+
+把报告原文切分为词项，按所在的节（--------[ 节名称 ]）分字段建立倒排索引，保存在一个
+SQLite 文件中（标准库 sqlite3），用于模板没有覆盖的临时查询，例如
+"哪些机器列出了某个PCI设备"、"哪些报告提到了某个驱动"，无需再逐个 grep 报告。
+
+分词:
+    英文/数字  转小写，连续的字母数字及 . _ - + # 组成一个词（如 i7-8700、10.0.19041），
+               各部分（i7、8700）也单独索引
+    中文       按相邻两字切分（单字的词保持单字）
+
+存储:
+    每批加入的报告为每个 (词项, 字段) 写一行，文档编号列表差分后用 zlib 压缩；
+    报告修改后重新索引时旧编号记为删除，compact() 合并各行并清除已删除的编号。
+
+查询语法（各条件同时满足）:
+    intel                     任意位置出现
+    "Windows 10"              短语（各词都出现；verify=True 时再核对原文）
+    PCI设备:"Intel Ethernet"  限定在名称包含 "PCI设备" 的节中（忽略空白，也匹配 "PCI 设备" 节）
+    rtl8*                     前缀
+    -vmware                   排除
+
+示例:
+    index = ReportIndex('reports.idx')
+    index.update(file_paths)                 # 增量：只处理新增或修改的报告
+    index.search('PCI设备:"I219-V"')
+"""
+
+import os
+import re
+import sqlite3
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from section_registry import SECTION_HEADER_RE
+
+
+# 英文/数字词与中文字符串
+WORD_RE = re.compile(r'[0-9a-z][0-9a-z._+#-]*|[㐀-鿿]+')
+
+# 复合词的分隔符
+PART_SPLIT_RE = re.compile(r'[._+#-]+')
+
+# 查询条件：可选的排除号、可选的 字段:，然后是短语或单词
+QUERY_TERM_RE = re.compile(r'(-?)(?:([^\s:"]+|"[^"]+"):)?("[^"]*"|\S+)')
+
+# 报告开头（第一个节之前）的字段名
+HEADER_FIELD = '报告头'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime INTEGER,
+    size INTEGER,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS docs_path ON docs (path);
+CREATE TABLE IF NOT EXISTS fields (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    field INTEGER NOT NULL,
+    docs BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_token ON postings (token, field);
+"""
+
+
+def tokenize(text: str) -> Set[str]:
+    """切分文本为词项集合"""
+    tokens = set()
+    for word in WORD_RE.findall(text.lower()):
+        if word[0] < '㐀':
+            word = word.rstrip('._-')
+            tokens.add(word)
+            # 复合词同时索引各部分，如 i7-8700 -> i7、8700
+            if not word.isalnum():
+                tokens.update(PART_SPLIT_RE.split(word))
+        elif len(word) == 1:
+            tokens.add(word)
+        else:
+            tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+            # 末字不是任何双字的首字，单独索引，单字查询按前缀即可找到所有位置
+            tokens.add(word[-1])
+    tokens.discard('')
+    return tokens
+
+
+def section_parts(content: str) -> List[Tuple[str, str]]:
+    """
+    报告按节切分为 [(字段名, 正文)]，第一个节之前的部分为报告头
+
+    与 index_sections 不同，同名的节（如多个 PCI 设备 节）全部保留。
+    """
+    matches = list(SECTION_HEADER_RE.finditer(content))
+    first = matches[0].start() if matches else len(content)
+    parts = [(HEADER_FIELD, content[:first])]
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following is not None else len(content)
+        parts.append((match.group(1).strip(), content[match.end():end]))
+    return parts
+
+
+def _field_key(name: str) -> str:
+    """字段名比较用的规范形式（忽略大小写和空白，"PCI设备" 与 "PCI 设备" 相同）"""
+    return re.sub(r'\s+', '', name).lower()
+
+
+def _encode_docs(doc_ids: List[int]) -> bytes:
+    """升序文档编号 -> 差分 + zlib 压缩"""
+    deltas = array('I', [doc_ids[0]] + [b - a for a, b in zip(doc_ids, doc_ids[1:])])
+    return zlib.compress(deltas.tobytes(), 1)
+
+
+def _decode_docs(blob: bytes) -> List[int]:
+    deltas = array('I')
+    deltas.frombytes(zlib.decompress(blob))
+    return list(accumulate(deltas))
+
+
+def _file_state(file_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ReportIndex:
+    """
+    报告全文倒排索引
+
+    解析时顺带建立索引:
+        index = ReportIndex('reports.idx')
+        parser.content_hook = index.add_content
+        parser.parse_multiple_files(files, items)
+        index.flush()
+
+    索引出错（如数据库被锁定）不会使解析失败，出错的文件记录在 parser.hook_errors。
+    sqlite 连接只能在创建它的线程中使用，解析也需在该线程中进行。
+    """
+
+    def __init__(self, index_path: str, flush_docs: int = 500):
+        """
+        Args:
+            index_path: 索引文件路径（不存在时创建）
+            flush_docs: 内存中累积多少个报告后写入一次
+        """
+        self.index_path = index_path
+        self.flush_docs = flush_docs
+        self.connection = sqlite3.connect(index_path)
+        self.connection.executescript(SCHEMA)
+
+        self._fields: Dict[str, int] = dict(self.connection.execute('SELECT name, id FROM fields'))
+        # 尚未写入的倒排表：(词项, 字段编号) -> 文档编号列表
+        self._pending: Dict[Tuple[str, int], List[int]] = {}
+        self._pending_docs = 0
+        self._next_id = (self.connection.execute('SELECT MAX(id) FROM docs').fetchone()[0] or 0) + 1
+
+    def close(self):
+        """写入剩余内容并关闭"""
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _field_id(self, name: str) -> int:
+        field_id = self._fields.get(name)
+        if field_id is None:
+            field_id = self.connection.execute('INSERT INTO fields (name) VALUES (?)', (name,)).lastrowid
+            self._fields[name] = field_id
+        return field_id
+
+    def needs_update(self, file_path: str) -> bool:
+        """报告是否未索引或索引后被修改"""
+        row = self.connection.execute('SELECT mtime, size FROM docs WHERE path = ? AND deleted = 0',
+                                      (os.path.abspath(file_path),)).fetchone()
+        return row is None or tuple(row) != _file_state(file_path)
+
+    def add_content(self, file_path: str, content: str):
+        """
+        索引一个报告的文本（可直接作为 AIDA64Parser.content_hook）；同一路径的旧索引记为删除
+        """
+        path = os.path.abspath(file_path)
+        state = _file_state(path) or (None, None)
+        self.connection.execute('UPDATE docs SET deleted = 1 WHERE path = ?', (path,))
+
+        doc_id = self._next_id
+        self._next_id += 1
+        self.connection.execute('INSERT INTO docs (id, path, name, mtime, size) VALUES (?, ?, ?, ?, ?)',
+                                (doc_id, path, os.path.basename(path), state[0], state[1]))
+
+        # 同名的节合并为一个字段
+        fields: Dict[str, Set[str]] = {}
+        for field, text in section_parts(content):
+            fields.setdefault(field, set()).update(tokenize(text))
+
+        for field, tokens in fields.items():
+            field_id = self._field_id(field)
+            for token in tokens:
+                self._pending.setdefault((token, field_id), []).append(doc_id)
+
+        self._pending_docs += 1
+        if self._pending_docs >= self.flush_docs:
+            self.flush()
+
+    def flush(self):
+        """把累积的倒排表写入索引文件"""
+        if self._pending:
+            rows = ((token, field_id, _encode_docs(doc_ids)) for (token, field_id), doc_ids in self._pending.items())
+            self.connection.executemany('INSERT INTO postings (token, field, docs) VALUES (?, ?, ?)', rows)
+        self.connection.commit()
+        self._pending = {}
+        self._pending_docs = 0
+
+    def update(self, file_paths: Iterable[str], parser=None,
+               progress_callback: Callable[[int, int], None] = None) -> int:
+        """
+        增量索引：只读取新增或修改过的报告
+
+        Returns:
+            本次索引的报告数
+        """
+        if parser is None:
+            from parser_core import AIDA64Parser
+            parser = AIDA64Parser()
+
+        changed = [path for path in file_paths if self.needs_update(path)]
+        try:
+            for done, path in enumerate(changed, 1):
+                try:
+                    content = parser.read_report(path)
+                except OSError:
+                    continue
+                self.add_content(path, content)
+                if progress_callback is not None:
+                    progress_callback(done, len(changed))
+        finally:
+            self.flush()
+        return len(changed)
+
+    def prune(self) -> int:
+        """把已不存在的报告记为删除，返回数量"""
+        missing = [(doc_id,) for doc_id, path in
+                   self.connection.execute('SELECT id, path FROM docs WHERE deleted = 0')
+                   if not os.path.exists(path)]
+        self.connection.executemany('UPDATE docs SET deleted = 1 WHERE id = ?', missing)
+        self.connection.commit()
+        return len(missing)
+
+    def compact(self):
+        """合并每个 (词项, 字段) 的多行并清除已删除的文档"""
+        self.flush()
+        deleted = {row[0] for row in self.connection.execute('SELECT id FROM docs WHERE deleted = 1')}
+        merged: Dict[Tuple[str, int], List[int]] = {}
+        for token, field_id, blob in self.connection.execute('SELECT token, field, docs FROM postings'):
+            merged.setdefault((token, field_id), []).extend(_decode_docs(blob))
+
+        with self.connection:
+            self.connection.execute('DELETE FROM postings')
+            rows = []
+            for (token, field_id), doc_ids in merged.items():
+                doc_ids = sorted(set(doc_ids) - deleted)
+                if doc_ids:
+                    rows.append((token, field_id, _encode_docs(doc_ids)))
+            self.connection.executemany('INSERT INTO postings (token, field, docs) VALUES (?, ?, ?)', rows)
+            self.connection.execute('DELETE FROM docs WHERE deleted = 1')
+        self.connection.execute('VACUUM')
+
+    def stats(self) -> Dict[str, int]:
+        query = self.connection.execute
+        return {
+            '报告数': query('SELECT COUNT(*) FROM docs WHERE deleted = 0').fetchone()[0],
+            '已删除': query('SELECT COUNT(*) FROM docs WHERE deleted = 1').fetchone()[0],
+            '字段数': len(self._fields),
+            '倒排行数': query('SELECT COUNT(*) FROM postings').fetchone()[0],
+        }
+
+    def _token_docs(self, token: str, field_ids: Optional[List[int]]) -> Set[int]:
+        """词项（以 * 结尾为前缀）在指定字段中出现的文档"""
+        if token.endswith('*'):
+            prefix = token[:-1]
+            condition, params = 'token >= ? AND token < ?', [prefix, prefix + '\U0010ffff']
+        else:
+            condition, params = 'token = ?', [token]
+        if field_ids is not None:
+            condition += f" AND field IN ({','.join('?' * len(field_ids))})"
+            params.extend(field_ids)
+
+        docs = set()
+        for (blob,) in self.connection.execute(f'SELECT docs FROM postings WHERE {condition}', params):
+            docs.update(_decode_docs(blob))
+        return docs
+
+    def _term_docs(self, text: str, field_ids: Optional[List[int]]) -> Set[int]:
+        prefix = text.endswith('*')
+        tokens = list(tokenize(text.rstrip('*')))
+        if not tokens:
+            return set()
+        if prefix and len(tokens) == 1:
+            tokens = [tokens[0] + '*']
+        # 单个中文字符只作为双字的首字（或词的末字）被索引，按前缀查找
+        tokens = [token + '*' if len(token) == 1 and token >= '㐀' else token for token in tokens]
+
+        result = None
+        for token in tokens:
+            docs = self._token_docs(token, field_ids)
+            result = docs if result is None else result & docs
+            if not result:
+                break
+        return result
+
+    def _match_fields(self, field: str) -> List[int]:
+        """名称包含 field 的字段编号（忽略大小写和空白）；单个英文字母（如盘符 C:）不作为字段"""
+        if len(field) == 1 and field.isascii():
+            return []
+        key = _field_key(field)
+        return [field_id for name, field_id in self._fields.items() if key in _field_key(name)]
+
+    def search(self, query: str, limit: Optional[int] = None, verify: bool = False) -> List[str]:
+        """
+        查询
+
+        Args:
+            query: 查询语句（见模块说明）
+            limit: 最多返回的报告数
+            verify: 为True时读取候选报告核对短语原文（区分词序、去除中文双字切分的误匹配）
+
+        Returns:
+            满足条件的报告路径（按索引顺序）
+        """
+        self.flush()
+        include: Optional[Set[int]] = None
+        exclude: Set[int] = set()
+        phrases = []
+
+        for match in QUERY_TERM_RE.finditer(query):
+            negate, field, text = match.groups()
+            field = (field or '').strip('"')
+            field_ids = None
+            if field:
+                field_ids = self._match_fields(field)
+                if not field_ids:
+                    # 前缀不是已知字段（如 00:11:22、C:\Windows），整体作为查询词
+                    field = ''
+                    field_ids = None
+                    text = match.group(0)[len(negate):]
+            phrase = text[1:-1] if text.startswith('"') and text.endswith('"') and len(text) > 1 else text
+            docs = self._term_docs(phrase, field_ids)
+            if negate:
+                exclude |= docs
+            else:
+                include = docs if include is None else include & docs
+                phrases.append((field, phrase.rstrip('*')))
+
+        if include is None:
+            return []
+        doc_ids = sorted(include - exclude)
+
+        results = []
+        for i in range(0, len(doc_ids), 500):
+            batch = doc_ids[i:i + 500]
+            rows = self.connection.execute(
+                f"SELECT path FROM docs WHERE deleted = 0 AND id IN ({','.join('?' * len(batch))}) ORDER BY id", batch)
+            for (path,) in rows:
+                if verify and not _verify(path, phrases):
+                    continue
+                results.append(path)
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+
+def _verify(file_path: str, phrases: List[Tuple[str, str]]) -> bool:
+    """核对各短语确实出现在报告（限定的节）原文中"""
+    from parser_core import AIDA64Parser
+
+    try:
+        content = AIDA64Parser().read_report(file_path)
+    except OSError:
+        return False
+    lowered = content.lower()
+    sections = None
+    for field, phrase in phrases:
+        phrase = phrase.lower()
+        if not field:
+            if phrase not in lowered:
+                return False
+            continue
+        if sections is None:
+            sections = section_parts(content)
+        key = _field_key(field)
+        if not any(key in _field_key(name) and phrase in text.lower() for name, text in sections):
+            return False
+    return True
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    argument_parser = argparse.ArgumentParser(description='AIDA64报告全文索引')
+    commands = argument_parser.add_subparsers(dest='command', required=True)
+
+    build_command = commands.add_parser('build', help='建立或增量更新索引')
+    build_command.add_argument('index', help='索引文件')
+    build_command.add_argument('inputs', nargs='+', help='报告文件或文件夹')
+    build_command.add_argument('--prune', action='store_true', help='同时移除已不存在的报告')
+
+    search_command = commands.add_parser('search', help='查询')
+    search_command.add_argument('index', help='索引文件')
+    search_command.add_argument('query', help='查询语句，如 PCI设备:"I219-V" -vmware')
+    search_command.add_argument('--limit', type=int, default=None, help='最多显示的报告数')
+    search_command.add_argument('--verify', action='store_true', help='核对短语原文')
+
+    compact_command = commands.add_parser('compact', help='合并索引并清除已删除的报告')
+    compact_command.add_argument('index', help='索引文件')
+
+    args = argument_parser.parse_args()
+
+    with ReportIndex(args.index) as report_index:
+        if args.command == 'build':
+            from file_discovery import discover_reports
+            start = time.perf_counter()
+            count = report_index.update(discover_reports(args.inputs))
+            if args.prune:
+                report_index.prune()
+            print(f"已索引 {count} 个报告（{time.perf_counter() - start:.1f}s）: {report_index.stats()}")
+        elif args.command == 'search':
+            start = time.perf_counter()
+            matched = report_index.search(args.query, args.limit, args.verify)
+            elapsed = time.perf_counter() - start
+            for path in matched:
+                print(path)
+            print(f"{len(matched)} 个报告（查询耗时 {elapsed * 1000:.1f} ms）")
+        else:
+            report_index.compact()
+            print(report_index.stats())
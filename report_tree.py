@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+报告层级树模块
+
+把 AIDA64 文本报告解析为 节 -> 子节 -> 键值 的层级树，不依赖具体节的内容，
+报告中每个节都能完整保留（1:1还原）。
+
+层级来自三种结构:
+    --------[ 节名称 ]------     节
+    [ DIMM1: Kingston ... ]      方括号子块（如内存插槽、网络适配器、处理器）
+    计算机:                      以冒号结尾的分组标题
+
+缩进比标题更深的行属于该标题；键值行同时支持 "键: 值" 与 "键    值"（两个以上空格）两种排版。
+每个节逐行扫描一次，按需构建并缓存，整体为线性时间。
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from section_registry import index_sections
+
+
+# 方括号子块标题，如 "[ DIMM1: Kingston 9905701-017.A00G ]"
+BLOCK_HEADER_RE = re.compile(r'^\[ (.+?) \]$')
+
+# 键值行："键: 值"、"键:值" 或 "键    值"
+TREE_KEY_VALUE_RE = re.compile(r'^(.+?)(?::[ \t]*|[ \t]{2,})(.*)$')
+
+# 节点类型
+SECTION = 'section'
+BLOCK = 'block'
+GROUP = 'group'
+
+
+class ReportNode:
+    """
+    层级树节点
+
+    items 按原始顺序保存内容，元素为 (键, 值) 元组或子节点；
+    没有分隔符的行（如说明文字）保存为 (整行, '')。
+    """
+
+    __slots__ = ('name', 'kind', 'items')
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.items: List[Union[Tuple[str, str], 'ReportNode']] = []
+
+    def entries(self) -> List[Tuple[str, str]]:
+        """直接包含的键值对"""
+        return [item for item in self.items if isinstance(item, tuple)]
+
+    def children(self) -> List['ReportNode']:
+        """直接包含的子节点"""
+        return [item for item in self.items if isinstance(item, ReportNode)]
+
+    def child(self, name: str) -> Optional['ReportNode']:
+        """按名称查找子节点（同名时返回第一个）"""
+        for item in self.items:
+            if isinstance(item, ReportNode) and item.name == name:
+                return item
+        return None
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """按键查找直接包含的值"""
+        for item in self.items:
+            if isinstance(item, tuple) and item[0] == key:
+                return item[1]
+        return default
+
+    def walk(self, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], str, str]]:
+        """按原始顺序遍历所有键值，返回 (子节点路径, 键, 值)"""
+        for item in self.items:
+            if isinstance(item, tuple):
+                yield path, item[0], item[1]
+            else:
+                yield from item.walk(path + (item.name,))
+
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典"""
+        return {
+            '名称': self.name,
+            '类型': self.kind,
+            '内容': [item.to_dict() if isinstance(item, ReportNode) else list(item) for item in self.items],
+        }
+
+    def __repr__(self):
+        return f"ReportNode({self.name!r}, {self.kind}, {len(self.items)} items)"
+
+
+def build_section_node(name: str, text: str) -> ReportNode:
+    """
+    将一个节的正文解析为层级树（逐行单次扫描）
+
+    Args:
+        name: 节名称
+        text: 节正文（不含节标题行）
+    """
+    section = ReportNode(name, SECTION)
+    # 打开的标题栈：(缩进, 节点)，节本身的缩进视为 -1
+    stack: List[Tuple[int, ReportNode]] = [(-1, section)]
+
+    def close_top():
+        indent, node = stack.pop()
+        # 没有任何内容的冒号标题实际上是值为空的键
+        if node.kind == GROUP and not node.items:
+            parent = stack[-1][1]
+            parent.items[-1] = (node.name, '')
+
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        indent = len(raw_line) - len(raw_line.lstrip())
+
+        while len(stack) > 1 and indent <= stack[-1][0]:
+            close_top()
+        parent = stack[-1][1]
+
+        block = BLOCK_HEADER_RE.match(line) if line[0] == '[' else None
+        if block:
+            node = ReportNode(block.group(1), BLOCK)
+            parent.items.append(node)
+            stack.append((indent, node))
+            continue
+
+        if line.endswith(':') and line.find(':') == len(line) - 1:
+            node = ReportNode(line[:-1].strip(), GROUP)
+            parent.items.append(node)
+            stack.append((indent, node))
+            continue
+
+        match = TREE_KEY_VALUE_RE.match(line)
+        if match:
+            parent.items.append((match.group(1).strip(), match.group(2).strip()))
+        else:
+            parent.items.append((line, ''))
+
+    while len(stack) > 1:
+        close_top()
+    return section
+
+
+class ReportTree:
+    """
+    整个报告的层级树
+
+    节在首次访问时才构建并缓存，解析器只访问它需要的节时不会扫描其余内容。
+    """
+
+    def __init__(self, content: str, sections: Optional[Dict[str, Tuple[int, int]]] = None):
+        """
+        Args:
+            content: 报告全文
+            sections: index_sections 的结果（已有时传入，避免重复扫描）
+        """
+        self.content = content
+        self.offsets = sections if sections is not None else index_sections(content)
+        self._nodes: Dict[str, ReportNode] = {}
+
+    def section_names(self) -> List[str]:
+        """报告中所有节的名称（按出现顺序）"""
+        return list(self.offsets)
+
+    def section_text(self, name: str) -> Optional[str]:
+        """节的原始正文（表格等按列排版的内容可从这里按行解析）"""
+        offsets = self.offsets.get(name)
+        if offsets is None:
+            return None
+        return self.content[offsets[0]:offsets[1]].rstrip()
+
+    def section(self, name: str) -> Optional[ReportNode]:
+        """获取节的层级树，节不存在时返回None"""
+        node = self._nodes.get(name)
+        if node is None:
+            text = self.section_text(name)
+            if text is None:
+                return None
+            node = self._nodes[name] = build_section_node(name, text)
+        return node
+
+    def __iter__(self) -> Iterator[ReportNode]:
+        for name in self.offsets:
+            yield self.section(name)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def records(self) -> List[Dict]:
+        """
+        展开为记录列表，项目名为完整路径，如 "系统概述: 主板: 主板名称"
+        """
+        data = []
+        for section in self:
+            for path, key, value in section.walk((section.name,)):
+                data.append({'项目': ': '.join(path + (key,)), '值': value})
+        return data
+
+    def to_dict(self) -> Dict:
+        """转换为可JSON序列化的字典（节名称 -> 节点）"""
+        return {section.name: section.to_dict() for section in self}
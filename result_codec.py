@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+解析结果的紧凑列式编码
+
+工作进程把一个报告的记录列表编码为一段字节，作为结果元组中的 bytes 经管道传回监督进程
+（pickle 单个 bytes 对象几乎没有开销），避免逐个 pickle 成千上万个小字典。
+BatchRunner 设置 on_columns 时使用，如 spill_parse 把列直接交给 SpillingExporter。编码格式:
+    头部       struct '<4sIIIII'：魔数、记录数、列数、字符串数、列名长度、字符串表长度
+    列名       '\\x00' 分隔的 UTF-8 文本
+    字符串表   全部不同的字符串值（去重）以 '\\x00' 分隔的 UTF-8 文本
+    每列数据   字符串列为 int32 下标数组（0 表示记录中没有该键，1 表示值为None，其余为字符串表下标+2）；
+               '数值' 列为 float64 数组加 int8 状态数组（0 没有该键，1 None，2 有值）
+
+解码时字符串表一次 split 还原，各列可直接作为列表交给列式导出（decode_columns），
+需要记录列表时再按列组装（decode_records）。
+字符串中含有 '\\x00' 或出现非字符串值时退回 pickle，保证任何结果都能传输。
+"""
+
+import pickle
+import struct
+from array import array
+from itertools import repeat
+from typing import Dict, List, Tuple
+
+# 编码格式魔数
+MAGIC = b'AR01'
+PICKLE_MAGIC = b'AP01'
+
+_HEADER = struct.Struct('<4sIIIII')
+
+# 按浮点数编码的列
+NUMERIC_COLUMNS = ('数值',)
+
+
+class _Missing:
+    """列中“记录没有该键”的占位标记"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+# 可以列式编码的值类型
+_STRING_KINDS = {str, _Missing, type(None)}
+_NUMERIC_KINDS = {float, _Missing, type(None)}
+
+
+class _Fallback(Exception):
+    """结果无法列式编码"""
+
+
+def _columns_of(records: List[Dict]) -> List[str]:
+    columns = {}
+    for record in records:
+        for key in record:
+            columns[key] = None
+    return list(columns)
+
+
+def _encode_strings(strings) -> bytes:
+    text = '\x00'.join(strings)
+    if text.count('\x00') != max(len(strings) - 1, 0):
+        raise _Fallback()
+    return text.encode('utf-8')
+
+
+def encode_records(records: List[Dict]) -> bytes:
+    """
+    将一个报告的记录列表编码为字节
+
+    Args:
+        records: 解析结果（字典列表）
+
+    Returns:
+        编码后的字节
+    """
+    try:
+        return _encode_columnar(records)
+    except _Fallback:
+        return PICKLE_MAGIC + pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _encode_columnar(records: List[Dict]) -> bytes:
+    columns = _columns_of(records)
+    # 字符串表的前两项固定为 MISSING 与 None，其余为去重后的字符串
+    table: Dict[object, int] = {MISSING: 0, None: 1}
+    parts = []
+
+    for column in columns:
+        values = [record.get(column, MISSING) for record in records]
+        kinds = set(map(type, values))
+
+        if column in NUMERIC_COLUMNS:
+            if not kinds <= _NUMERIC_KINDS:
+                raise _Fallback()
+            parts.append(array('d', [value if type(value) is float else 0.0 for value in values]).tobytes())
+            parts.append(bytes([2 if type(value) is float else (1 if value is None else 0) for value in values]))
+            continue
+
+        if not kinds <= _STRING_KINDS:
+            raise _Fallback()
+        parts.append(array('i', [table.setdefault(value, len(table)) for value in values]).tobytes())
+
+    strings = list(table)[2:]
+    column_blob = _encode_strings(columns)
+    table_blob = _encode_strings(strings)
+    header = _HEADER.pack(MAGIC, len(records), len(columns), len(strings), len(column_blob), len(table_blob))
+    return b''.join([header, column_blob, table_blob] + parts)
+
+
+def _decode_strings(blob, count: int) -> List[str]:
+    return bytes(blob).decode('utf-8').split('\x00') if count else []
+
+
+def decode_columns(buffer: bytes) -> Tuple[int, Dict[str, list]]:
+    """
+    解码为列
+
+    Returns:
+        (记录数, 列名 -> 列数据)；没有该键的位置为 decode_records 跳过的 MISSING 标记
+    """
+    if buffer[:4] == PICKLE_MAGIC:
+        return records_to_columns(pickle.loads(buffer[4:]))
+
+    magic, count, column_count, table_count, column_length, table_length = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("无法识别的结果编码")
+    buffer = memoryview(buffer)
+    offset = _HEADER.size
+    names = _decode_strings(buffer[offset:offset + column_length], column_count)
+    offset += column_length
+    # 下标 0、1 固定为 MISSING 与 None
+    table = [MISSING, None] + _decode_strings(buffer[offset:offset + table_length], table_count)
+    offset += table_length
+
+    columns = {}
+    for name in names:
+        if name in NUMERIC_COLUMNS:
+            numbers = array('d')
+            numbers.frombytes(buffer[offset:offset + 8 * count])
+            offset += 8 * count
+            states = buffer[offset:offset + count]
+            offset += count
+            columns[name] = [number if state == 2 else (None if state == 1 else MISSING)
+                             for number, state in zip(numbers, states)]
+        else:
+            indices = array('i')
+            indices.frombytes(buffer[offset:offset + 4 * count])
+            offset += 4 * count
+            columns[name] = list(map(table.__getitem__, indices))
+    return count, columns
+
+
+def records_to_columns(records: List[Dict]) -> Tuple[int, Dict[str, list]]:
+    """记录列表转换为列（与 decode_columns 的结果形式相同）"""
+    return len(records), {column: [record.get(column, MISSING) for record in records]
+                          for column in _columns_of(records)}
+
+
+def columns_to_records(count: int, columns: Dict[str, list]) -> List[Dict]:
+    """列转换为记录列表"""
+    names = list(columns)
+    if not names:
+        return [{} for _ in range(count)]
+    if all(MISSING not in values for values in columns.values()):
+        return list(map(dict, map(zip, repeat(names), zip(*columns.values()))))
+
+    records = []
+    for row in zip(*columns.values()):
+        records.append({name: value for name, value in zip(names, row) if value is not MISSING})
+    return records
+
+
+def decode_records(buffer: bytes) -> List[Dict]:
+    """解码为记录列表（与编码前相同）"""
+    if buffer[:4] == PICKLE_MAGIC:
+        return pickle.loads(buffer[4:])
+    return columns_to_records(*decode_columns(buffer))
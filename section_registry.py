@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+节解析器注册模块
+
+每个节解析器声明它消费的报告节（--------[ 节名称 ]）以及它产出的项目键，
+解析引擎据此只调度当前模板需要的解析器。
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# 报告节标题行，例如: --------[ 系统概述 ]--------
+SECTION_HEADER_RE = re.compile(r'^-{8}\[ (.+?) \]-*[ \t]*\r?$', re.M)
+
+
+def index_sections(content: str) -> Dict[str, Tuple[int, int]]:
+    """
+    单次扫描报告，建立节名称到节正文偏移的索引
+
+    Returns:
+        字典，键为节名称，值为 (正文起始偏移, 正文结束偏移)；同名节只保留第一个
+    """
+    offsets = {}
+    previous_name = None
+    previous_start = 0
+
+    for match in SECTION_HEADER_RE.finditer(content):
+        if previous_name is not None and previous_name not in offsets:
+            offsets[previous_name] = (previous_start, match.start())
+        previous_name = match.group(1).strip()
+        previous_start = match.end() + 1
+
+    if previous_name is not None and previous_name not in offsets:
+        offsets[previous_name] = (min(previous_start, len(content)), len(content))
+
+    return offsets
+
+
+class SectionParserSpec:
+    """节解析器声明"""
+
+    def __init__(self, name: str, section: str, func: Callable,
+                 produces: Iterable[str] = (), prefixes: Iterable[str] = (),
+                 pattern: Optional[str] = None, tree: bool = False):
+        """
+        Args:
+            name: 解析器名称
+            section: 消费的报告节名称
+            func: 解析函数，签名为 func(parser, section_content, selected_items) -> List[Dict]
+            produces: 产出的确切项目键
+            prefixes: 产出的项目键前缀
+            pattern: 产出的项目键正则（用于前缀无法枚举的情况，如任意盘符）
+            tree: 为True时 section_content 为该节的层级树节点（ReportNode）而不是正文文本
+        """
+        self.name = name
+        self.section = section
+        self.func = func
+        self.produces = frozenset(produces)
+        self.prefixes = tuple(prefixes)
+        self.pattern = re.compile(pattern) if pattern else None
+        self.tree = tree
+
+    def is_needed(self, selected_items: Optional[Iterable[str]]) -> bool:
+        """判断选中的项目是否需要此解析器"""
+        if selected_items is None:
+            return True
+        for item in selected_items:
+            if item in self.produces or (self.prefixes and item.startswith(self.prefixes)):
+                return True
+            if self.pattern is not None and self.pattern.match(item):
+                return True
+        return False
+
+    def __repr__(self):
+        return f"SectionParserSpec({self.name!r}, section={self.section!r})"
+
+
+class SectionParserRegistry:
+    """节解析器注册表"""
+
+    def __init__(self):
+        self._parsers: Dict[str, SectionParserSpec] = {}
+        # 注册表变更计数，供编译后的选择器判断缓存是否失效
+        self.version = 0
+
+    def register(self, section: str, produces: Iterable[str] = (), prefixes: Iterable[str] = (),
+                 pattern: Optional[str] = None, name: Optional[str] = None, tree: bool = False):
+        """
+        注册节解析器的装饰器
+
+        示例:
+            @registry.register('传感器', prefixes=('温度:',))
+            def parse_sensor(parser, content, selected_items): ...
+        """
+        def decorator(func):
+            spec_name = name or func.__name__
+            self._parsers[spec_name] = SectionParserSpec(spec_name, section, func, produces, prefixes, pattern,
+                                                         tree)
+            self.version += 1
+            return func
+        return decorator
+
+    def unregister(self, name: str):
+        """注销节解析器"""
+        if self._parsers.pop(name, None) is not None:
+            self.version += 1
+
+    def get(self, name: str) -> Optional[SectionParserSpec]:
+        """按名称获取解析器声明"""
+        return self._parsers.get(name)
+
+    def parsers(self) -> List[SectionParserSpec]:
+        """按注册顺序返回所有解析器声明"""
+        return list(self._parsers.values())
+
+    def sections(self) -> List[str]:
+        """返回所有已注册解析器消费的节名称"""
+        return list(dict.fromkeys(spec.section for spec in self._parsers.values()))
+
+    def resolve(self, selected_items: Optional[Iterable[str]]) -> List[SectionParserSpec]:
+        """返回选中项目所需的解析器（保持注册顺序）"""
+        if selected_items is not None:
+            selected_items = list(selected_items)
+        return [spec for spec in self._parsers.values() if spec.is_needed(selected_items)]
+
+
+# 默认注册表，内置解析器与插件都注册到这里
+default_registry = SectionParserRegistry()
+
+
+def section_parser(section: str, produces: Iterable[str] = (), prefixes: Iterable[str] = (),
+                   pattern: Optional[str] = None, name: Optional[str] = None, tree: bool = False):
+    """注册到默认注册表的装饰器"""
+    return default_registry.register(section, produces=produces, prefixes=prefixes,
+                                     pattern=pattern, name=name, tree=tree)
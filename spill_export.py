@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+外存导出模块
+
+解析过程中把结果按列缓冲，超过内存预算时写入临时的列式分块文件，
+全部解析完成后逐块合并为最终输出，内存占用只与预算和项目种类数有关:
+    CSV（长表，与 export_csv 格式相同）
+    汇总CSV / Excel（透视宽表：每个报告一行，每个项目一列）
+    Parquet（长表，需要 pyarrow）
+长表导出可按 normalize 模块的规则附加类型化的 字节、赫兹、日期 列。
+
+示例:
+    with SpillingExporter(memory_budget_mb=256) as exporter:
+        BatchRunner(items, on_columns=exporter.add_columns, keep_results=False).run(files)
+        exporter.export_csv('out.csv')
+        exporter.export_excel('out.xlsx')
+
+命令行:
+    python spill_export.py 报告文件夹 --output-dir 输出目录 --formats csv pivot_csv excel [--normalize]
+"""
+
+import csv
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from exporters import CSV_BASE_COLUMNS
+from result_codec import MISSING, records_to_columns
+
+
+# 每条记录除字符串本身以外的估算内存开销（列表槽位、字符串对象头）
+RECORD_OVERHEAD = 200
+
+# Excel 单个工作表的最大列数
+EXCEL_MAX_COLUMNS = 16384
+
+# 内部报告序号列（同名文件各自成行）
+_REPORT = '_序号'
+
+
+class SpillingExporter:
+    """按内存预算溢出到磁盘的导出器"""
+
+    def __init__(self, memory_budget_mb: int = 256, spill_dir: Optional[str] = None, normalize: bool = False):
+        """
+        Args:
+            memory_budget_mb: 内存中缓冲结果的预算（MB），超出时写入临时分块文件
+            spill_dir: 临时分块文件所在目录，默认为系统临时目录
+            normalize: 长表输出（CSV、Parquet）在 值 之后附加类型化的 字节、赫兹、日期 列
+        """
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.normalize = normalize
+        self._dir = tempfile.mkdtemp(prefix='aida64_spill_', dir=spill_dir)
+        self._chunks: List[str] = []
+        # 各分块包含的报告序号范围 [起, 止)，没有记录的报告也要在透视表中占一行
+        self._chunk_reports: List[range] = []
+        self._buffer_start = 0
+
+        # 输出列：长表的列（文件名、项目、值及解析器附带的列）与透视表的项目列，均按首次出现顺序
+        self.columns = list(CSV_BASE_COLUMNS)
+        self.items: Dict[str, None] = {}
+        self.filenames: List[str] = []
+
+        self._buffer = self._empty_buffer()
+        self._buffer_bytes = 0
+
+    def _empty_buffer(self) -> Dict[str, list]:
+        return {column: [] for column in [_REPORT] + self.columns}
+
+    @property
+    def reports(self) -> int:
+        return len(self.filenames)
+
+    @property
+    def spilled_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def output_columns(self) -> List[str]:
+        """长表输出列"""
+        if not self.normalize:
+            return self.columns
+        from normalize import TYPED_COLUMNS
+        position = self.columns.index('值') + 1
+        return self.columns[:position] + list(TYPED_COLUMNS) + self.columns[position:]
+
+    def add(self, filename: str, records: List[Dict]):
+        """加入一个报告的解析结果（可直接作为 on_result 回调）"""
+        self.add_columns(filename, *records_to_columns(records))
+
+    def add_columns(self, filename: str, count: int, columns: Dict[str, list]):
+        """加入一个报告的列式结果（可直接作为 BatchRunner 的 on_columns 回调）"""
+        report = len(self.filenames)
+        self.filenames.append(filename)
+
+        buffer = self._buffer
+        size = len(buffer[_REPORT])
+        for column in columns:
+            if column not in buffer:
+                # 新出现的附加列，已有行补空
+                self.columns.append(column)
+                buffer[column] = [None] * size
+
+        buffer[_REPORT].extend([report] * count)
+        buffer['文件名'].extend([filename] * count)
+        for column in self.columns[1:]:
+            values = columns.get(column)
+            if values is None:
+                buffer[column].extend([None] * count)
+            elif MISSING in values:
+                buffer[column].extend([None if value is MISSING else value for value in values])
+            else:
+                buffer[column].extend(values)
+
+        keys = buffer['项目'][size:]
+        self.items.update(dict.fromkeys(key for key in keys if key is not None))
+        text_size = sum(len(str(value)) for value in keys) + sum(len(str(value)) for value in buffer['值'][size:])
+        self._buffer_bytes += count * (RECORD_OVERHEAD + len(filename)) + text_size
+
+        if self._buffer_bytes >= self.memory_budget:
+            self._spill()
+
+    def _spill(self):
+        """把缓冲区写入一个临时分块文件（按报告边界切分）"""
+        path = os.path.join(self._dir, f"chunk_{len(self._chunks):06d}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(self._buffer, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._chunks.append(path)
+        self._chunk_reports.append(range(self._buffer_start, self.reports))
+        self._buffer_start = self.reports
+        self._buffer = self._empty_buffer()
+        self._buffer_bytes = 0
+
+    def chunks(self) -> Iterator[Dict[str, list]]:
+        """依次返回各分块（列名 -> 列数据），缺少的附加列补空，规范化时按块计算类型化列"""
+        for _, chunk in self._report_chunks():
+            if self.normalize:
+                from normalize import typed_columns
+                chunk.update(typed_columns(chunk['项目'], chunk['值']))
+            yield chunk
+
+    def _report_chunks(self) -> Iterator[Tuple[range, Dict[str, list]]]:
+        for path, reports in zip(self._chunks, self._chunk_reports):
+            with open(path, 'rb') as f:
+                chunk = pickle.load(f)
+            yield reports, self._complete(chunk)
+        if self._buffer_start < self.reports:
+            yield range(self._buffer_start, self.reports), self._complete(self._buffer)
+
+    def _complete(self, chunk: Dict[str, list]) -> Dict[str, list]:
+        size = len(chunk[_REPORT])
+        for column in self.columns:
+            if column not in chunk:
+                chunk[column] = [None] * size
+        return chunk
+
+    def _pivot_chunks(self):
+        """逐块生成透视表（每个报告一行，列为全部项目，同一报告的重复项目取第一个值）"""
+        import pandas as pd
+
+        item_columns = list(self.items)
+        for reports, chunk in self._report_chunks():
+            frame = pd.DataFrame({_REPORT: chunk[_REPORT], '项目': chunk['项目'], '值': chunk['值']})
+            frame = frame.drop_duplicates([_REPORT, '项目'])
+            table = frame.pivot(index=_REPORT, columns='项目', values='值')
+            table = table.reindex(index=list(reports), columns=item_columns)
+            table.insert(0, '文件名', [self.filenames[report] for report in reports])
+            yield table
+
+    def export_csv(self, output_path: str) -> str:
+        """导出合并的长表CSV（与 export_csv 格式相同）"""
+        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.output_columns)
+            for chunk in self.chunks():
+                columns = [chunk[column] for column in self.output_columns]
+                writer.writerows([('' if value is None else value) for value in row] for row in zip(*columns))
+        return output_path
+
+    def export_pivot_csv(self, output_path: str) -> str:
+        """导出透视宽表CSV（每个报告一行）"""
+        header = True
+        with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
+            for table in self._pivot_chunks():
+                table.to_csv(f, header=header, index=False)
+                header = False
+            if header:
+                csv.writer(f).writerow(['文件名'] + list(self.items))
+        return output_path
+
+    def export_excel(self, output_path: str) -> str:
+        """导出透视宽表Excel（只写模式逐行写入）"""
+        from openpyxl import Workbook
+
+        if len(self.items) + 1 > EXCEL_MAX_COLUMNS:
+            raise ValueError(f"项目种类过多（{len(self.items)}），超出Excel列数上限，请导出为CSV")
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('汇总')
+        worksheet.append(['文件名'] + list(self.items))
+        for table in self._pivot_chunks():
+            for row in table.itertuples(index=False, name=None):
+                worksheet.append([None if value != value else value for value in row])
+        workbook.save(output_path)
+        return output_path
+
+    def export_parquet(self, output_path: str) -> str:
+        """导出长表Parquet（逐块写入同一个文件，需要 pyarrow）"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("导出Parquet需要安装 pyarrow: pip install pyarrow")
+
+        columns = self.output_columns
+        schema = pa.schema([(column, pa.float64() if column in ('数值', '字节', '赫兹') else pa.string())
+                            for column in columns])
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for chunk in self.chunks():
+                arrays = [pa.array(chunk[column], type=schema.field(column).type) for column in columns]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        return output_path
+
+    def close(self):
+        """删除临时分块文件"""
+        shutil.rmtree(self._dir, ignore_errors=True)
+        self._chunks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def spill_parse(parser, file_paths: List[str], folder: str, base_name: str, selected_items=None,
+                formats=('csv', 'pivot_csv'), memory_budget_mb: int = 256, isolate: bool = True,
+                progress_callback=None, normalize: bool = False) -> Dict[str, str]:
+    """
+    边解析边溢出导出，不在内存中保留整批结果
+
+    Args:
+        parser: AIDA64Parser 实例（进程隔离时只使用其统计对象）
+        file_paths: 文件路径列表
+        folder: 输出文件夹
+        base_name: 输出文件基础名
+        selected_items: 选中的项目
+        formats: 'csv'、'pivot_csv'、'excel'、'parquet' 的组合
+        memory_budget_mb: 内存预算（MB）
+        isolate: 是否在工作进程中解析（结果以列式编码传回，解码后直接按列加入导出器）
+        progress_callback: 进度回调 progress_callback(已完成数, 总数)，仅进程隔离时有效
+        normalize: 长表输出（CSV、Parquet）附加类型化的 字节、赫兹、日期 列
+
+    Returns:
+        格式 -> 输出路径
+    """
+    writers = {
+        'csv': ('.csv', SpillingExporter.export_csv),
+        'pivot_csv': ('_汇总.csv', SpillingExporter.export_pivot_csv),
+        'excel': ('_汇总.xlsx', SpillingExporter.export_excel),
+        'parquet': ('.parquet', SpillingExporter.export_parquet),
+    }
+
+    outputs = {}
+    with SpillingExporter(memory_budget_mb, normalize=normalize) as exporter:
+        if isolate:
+            from batch_runner import BatchRunner
+            BatchRunner(selected_items, stats=parser.stats, on_columns=exporter.add_columns, keep_results=False,
+                        progress_callback=progress_callback).run(file_paths)
+        else:
+            parser.parse_multiple_files(file_paths, selected_items, on_result=exporter.add, keep_results=False)
+        for fmt in formats:
+            extension, writer = writers[fmt]
+            outputs[fmt] = writer(exporter, os.path.join(folder, f"{base_name}{extension}"))
+    return outputs
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from file_discovery import discover_reports
+    from parser_core import AIDA64Parser
+    from templates import TemplateManager
+
+    argument_parser = argparse.ArgumentParser(description='按内存预算解析并导出大批AIDA64报告')
+    argument_parser.add_argument('inputs', nargs='+', help='报告文件或文件夹')
+    argument_parser.add_argument('--output-dir', default='.', help='输出文件夹')
+    argument_parser.add_argument('--name', default='AIDA64_汇总', help='输出文件基础名')
+    argument_parser.add_argument('--template', default=None, help='模板名称')
+    argument_parser.add_argument('--formats', nargs='+', default=['csv', 'pivot_csv'],
+                                 choices=['csv', 'pivot_csv', 'excel', 'parquet'], help='输出格式')
+    argument_parser.add_argument('--memory-mb', type=int, default=256, help='内存预算（MB）')
+    argument_parser.add_argument('--no-isolate', action='store_true', help='在本进程中解析')
+    argument_parser.add_argument('--normalize', action='store_true', help='长表输出附加 字节、赫兹、日期 列')
+    args = argument_parser.parse_args()
+
+    selected_items = TemplateManager().compile_template(args.template) if args.template else None
+    outputs = spill_parse(AIDA64Parser(), discover_reports(args.inputs), args.output_dir, args.name,
+                          selected_items, args.formats, args.memory_mb, isolate=not args.no_isolate,
+                          normalize=args.normalize)
+    for path in outputs.values():
+        print(path)
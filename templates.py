@@ -6,6 +6,8 @@
 import json
 import os
 
+from item_selector import ItemSelector
+
 
 class TemplateManager:
     """模板管理器"""
@@ -13,6 +15,9 @@ class TemplateManager:
     def __init__(self, config_dir='config'):
         self.config_dir = config_dir
         self.templates = self._load_templates()
+        
+        # 编译后的模板缓存：模板名称 -> ItemSelector
+        self._compiled = {}
     
     def _load_templates(self):
         """加载模板"""
@@ -20,7 +25,8 @@ class TemplateManager:
             'standard': self._create_standard_template(),
             'minimal': self._create_minimal_template(),
             'hardware_only': self._create_hardware_template(),
-            'software_only': self._create_software_template()
+            'software_only': self._create_software_template(),
+            'sensors_benchmark': self._create_sensor_template()
         }
         
         # 尝试从配置文件加载自定义模板
@@ -80,12 +86,9 @@ class TemplateManager:
                 {
                     'name': '内存信息',
                     'items': [
-                        'DIMM1: 模块名称', 'DIMM1: 序列号', 'DIMM1: 制造日期', 'DIMM1: 模块容量',
-                        'DIMM1: 模块类型', 'DIMM1: 存取类型', 'DIMM1: 存取速度', 'DIMM1: 模块位宽',
-                        'DIMM1: 模块电压', 'DIMM1: 错误检测方式', 'DIMM1: DRAM 制造商',
-                        'DIMM3: 模块名称', 'DIMM3: 序列号', 'DIMM3: 制造日期', 'DIMM3: 模块容量',
-                        'DIMM3: 模块类型', 'DIMM3: 存取类型', 'DIMM3: 存取速度', 'DIMM3: 模块位宽',
-                        'DIMM3: 模块电压', 'DIMM3: 错误检测方式', 'DIMM3: DRAM 制造商'
+                        'DIMM*: 模块名称', 'DIMM*: 序列号', 'DIMM*: 制造日期', 'DIMM*: 模块容量',
+                        'DIMM*: 模块类型', 'DIMM*: 存取类型', 'DIMM*: 存取速度', 'DIMM*: 模块位宽',
+                        'DIMM*: 模块电压', 'DIMM*: 错误检测方式', 'DIMM*: DRAM 制造商'
                     ]
                 },
                 {
@@ -152,8 +155,7 @@ class TemplateManager:
                 {
                     'name': '内存',
                     'items': [
-                        '系统内存', 'DIMM1: 模块名称', 'DIMM1: 模块容量', 'DIMM1: 存取速度',
-                        'DIMM3: 模块名称', 'DIMM3: 模块容量', 'DIMM3: 存取速度'
+                        '系统内存', 'DIMM*: 模块名称', 'DIMM*: 模块容量', 'DIMM*: 存取速度'
                     ]
                 },
                 {
@@ -191,6 +193,33 @@ class TemplateManager:
             ]
         }
     
+    def _create_sensor_template(self):
+        """创建传感器与基准测试模板"""
+        return {
+            'name': '传感器与基准测试模板',
+            'description': '提取温度、风扇转速、电压及内置基准测试结果（带数值和单位）',
+            'sections': [
+                {
+                    'name': '系统',
+                    'items': [
+                        '计算机名称', '处理器名称'
+                    ]
+                },
+                {
+                    'name': '传感器',
+                    'items': [
+                        '温度', '冷却风扇', '电压值', '电流值', '功耗值'
+                    ]
+                },
+                {
+                    'name': '基准测试',
+                    'items': [
+                        '基准测试'
+                    ]
+                }
+            ]
+        }
+    
     def get_template(self, template_name):
         """获取模板"""
         return self.templates.get(template_name, self.templates['standard'])
@@ -213,6 +242,36 @@ class TemplateManager:
         
         return items
     
+    def compile_template(self, template_name):
+        """
+        将模板编译为不可变的项目选择器（按模板名称缓存）
+        
+        项目支持通配符，如 'DIMM*: 模块容量' 匹配任意内存插槽；
+        all_items 的节编译为整节提取，不再逐项过滤；
+        节中的 rules（正则/通配符提取规则）合并编译为一个规则集。
+        """
+        compiled = self._compiled.get(template_name)
+        if compiled is not None:
+            return compiled
+        
+        template = self.get_template(template_name)
+        items = []
+        whole_sections = []
+        rules = []
+        
+        for section in template.get('sections', []):
+            if section.get('include', False) and section.get('all_items', False):
+                whole_sections.append(section['name'])
+                # 保留原有标记，兼容按项目声明产出的解析器
+                items.append(section['name'])
+            else:
+                items.extend(section.get('items', []))
+            rules.extend(section.get('rules', []))
+        
+        compiled = ItemSelector(items, whole_sections, rules)
+        self._compiled[template_name] = compiled
+        return compiled
+    
     def save_custom_template(self, template_name, template_data):
         """保存自定义模板"""
         config_file = os.path.join(self.config_dir, 'templates.json')
@@ -231,5 +290,6 @@ class TemplateManager:
         with open(config_file, 'w', encoding='utf-8') as f:
             json.dump(templates, f, ensure_ascii=False, indent=2)
         
-        # 更新内存中的模板
+        # 更新内存中的模板，并使编译缓存失效
         self.templates[template_name] = template_data
+        self._compiled.pop(template_name, None)
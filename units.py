@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+数值与单位解析模块
+"""
+
+import re
+from typing import Optional, Tuple
+
+
+# 支持的单位（正则按长度降序尝试，避免 "mV" 被 "V" 之类的短单位截断）
+_UNITS = [
+    'MPixel/s', 'KRay/s',
+    'GFLOPS', 'MFLOPS', 'TFLOPS',
+    'MB/s', 'GB/s', 'KB/s',
+    'RPM', 'MHz', 'GHz', 'FPS',
+    '°C', '°F', 'mV', 'mA', 'ns', 'ms',
+    'V', 'A', 'W', '%',
+]
+
+# 单位的规范写法（小写 -> 规范）
+_CANONICAL_UNITS = {unit.lower(): unit for unit in _UNITS}
+
+# 数值 + 单位，如 "40 °C"、"1,200 RPM"、"45123 MB/s"
+QUANTITY_RE = re.compile(
+    r'(?<![\w.])(-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)\s*('
+    + '|'.join(re.escape(unit) for unit in sorted(_UNITS, key=len, reverse=True))
+    + r')(?![A-Za-z])',
+    re.IGNORECASE
+)
+
+
+def parse_quantity(text: str) -> Optional[Tuple[float, str]]:
+    """
+    解析文本中的第一个带单位数值
+
+    Returns:
+        (数值, 规范单位)，无法解析时返回None
+    """
+    match = QUANTITY_RE.search(text)
+    if not match:
+        return None
+
+    number = float(match.group(1).replace(',', ''))
+    unit = _CANONICAL_UNITS[match.group(2).lower()]
+    return number, unit
+
+
+def typed_record(key: str, value: str) -> dict:
+    """
+    生成带数值类型的结果记录
+
+    在 {'项目', '值'} 的基础上附加 '数值' 和 '单位'，无法解析时两者为None。
+    """
+    quantity = parse_quantity(value)
+    number, unit = quantity if quantity else (None, None)
+    return {'项目': key, '值': value, '数值': number, '单位': unit}
@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+"""
+共享目录工作队列
+
+多台机器（或同一台机器上的多个进程）通过一个共享目录协作解析大批报告，
+不需要锁服务器，只依赖文件系统的原子重命名:
+
+    队列目录/
+        queue.json              任务清单（块数、模板、选中的项目）
+        pending/000001.json     待处理的块（报告路径列表）；重新分配的块带领取次数，如 000001~2.json
+        claimed/000001.json@节点  已被某个工作节点领取；工作节点在有报告解析完成时更新其修改时间作为心跳
+        results/000001.ndjson   块的解析结果（先写临时文件再重命名，不会出现半个文件）
+
+领取块就是把 pending 中的文件重命名到 claimed，只有一个节点能成功；
+心跳超过 stale_after 秒未更新的领取视为节点已失效，由任意节点或协调者改名回 pending 重新分配。
+心跳只在上次心跳后有报告解析完成时才发出，因此卡住的节点（进程仍在）同样会失效。
+工作节点通过 BatchRunner 在子进程中解析，单个报告超过 timeout 秒即被终止并记为错误，
+崩溃的报告同样只影响自身，timeout 需明显小于 stale_after。
+同一个块被领取 max_attempts 次仍未完成时（如报告导致整个节点崩溃），不再分配，
+块中每个报告写入一条错误记录，任务照常结束。
+失效节点如果之后仍写出结果，结果按块名覆盖，不影响合并。
+
+所有节点必须能以相同路径访问报告文件和队列目录（如同一挂载点）；判断心跳依赖各节点时钟大致同步。
+
+示例（同一台机器上测试）:
+    python work_queue.py create /tmp/queue 报告文件夹 --chunk-size 200
+    python work_queue.py work /tmp/queue &     # 启动若干个
+    python work_queue.py merge /tmp/queue 结果.ndjson.gz --wait
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from batch_runner import BatchRunner
+from exporters import NDJSONWriter, read_ndjson
+
+
+MANIFEST = 'queue.json'
+PENDING = 'pending'
+CLAIMED = 'claimed'
+RESULTS = 'results'
+
+# 领取文件名中块名与节点标识的分隔符
+CLAIM_SEPARATOR = '@'
+
+# 待处理文件名中块名与领取次数的分隔符
+ATTEMPT_SEPARATOR = '~'
+
+
+def _pending_name(chunk: str, attempt: int = 1) -> str:
+    """第 attempt 次领取前的待处理文件名"""
+    if attempt <= 1:
+        return f"{chunk}.json"
+    return f"{chunk}{ATTEMPT_SEPARATOR}{attempt}.json"
+
+
+def _parse_pending_name(name: str) -> Tuple[str, int]:
+    """待处理文件名 -> (块名, 领取次数)"""
+    chunk, separator, attempt = name[:-len('.json')].partition(ATTEMPT_SEPARATOR)
+    return chunk, int(attempt) if separator else 1
+
+
+def default_worker_id() -> str:
+    """默认节点标识：主机名-进程号"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """共享目录中的一个解析任务"""
+
+    def __init__(self, root: str, stale_after: float = 300.0, max_attempts: int = 3):
+        """
+        Args:
+            root: 队列目录
+            stale_after: 领取的心跳超过多少秒未更新视为失效
+            max_attempts: 同一个块最多领取的次数，超出后记为失败
+        """
+        self.root = root
+        self.stale_after = stale_after
+        self.max_attempts = max(1, max_attempts)
+
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.root, *parts)
+
+    def create(self, file_paths: List[str], chunk_size: int = 200, template: Optional[str] = None,
+               selected_items: Optional[List[str]] = None) -> int:
+        """
+        创建任务：把报告按 chunk_size 分块写入 pending
+
+        Args:
+            file_paths: 报告路径（工作节点上须可按相同路径访问）
+            chunk_size: 每块的报告数
+            template: 工作节点使用的模板名称
+            selected_items: 选中的项目列表（不使用模板时），None表示全部项目
+
+        Returns:
+            块数
+        """
+        if os.path.exists(self._path(MANIFEST)):
+            raise ValueError(f"队列目录中已有任务: {self.root}")
+        for name in (PENDING, CLAIMED, RESULTS):
+            os.makedirs(self._path(name), exist_ok=True)
+
+        file_paths = [os.path.abspath(path) for path in file_paths]
+        chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+        for index, chunk in enumerate(chunks, 1):
+            _write_atomic(self._path(PENDING, _pending_name(f"{index:06d}")), json.dumps(chunk, ensure_ascii=False))
+
+        # 清单最后写入，工作节点看到清单时所有块都已就绪
+        manifest = {'块数': len(chunks), '报告数': len(file_paths), '模板': template, '项目': selected_items}
+        _write_atomic(self._path(MANIFEST), json.dumps(manifest, ensure_ascii=False))
+        return len(chunks)
+
+    def manifest(self) -> Dict:
+        with open(self._path(MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _list(self, name: str) -> List[str]:
+        try:
+            return sorted(os.listdir(self._path(name)))
+        except FileNotFoundError:
+            return []
+
+    def _finished_chunks(self) -> List[str]:
+        return [name[:-len('.ndjson')] for name in self._list(RESULTS) if name.endswith('.ndjson')]
+
+    def status(self) -> Dict[str, int]:
+        """各状态的块数"""
+        return {
+            '总数': self.manifest()['块数'],
+            '待处理': sum(1 for name in self._list(PENDING) if name.endswith('.json')),
+            '处理中': len(self._list(CLAIMED)),
+            '已完成': len(self._finished_chunks()),
+        }
+
+    def is_complete(self) -> bool:
+        return len(self._finished_chunks()) >= self.manifest()['块数']
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, str]]:
+        """
+        领取一个待处理的块
+
+        Returns:
+            (块名, 领取文件路径)，没有待处理的块时返回None
+        """
+        for name in self._list(PENDING):
+            if not name.endswith('.json'):
+                continue
+            chunk, _ = _parse_pending_name(name)
+            claim_path = self._path(CLAIMED, f"{name}{CLAIM_SEPARATOR}{worker_id}")
+            try:
+                os.rename(self._path(PENDING, name), claim_path)
+            except FileNotFoundError:
+                # 被其他节点抢先领取
+                continue
+            # 重命名保留原修改时间，领取时刷新作为第一次心跳
+            os.utime(claim_path)
+            return chunk, claim_path
+        return None
+
+    def reclaim_stale(self) -> List[str]:
+        """把心跳失效的领取放回 pending（领取次数达到上限的块记为失败），返回重新分配的块名"""
+        reclaimed = []
+        now = time.time()
+        for name in self._list(CLAIMED):
+            claim_path = self._path(CLAIMED, name)
+            try:
+                if now - os.stat(claim_path).st_mtime < self.stale_after:
+                    continue
+                pending_name, _, worker_id = name.partition(CLAIM_SEPARATOR)
+                chunk, attempt = _parse_pending_name(pending_name)
+                if os.path.exists(self._path(RESULTS, f"{chunk}.ndjson")):
+                    # 结果已写出，只是领取文件没来得及删除
+                    os.remove(claim_path)
+                    continue
+                if attempt >= self.max_attempts:
+                    requeued = False
+                    self._abandon(chunk, claim_path, f"块已领取 {attempt} 次仍未完成，放弃处理")
+                else:
+                    requeued = True
+                    os.rename(claim_path, self._path(PENDING, _pending_name(chunk, attempt + 1)))
+            except FileNotFoundError:
+                continue
+            # 删除失效节点留下的临时结果文件
+            try:
+                os.remove(self._temp_result_path(chunk, worker_id))
+            except OSError:
+                pass
+            if requeued:
+                reclaimed.append(chunk)
+        return reclaimed
+
+    def _abandon(self, chunk: str, claim_path: str, reason: str):
+        """把块记为失败：每个报告写入一条错误记录，使任务可以结束"""
+        # 先把领取文件移走，同时回收的其他节点会在这里失败
+        temp_path = self._temp_result_path(chunk, 'abandoned')
+        os.rename(claim_path, temp_path)
+        with open(temp_path, 'r', encoding='utf-8') as f:
+            file_paths = json.load(f)
+        with NDJSONWriter(temp_path, compression=None) as writer:
+            for file_path in file_paths:
+                writer.write(os.path.basename(file_path), [{'项目': '错误', '值': reason}])
+        os.replace(temp_path, self._path(RESULTS, f"{chunk}.ndjson"))
+
+    def _temp_result_path(self, chunk: str, worker_id: str) -> str:
+        """节点写块结果时使用的临时文件"""
+        return self._path(RESULTS, f".{chunk}.{worker_id}.tmp")
+
+    def complete(self, chunk: str, claim_path: str, temp_result_path: str) -> bool:
+        """
+        提交块的结果并释放领取
+
+        Returns:
+            是否提交成功（领取失效时临时文件可能已被回收而删除）
+        """
+        try:
+            os.replace(temp_result_path, self._path(RESULTS, f"{chunk}.ndjson"))
+        except FileNotFoundError:
+            return False
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            # 领取已被判定失效并重新分配，结果仍然有效
+            pass
+        return True
+
+    def results(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """按块顺序读取全部结果，逐个返回 (文件名, 解析结果)"""
+        for chunk in self._finished_chunks():
+            yield from read_ndjson(self._path(RESULTS, f"{chunk}.ndjson"))
+
+    def merge(self, output_path: str) -> int:
+        """把全部结果合并为一个NDJSON文件（可压缩），返回报告数"""
+        with NDJSONWriter(output_path) as writer:
+            for filename, records in self.results():
+                writer.write(filename, records)
+            return writer.count
+
+    def wait(self, poll_interval: float = 5.0, progress_callback=None):
+        """
+        协调者：等待所有块完成，期间定期回收失效的领取
+
+        Args:
+            poll_interval: 检查间隔秒数
+            progress_callback: 进度回调 progress_callback(状态字典)
+        """
+        while not self.is_complete():
+            self.reclaim_stale()
+            if progress_callback is not None:
+                progress_callback(self.status())
+            time.sleep(poll_interval)
+
+
+class QueueWorker:
+    """
+    工作节点：不断领取块并解析，直到所有块完成
+
+    示例:
+        QueueWorker(WorkQueue('/mnt/share/queue')).run()
+    """
+
+    def __init__(self, queue: WorkQueue, worker_id: Optional[str] = None, heartbeat_interval: float = 10.0,
+                 poll_interval: float = 2.0, config_dir: str = 'config', timeout: float = 60.0,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            queue: 工作队列
+            worker_id: 节点标识，默认为 主机名-进程号
+            heartbeat_interval: 心跳间隔秒数（应明显小于队列的 stale_after）；期间没有报告完成时不发心跳
+            poll_interval: 暂无可领取的块时的等待秒数
+            config_dir: 模板配置目录
+            timeout: 单个报告的解析超时秒数（应明显小于队列的 stale_after）
+            workers: 解析子进程数，默认为CPU核数
+        """
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.config_dir = config_dir
+        self.timeout = timeout
+        self.workers = workers
+        self.chunks_done = 0
+
+    def _selected_items(self, manifest: Dict):
+        from item_selector import compile_items
+
+        if manifest.get('模板'):
+            from templates import TemplateManager
+            return TemplateManager(self.config_dir).compile_template(manifest['模板'])
+        return compile_items(manifest.get('项目'))
+
+    def run(self) -> int:
+        """
+        运行直到队列完成
+
+        Returns:
+            本节点完成的块数
+        """
+        selected_items = self._selected_items(self.queue.manifest())
+
+        while not self.queue.is_complete():
+            self.queue.reclaim_stale()
+            claimed = self.queue.claim(self.worker_id)
+            if claimed is None:
+                # 其他节点仍在处理；等待它们完成或失效后重新分配
+                time.sleep(self.poll_interval)
+                continue
+            chunk, claim_path = claimed
+            if self._process(selected_items, chunk, claim_path):
+                self.chunks_done += 1
+        return self.chunks_done
+
+    def _process(self, selected_items, chunk: str, claim_path: str) -> bool:
+        """解析一个块；领取在处理中失效时放弃结果并返回False"""
+        with open(claim_path, 'r', encoding='utf-8') as f:
+            file_paths = json.load(f)
+
+        lost = threading.Event()
+        stop = threading.Event()
+        # 已解析完成的报告数；心跳只在有进展时发出，卡住的节点会失效并被回收
+        finished = [0]
+
+        def heartbeat():
+            beaten = 0
+            while not stop.wait(self.heartbeat_interval):
+                if finished[0] == beaten:
+                    continue
+                beaten = finished[0]
+                try:
+                    os.utime(claim_path)
+                except FileNotFoundError:
+                    lost.set()
+                    return
+
+        heartbeat_thread = threading.Thread(target=heartbeat, daemon=True)
+        heartbeat_thread.start()
+
+        temp_path = self.queue._temp_result_path(chunk, self.worker_id)
+        try:
+            with NDJSONWriter(temp_path, compression=None) as writer:
+                def on_result(filename: str, data: List[Dict]):
+                    if lost.is_set():
+                        raise _ClaimLost()
+                    writer.write(filename, data)
+                    finished[0] += 1
+
+                # 超时或崩溃的报告由 BatchRunner 终止并记为错误，不会拖住整个块
+                runner = BatchRunner(selected_items, workers=self.workers, timeout=self.timeout,
+                                     on_result=on_result, keep_results=False)
+                try:
+                    runner.run(file_paths)
+                except _ClaimLost:
+                    pass
+        finally:
+            stop.set()
+            heartbeat_thread.join()
+
+        if lost.is_set():
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+        return self.queue.complete(chunk, claim_path, temp_path)
+
+
+class _ClaimLost(Exception):
+    """领取在处理中失效，中止当前块"""
+
+
+def _write_atomic(path: str, text: str):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    argument_parser = argparse.ArgumentParser(description='共享目录分布式解析')
+    commands = argument_parser.add_subparsers(dest='command', required=True)
+
+    create_command = commands.add_parser('create', help='创建任务')
+    create_command.add_argument('queue', help='队列目录')
+    create_command.add_argument('inputs', nargs='+', help='报告文件或文件夹')
+    create_command.add_argument('--chunk-size', type=int, default=200, help='每块的报告数')
+    create_command.add_argument('--template', default=None, help='模板名称')
+
+    work_command = commands.add_parser('work', help='作为工作节点运行')
+    work_command.add_argument('queue', help='队列目录')
+    work_command.add_argument('--id', default=None, help='节点标识')
+    work_command.add_argument('--stale-after', type=float, default=300.0, help='心跳失效秒数')
+    work_command.add_argument('--heartbeat', type=float, default=10.0, help='心跳间隔秒数')
+    work_command.add_argument('--timeout', type=float, default=60.0, help='单个报告的解析超时秒数')
+    work_command.add_argument('--workers', type=int, default=None, help='解析子进程数')
+    work_command.add_argument('--max-attempts', type=int, default=3, help='同一块最多领取次数')
+
+    status_command = commands.add_parser('status', help='查看进度')
+    status_command.add_argument('queue', help='队列目录')
+
+    merge_command = commands.add_parser('merge', help='合并结果')
+    merge_command.add_argument('queue', help='队列目录')
+    merge_command.add_argument('output', help='输出NDJSON文件（.gz 等扩展名自动压缩）')
+    merge_command.add_argument('--wait', action='store_true', help='等待所有块完成并回收失效的领取')
+    merge_command.add_argument('--stale-after', type=float, default=300.0, help='心跳失效秒数')
+    merge_command.add_argument('--max-attempts', type=int, default=3, help='同一块最多领取次数')
+
+    args = argument_parser.parse_args()
+
+    if args.command == 'create':
+        from file_discovery import discover_reports
+        reports = discover_reports(args.inputs)
+        count = WorkQueue(args.queue).create(reports, args.chunk_size, args.template)
+        print(f"已创建任务: {len(reports)} 个报告，{count} 块")
+    elif args.command == 'work':
+        worker = QueueWorker(WorkQueue(args.queue, args.stale_after, args.max_attempts), args.id, args.heartbeat,
+                             timeout=args.timeout, workers=args.workers)
+        print(f"节点 {worker.worker_id} 完成 {worker.run()} 块")
+    elif args.command == 'status':
+        print(WorkQueue(args.queue).status())
+    else:
+        queue = WorkQueue(args.queue, args.stale_after, args.max_attempts)
+        if args.wait:
+            queue.wait(progress_callback=print)
+        elif not queue.is_complete():
+            argument_parser.error(f"任务尚未完成: {queue.status()}")
+        print(f"已合并 {queue.merge(args.output)} 个报告: {args.output}")